@@ -1,16 +1,182 @@
 """Main Flask application"""
 import os
-from flask import Flask
-from flask_cors import CORS
-from routes.game import game_bp
-from routes.questions import questions_bp
+import threading
+from typing import TYPE_CHECKING, Dict, Optional
 
-app = Flask(__name__)
-CORS(app)  # Enable CORS for frontend
+if TYPE_CHECKING:
+    from flask import Flask
 
-# Register blueprints
-app.register_blueprint(game_bp, url_prefix='/api/game')
-app.register_blueprint(questions_bp, url_prefix='/api/questions')
+# Default application settings; override by passing a dict to create_app()
+DEFAULT_CONFIG = {
+    'DATABASE_PATH': None,  # None uses backend/database/football_edu.db
+    'WARM_UP': False,  # Initialize database and services inside create_app()
+    'ACTION_LOG_PATH': None,  # None uses backend/logs/actions.log
+    'ACTION_LOG_LEVEL': 'INFO',
+    'ACTION_LOG_SAMPLE_RATE': 1.0,
+    'ACTION_LOG_MAX_BYTES': 10 * 1024 * 1024,
+    'ACTION_LOG_BACKUP_COUNT': 5,
+    'ACTION_LOG_PER_PROCESS': False,  # One file per process, e.g. actions.1234.log (prefork.py)
+    'PROFILE_DIR': None,  # None uses backend/profiles
+    'PROFILE_SAMPLE_RATE': 0.0,  # Fraction of requests profiled with cProfile
+    'PROFILE_HEADER_ENABLED': False,  # Allow X-Profile-Request to profile a request
+    'SAMPLING_PROFILER_HZ': 10,  # Stack samples per second; 0 disables the sampler
+    'DEBUG_ENDPOINTS_ENABLED': False,  # Serve the flame graph and slow query report
+    'DEBUG_ENDPOINTS_TOKEN': None,  # If set, they require "Authorization: Bearer <token>"
+    'SLOW_QUERY_MS': 100.0,  # Statements at least this slow go to the slow query log
+    'QUERY_BUDGET_STRICT': False,  # Raise instead of warn when a route exceeds its query budget
+    'ADMISSION_ENABLED': True,  # Rate limits and concurrency cap (429/503 when exceeded)
+    'ADMISSION_MAX_CONCURRENT': 64,  # Requests processed at once per process
+    'ADMISSION_CLIENT_RATE': 200.0,  # Requests/s per client address (a school may share one)
+    'ADMISSION_CLIENT_BURST': 400,
+    'ADMISSION_GAME_RATE': 5.0,  # Requests/s per game
+    'ADMISSION_GAME_BURST': 10,
+    'FAST_SERIALIZATION': True,  # orjson JSON and MessagePack on request, when installed
+    'COMPRESSION_ENABLED': True,  # gzip/brotli for responses the client accepts compressed
+    'COMPRESSION_MIN_SIZE': 512,  # Smaller bodies are sent uncompressed
+    'GAME_STATES_MAX_IDS': 500,  # Game IDs accepted by one POST /api/game/states
+    'EVENT_STREAMS_MAX': 1000,  # Open event streams per process (503 beyond that)
+    'EVENT_STREAM_HEARTBEAT_SECONDS': 15.0  # Idle time before a heartbeat comment
+}
+
+_warm_up_lock = threading.Lock()
+
+
+def create_app(config: Optional[Dict] = None) -> 'Flask':
+    """
+    Create and configure the Flask application.
+    
+    Creating the app does no database or file I/O. The database check and
+    service construction are deferred to warm_up(), which runs on the first
+    request or can be called explicitly (e.g. before forking workers).
+    
+    Args:
+        config: Optional settings overriding DEFAULT_CONFIG
+    
+    Returns:
+        Configured Flask application
+    """
+    from flask import Flask
+    from flask_cors import CORS
+    
+    app = Flask(__name__)
+    app.config.update(DEFAULT_CONFIG)
+    if config:
+        app.config.update(config)
+    CORS(app)  # Enable CORS for frontend
+    
+    if app.config['FAST_SERIALIZATION']:
+        from services.serialization import FastJSONProvider
+        app.json = FastJSONProvider(app)
+    
+    # Import blueprints here so importing this module stays cheap
+    from routes.admission import admission_bp
+    from routes.api import api_bp
+    from routes.classroom import classroom_bp
+    from routes.compression import compression_bp
+    from routes.debug import debug_bp
+    from routes.game import game_bp
+    from routes.metrics import metrics_bp
+    from routes.questions import questions_bp
+    
+    # Register blueprints
+    app.register_blueprint(api_bp, url_prefix='/api')
+    app.register_blueprint(metrics_bp, url_prefix='/api')
+    # After metrics so that rejected requests are still timed and counted
+    app.register_blueprint(admission_bp)
+    # Response hooks run in reverse order, so compression is timed by metrics
+    app.register_blueprint(compression_bp)
+    app.register_blueprint(debug_bp, url_prefix='/api/debug')
+    app.register_blueprint(game_bp, url_prefix='/api/game')
+    app.register_blueprint(classroom_bp, url_prefix='/api/classrooms')
+    app.register_blueprint(questions_bp, url_prefix='/api/questions')
+    
+    app.extensions['warmed_up'] = False
+    app.extensions['worker_pid'] = None
+    
+    if app.config['ADMISSION_ENABLED']:
+        from services.admission import AdmissionController
+        app.extensions['admission'] = AdmissionController(
+            max_concurrent=app.config['ADMISSION_MAX_CONCURRENT'],
+            client_rate=app.config['ADMISSION_CLIENT_RATE'],
+            client_burst=app.config['ADMISSION_CLIENT_BURST'],
+            game_rate=app.config['ADMISSION_GAME_RATE'],
+            game_burst=app.config['ADMISSION_GAME_BURST']
+        )
+    
+    if app.config['PROFILE_SAMPLE_RATE'] or app.config['PROFILE_HEADER_ENABLED']:
+        from services.request_profiler import RequestProfiler
+        app.extensions['request_profiler'] = RequestProfiler(
+            profile_dir=app.config['PROFILE_DIR'],
+            sample_rate=app.config['PROFILE_SAMPLE_RATE'],
+            header_enabled=app.config['PROFILE_HEADER_ENABLED']
+        )
+    
+    @app.before_request
+    def _ensure_warmed_up():
+        if not app.extensions['warmed_up']:
+            warm_up(app)
+        if app.extensions['worker_pid'] != os.getpid():
+            start_worker(app)
+    
+    if app.config['WARM_UP']:
+        warm_up(app)
+    
+    return app
+
+
+def warm_up(app: 'Flask'):
+    """
+    Initialize the database and construct services for an application.
+    
+    Safe to call more than once; only the first call does any work.
+    """
+    with _warm_up_lock:
+        if app.extensions.get('warmed_up'):
+            return
+        
+        from database.db import get_db, reset_db
+        from services.config_service import get_config_service
+        from services.game_service import get_game_service
+        from services.question_service import get_question_service, reset_question_service
+        
+        if app.config['DATABASE_PATH']:
+            reset_db(app.config['DATABASE_PATH'])
+            reset_question_service()
+        get_db().slow_queries.threshold_ms = app.config['SLOW_QUERY_MS']
+        
+        ensure_database_initialized()
+        get_config_service()
+        get_game_service()
+        get_question_service()
+        
+        app.extensions['warmed_up'] = True
+
+
+def start_worker(app: 'Flask'):
+    """
+    Start per-process background services (action log writer, stack sampler).
+    
+    Runs on the first request in each process, so that pre-forked workers
+    start their own threads instead of inheriting dead ones from the master.
+    """
+    with _warm_up_lock:
+        if app.extensions.get('worker_pid') == os.getpid():
+            return
+        
+        from services.action_log import configure_action_log
+        from services.sampling_profiler import start_sampling_profiler
+        
+        configure_action_log(
+            path=app.config['ACTION_LOG_PATH'],
+            level=app.config['ACTION_LOG_LEVEL'],
+            sample_rate=app.config['ACTION_LOG_SAMPLE_RATE'],
+            max_bytes=app.config['ACTION_LOG_MAX_BYTES'],
+            backup_count=app.config['ACTION_LOG_BACKUP_COUNT'],
+            per_process=app.config['ACTION_LOG_PER_PROCESS']
+        )
+        start_sampling_profiler(app.config['SAMPLING_PROFILER_HZ'])
+        
+        app.extensions['worker_pid'] = os.getpid()
 
 
 def ensure_database_initialized():
@@ -27,11 +193,12 @@ def ensure_database_initialized():
         # Load questions from JSON
         _load_questions_from_json()
     else:
+        # Ensure the schema exists and is current (this also removes duplicate questions)
+        init_database()
         # Check if database has questions
         count_result = db.execute_one("SELECT COUNT(*) as count FROM questions")
         if not count_result or count_result['count'] == 0:
             print("Database exists but has no questions. Loading questions...")
-            init_database()  # Ensure schema exists
             _load_questions_from_json()
 
 
@@ -39,6 +206,7 @@ def _load_questions_from_json():
     """Load questions from JSON file into database."""
     import json
     from database.db import get_db
+    from database.questions import insert_questions, json_question_rows
     
     backend_dir = os.path.dirname(os.path.abspath(__file__))
     json_file = os.path.join(backend_dir, 'config', 'questions.json')
@@ -51,72 +219,23 @@ def _load_questions_from_json():
     with open(json_file, 'r', encoding='utf-8') as f:
         questions_data = json.load(f)
     
-    db = get_db()
-    
-    # Insert questions
-    total_inserted = 0
-    for category, questions in questions_data.items():
-        for question_data in questions:
-            question_id = question_data.get('id')
-            question_obj = question_data.get('question', {})
-            answers = question_data.get('answers', [])
-            correct_answer_index = question_data.get('correct_answer', 0)
-            
-            # Extract question text in each language
-            question_en = question_obj.get('en', '')
-            question_el = question_obj.get('el', '')
-            question_de = question_obj.get('de', '')
-            
-            # Convert answers to JSON string
-            answers_json = json.dumps(answers)
-            
-            # Insert into database
-            query = """
-                INSERT INTO questions 
-                (category, question_en, question_el, question_de, answers, correct_answer_index)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """
-            
-            db.execute_update(
-                query,
-                (category, question_en, question_el, question_de, answers_json, correct_answer_index)
-            )
-            
-            total_inserted += 1
+    # Insert all questions in one transaction; duplicates are skipped by content hash
+    rows = [row for category, questions in questions_data.items()
+            for row in json_question_rows(category, questions)]
+    total_inserted = insert_questions(get_db(), rows)
     
     print(f"✅ Loaded {total_inserted} questions into database")
 
 
-# Initialize database on app startup
-ensure_database_initialized()
-
-
-@app.route('/api/health', methods=['GET'])
-def health_check():
-    """Health check endpoint"""
-    return {'status': 'ok'}, 200
-
-
-@app.route('/api/config', methods=['GET'])
-def get_config():
-    """Get game configuration"""
-    from services.config_service import get_config_service
-    config_service = get_config_service()
-    config = config_service.get_config()
-    
-    # Return probabilities in format expected by frontend
-    probabilities = config.get('probabilities', {})
-    return {
-        'success': True,
-        'probabilities': {
-            'pass': probabilities.get('player', {}).get('pass', 0.80),
-            'dribble': probabilities.get('player', {}).get('dribble', 0.60),
-            'shoot': probabilities.get('player', {}).get('shoot', 0.50),
-            'tackle': probabilities.get('player', {}).get('tackle', 0.75)
-        },
-        'goalkeeper_save': probabilities.get('goalkeeper_save', 0.50)
-    }, 200
+def __getattr__(name):
+    """Build a module-level ``app`` on first access (e.g. ``from app import app``)."""
+    if name == 'app':
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == '__main__':
+    app = create_app({'WARM_UP': True})
     app.run(debug=True, port=8000, host='0.0.0.0')
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Measure process cold-start time of the backend.
+
+Each scenario runs in a fresh interpreter, so the numbers include interpreter
+startup and all imports:
+
+- import: ``import app`` (what tests, scripts and pre-fork masters pay)
+- create_app: building the Flask app without touching the database
+- warm: create_app() plus warm_up(), i.e. what importing app.py used to cost
+
+Usage:
+    python benchmarks/bench_cold_start.py [--runs 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    'import': "import app",
+    'create_app': "from app import create_app; create_app()",
+    'warm': "from app import create_app; create_app({{'WARM_UP': True, 'DATABASE_PATH': {db!r}}})",
+}
+
+
+def time_scenario(code: str, runs: int) -> list:
+    """Run a snippet in fresh interpreters and return wall times in ms."""
+    timer = (
+        "import time; t = time.perf_counter(); "
+        "exec(compile({code!r}, '<bench>', 'exec')); "
+        "print((time.perf_counter() - t) * 1000)"
+    ).format(code=code)
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', timer], cwd=backend_dir,
+            capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(float(output.strip().splitlines()[-1]))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        print(f"{'scenario':>12} {'median':>10} {'min':>10}")
+        for name, code in SCENARIOS.items():
+            samples = time_scenario(code.format(db=db_path), args.runs)
+            print(f"{name:>12} {statistics.median(samples):>8.1f}ms {min(samples):>8.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
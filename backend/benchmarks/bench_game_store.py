@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark action throughput of the sharded game store against a single shard.
+
+Each thread repeatedly runs the same locked read-modify-write that
+POST /api/game/action performs, spread over a pool of games. A store with one
+shard is equivalent to a single dict guarded by one lock.
+
+Usage:
+    python benchmarks/bench_game_store.py [--threads 1 2 4 8 16] [--shards 16]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+# Add backend directory to path for service imports
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from services.game_service import GameService
+
+
+def run_actions(service: GameService, game_ids, threads: int, duration: float) -> float:
+    """
+    Run actions from several threads for a fixed time.
+    
+    Returns:
+        Actions per second across all threads
+    """
+    stop = threading.Event()
+    counts = [0] * threads
+    barrier = threading.Barrier(threads + 1)
+    
+    def worker(index):
+        ids = game_ids[index::threads] or game_ids
+        done = 0
+        barrier.wait()
+        while not stop.is_set():
+            for game_id in ids:
+                with service.locked_game(game_id) as game:
+                    game.adjust_probability('pass', True)
+                    game.get_current_probability('player', 'pass')
+                    game.increment_player_action()
+                    game.current_probabilities['player']['pass'] = None
+                done += 1
+        counts[index] = done
+    
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    time.sleep(duration)
+    stop.set()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return sum(counts) / elapsed
+
+
+def make_service(shards: int, games: int):
+    """Create a service pre-populated with games that never end."""
+    service = GameService(shard_count=shards)
+    game_ids = []
+    for _ in range(games):
+        game = service.create_game()
+        service.update_game(game.game_id, max_actions=10 ** 12, max_player_actions=10 ** 12)
+        game_ids.append(game.game_id)
+    return service, game_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--shards', type=int, default=16)
+    parser.add_argument('--games', type=int, default=256)
+    parser.add_argument('--duration', type=float, default=1.0,
+                        help='Seconds per measurement')
+    args = parser.parse_args()
+    
+    print(f"{'threads':>8} {'1 shard':>14} {f'{args.shards} shards':>14} {'speedup':>8}")
+    for threads in args.threads:
+        single = run_actions(*make_service(1, args.games), threads, args.duration)
+        sharded = run_actions(*make_service(args.shards, args.games), threads, args.duration)
+        print(f"{threads:>8} {single:>12,.0f}/s {sharded:>12,.0f}/s {sharded / single:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
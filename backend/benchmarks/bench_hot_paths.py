@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the backend hot paths, compared against a stored baseline.
+
+Each case is timed with timeit (best of several repeats) and reported in
+microseconds per call. Results are compared with benchmarks/baseline.json and
+the script exits with status 1 if any case is slower than the baseline by more
+than the threshold, so a performance change can be checked with one command:
+
+    python benchmarks/bench_hot_paths.py                     # compare
+    python benchmarks/bench_hot_paths.py --output run.json   # also save results
+    python benchmarks/bench_hot_paths.py --update-baseline   # accept new numbers
+
+Every run also times a fixed pure-Python calibration loop, and comparisons
+use each case's time relative to it. A machine that is uniformly slower (CPU
+steal, frequency scaling) therefore does not register as a regression.
+Baselines are still machine-specific; refresh the baseline on the machine
+that runs the comparison before relying on it.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import timeit
+from typing import Callable, Dict
+
+# Add backend directory to path for service imports
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from load_classroom import seed_questions
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+CALIBRATION = 'calibration loop'
+
+
+def _calibration_loop():
+    total = 0
+    for i in range(100):
+        total += i * i
+    return total
+
+
+def build_cases(db_path: str) -> Dict[str, Callable]:
+    """Create the services under test and return the benchmark cases."""
+    from database.db import Database
+    from services.config_service import ConfigService
+    from services.game_service import GameState
+    from services.question_service import QuestionService
+    
+    db = Database(db_path)
+    questions = QuestionService(db=db, refresh_interval=3600)
+    questions.load_bank()
+    record = questions._by_id[1]
+    config = ConfigService()
+    game = GameState(duration='regular')
+    
+    return {
+        CALIBRATION: _calibration_loop,
+        'QuestionService.get_random_question': lambda: questions.get_random_question('math_1', 'el'),
+        'QuestionService.get_question_by_id': lambda: questions.get_question_by_id(1, 'de'),
+        'QuestionService answer shuffle': lambda: questions._build_question(record, 'en'),
+        'GameState.adjust_probability': lambda: game.adjust_probability('pass', True),
+        'GameState.to_dict': game.to_dict,
+        'ConfigService.get_probability': lambda: config.get_probability('player', 'pass'),
+        'Database.execute_one': lambda: db.execute_one('SELECT * FROM questions WHERE id = ?', (1,)),
+    }
+
+
+def run_cases(cases: Dict[str, Callable], repeat: int) -> Dict[str, float]:
+    """
+    Time each case and return microseconds per call.
+    
+    Repeats are interleaved across cases so that a burst of noise from the
+    machine affects one repeat of every case rather than all repeats of one.
+    """
+    timers = {name: timeit.Timer(case) for name, case in cases.items()}
+    numbers = {name: timer.autorange()[0] for name, timer in timers.items()}
+    best = {name: float('inf') for name in timers}
+    for _ in range(repeat):
+        for name, timer in timers.items():
+            best[name] = min(best[name], timer.timeit(numbers[name]) / numbers[name])
+    return {name: seconds * 1e6 for name, seconds in best.items()}
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> bool:
+    """
+    Print results next to the baseline, both relative to their calibration loop.
+    
+    Returns:
+        True if any case regressed by more than the threshold
+    """
+    regressed = False
+    print(f"{'case':<40} {'us/call':>10} {'baseline':>10} {'change':>8}")
+    for name, value in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<40} {value:>10.3f} {'-':>10} {'new':>8}")
+            continue
+        if name == CALIBRATION:
+            print(f"{name:<40} {value:>10.3f} {base:>10.3f} {'-':>8}")
+            continue
+        change = (value / results[CALIBRATION]) / (base / baseline[CALIBRATION]) - 1
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressed = True
+        print(f"{name:<40} {value:>10.3f} {base:>10.3f} {change:>+8.1%}{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark backend hot paths against a baseline')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Allowed slowdown before failing (0.25 = 25%%)')
+    parser.add_argument('--repeat', type=int, default=7, help='Timing repeats per case')
+    parser.add_argument('--output', help='Write results to this JSON file')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Store these results as the new baseline')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as work_dir:
+        db_path = os.path.join(work_dir, 'bench.db')
+        seed_questions(db_path)
+        results = run_cases(build_cases(db_path), args.repeat)
+    
+    report = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results_us': results
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+    
+    if args.update_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+        print(f"Baseline written to {args.baseline}")
+        compare(results, {}, args.threshold)
+        return
+    
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)['results_us']
+    if compare(results, baseline, args.threshold):
+        print(f"\nSlower than baseline by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Benchmark the cost of recording metrics on the request path.
+
+Usage:
+    python benchmarks/bench_metrics.py [--number 200000]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+# Add backend directory to path for service imports
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from services.metrics import Counter, Histogram
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--number', type=int, default=200000)
+    args = parser.parse_args()
+    
+    histogram = Histogram('bench_seconds', 'Benchmark', ('endpoint', 'method'))
+    counter = Counter('bench_total', 'Benchmark', ('endpoint', 'method', 'status'))
+    
+    cases = {
+        'Histogram.observe': lambda: histogram.observe(0.0123, 'game.execute_action', 'POST'),
+        'Counter.inc': lambda: counter.inc('game.execute_action', 'POST', '200'),
+        'per request (2 observe + inc)': lambda: (
+            histogram.observe(0.0123, 'game.execute_action', 'POST'),
+            counter.inc('game.execute_action', 'POST', '200'),
+            histogram.observe(2, 'game.execute_action', 'POST')
+        ),
+    }
+    for name, case in cases.items():
+        best = min(timeit.repeat(case, number=args.number, repeat=5))
+        print(f"{name:>32}: {best / args.number * 1e6:.2f} us")
+
+
+if __name__ == '__main__':
+    main()
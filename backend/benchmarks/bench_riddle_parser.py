@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Time the riddle importer's JavaScript parser on large synthetic files.
+
+Writes riddle files of increasing size in the format of the edu-game-v2
+riddle modules and parses each with iter_js_riddles(). A linear parser keeps
+the time per 1,000 riddles flat as the file grows, and its peak memory (while
+consuming records without keeping them) does not grow with the file.
+
+Usage:
+    python benchmarks/bench_riddle_parser.py
+    python benchmarks/bench_riddle_parser.py --sizes 1000 100000
+"""
+import argparse
+import collections
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import List, Tuple
+
+# Add backend and the importer's directory to path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+project_root = os.path.dirname(backend_dir)
+sys.path.insert(0, backend_dir)
+sys.path.insert(0, os.path.join(project_root, 'school_material', 'original'))
+
+from import_riddles import iter_js_riddles
+
+DEFAULT_SIZES = [25000, 50000, 100000]
+
+
+def write_riddles(path: str, count: int):
+    """Write a riddles module with ``count`` entries."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("import { shuffleArray } from '../utils/shuffle';\n\n")
+        f.write('export const riddles = [\n')
+        for i in range(count):
+            f.write(
+                f'  {{\n'
+                f'    question: "Ποια είναι η απάντηση στον γρίφο {i}; (\\"{{brace}}\\")",\n'
+                f'    options: shuffleArray(["Απάντηση {i}", "Option {i + 1}", "Option {i + 2}", "Option {i + 3}"]),\n'
+                f'    answer: "Απάντηση {i}",\n'
+                f'    category: "riddles" // {i}\n'
+                f'  }},\n'
+            )
+        f.write('];\n')
+
+
+def run(path: str) -> Tuple[int, float, float]:
+    """
+    Parse a file twice: once timed, once under tracemalloc.
+    
+    Returns:
+        (riddles, seconds, peak MiB)
+    """
+    with open(path, encoding='utf-8') as f:
+        started = time.perf_counter()
+        count = sum(1 for _ in iter_js_riddles(f))
+        elapsed = time.perf_counter() - started
+    
+    tracemalloc.start()
+    with open(path, encoding='utf-8') as f:
+        collections.deque(iter_js_riddles(f), maxlen=0)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, elapsed, peak / (1 << 20)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the riddle parser on synthetic files')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Riddles per generated file')
+    args = parser.parse_args()
+    
+    rows: List[Tuple[int, float, int, float, float]] = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in args.sizes:
+            path = os.path.join(work_dir, f'riddles_{size}.js')
+            write_riddles(path, size)
+            file_mib = os.path.getsize(path) / (1 << 20)
+            count, elapsed, peak = run(path)
+            if count != size:
+                raise SystemExit(f'Parsed {count} riddles out of {size}')
+            rows.append((size, file_mib, count, elapsed, peak))
+    
+    print(f"{'riddles':>8} {'file MiB':>9} {'seconds':>8} {'ms/1k':>7} {'peak MiB':>9}")
+    for size, file_mib, count, elapsed, peak in rows:
+        print(f"{size:>8} {file_mib:>9.1f} {elapsed:>8.2f} {elapsed / count * 1e6:>7.1f} {peak:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Compare response encoders on question and game state payloads.
+
+For each payload the script reports the encode time and the encoded size for
+the standard library encoder as Flask configures it (sorted keys, non-ASCII
+escaped), orjson and MessagePack (each only if installed). Random questions
+are also timed end to end: building the dictionary and encoding it, against
+assembling the body from the fragments serialized when the bank was loaded.
+
+Usage:
+    python benchmarks/bench_serialization.py
+    python benchmarks/bench_serialization.py --repeat 11
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import timeit
+from typing import Callable, Dict, List, Tuple
+
+# Add backend directory to path for service imports
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+from load_classroom import seed_questions
+
+
+def encoders() -> Dict[str, Callable]:
+    """Available encoders by name."""
+    from services import serialization
+    
+    result = {
+        'json (flask default)': lambda data: json.dumps(data, sort_keys=True, separators=(',', ':')).encode(),
+    }
+    if serialization.orjson is not None:
+        result['orjson'] = serialization.orjson.dumps
+    if serialization.msgpack is not None:
+        result['msgpack'] = serialization.dumps_msgpack
+    return result
+
+
+def best_time(func: Callable, repeat: int) -> float:
+    """Best time per call in microseconds."""
+    timer = timeit.Timer(func)
+    number = timer.autorange()[0]
+    return min(timer.repeat(repeat, number)) / number * 1e6
+
+
+def run(db_path: str, repeat: int) -> List[Tuple[str, str, float, int]]:
+    """
+    Time every encoder on every payload.
+    
+    Returns:
+        (payload, encoder, microseconds per call, bytes) rows
+    """
+    from database.db import Database
+    from services.game_service import GameState
+    from services.question_service import QuestionService
+    
+    questions = QuestionService(db=Database(db_path), refresh_interval=3600)
+    questions.load_bank()
+    game = GameState(duration='regular')
+    for _ in range(20):
+        game.adjust_probability('pass', True)
+    
+    payloads = {
+        'question (en)': {'success': True, 'question': questions.get_random_question('math_1', 'en')},
+        'question (el)': {'success': True, 'question': questions.get_random_question('math_1', 'el')},
+        'game state': {'success': True, 'game': game.to_dict()},
+    }
+    rows = []
+    for payload_name, payload in payloads.items():
+        for encoder_name, encode in encoders().items():
+            rows.append((payload_name, encoder_name,
+                         best_time(lambda: encode(payload), repeat), len(encode(payload))))
+    
+    for language in ('en', 'el'):
+        name = f'random question ({language})'
+        for encoder_name, encode in encoders().items():
+            def build_and_encode():
+                return encode({'success': True, 'question': questions.get_random_question('math_1', language)})
+            rows.append((name, f'build + {encoder_name}', best_time(build_and_encode, repeat),
+                         len(build_and_encode())))
+        
+        def assemble():
+            return b'{"success":true,"question":' + questions.get_random_question_json('math_1', language) + b'}'
+        rows.append((name, 'pre-serialized', best_time(assemble, repeat), len(assemble())))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare response encoders')
+    parser.add_argument('--repeat', type=int, default=7, help='Timing repeats per case')
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as work_dir:
+        db_path = os.path.join(work_dir, 'bench.db')
+        seed_questions(db_path)
+        rows = run(db_path, args.repeat)
+    
+    print(f"{'payload':<22} {'encoder':<28} {'us/call':>9} {'bytes':>7}")
+    for payload, encoder, micros, size in rows:
+        print(f"{payload:<22} {encoder:<28} {micros:>9.3f} {size:>7}")
+
+
+if __name__ == '__main__':
+    main()
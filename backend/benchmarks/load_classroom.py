@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Simulate classrooms of children playing against the API.
+
+Each simulated child is a thread with its own HTTP connection that plays the
+same loop as the frontend: start a game, then repeatedly fetch a question,
+think about it, send an action and, after a successful shot, report the goal.
+Think times are drawn from log-normal distributions so that some children
+answer quickly and a few take much longer. When the game ends the child
+starts a new one until the run is over.
+
+With --mode stream the same loop runs over a persistent event stream per
+game: the child opens GET /api/game/events/<id>, sends actions and goals as
+text/plain messages (no CORS preflight) and receives the action result and
+the next question as events. The 'stream action' row is the time from sending
+the message to receiving its action event, comparable to POST /api/game/action
+in the default REST mode.
+
+By default the app is served in-process on a free port against a temporary
+database seeded with synthetic questions; pass --url to load an already running server instead (e.g.
+prefork.py), which keeps the load generator from competing with the server
+for the GIL.
+
+Latencies are measured by the client. The development server closes the
+connection after every response, so connection setup is reported as its own
+row. On loopback, a new connection that reuses a port the server still holds
+in TIME_WAIT is retried after about a second, which shows up in that row and
+in the tail of the next request. Compare with the server-side
+smartkick_http_request_duration_seconds histogram on /api/metrics to tell
+application time from network time. Server CPU is read from
+smartkick_process_cpu_seconds_total before and after the run; for an
+in-process server it includes the load generator itself, so compare modes
+against a separate server (--url) for CPU figures.
+
+Usage:
+    python benchmarks/load_classroom.py --children 600 --duration 120
+    python benchmarks/load_classroom.py --children 50 --duration 20 --think-scale 0.1
+    python benchmarks/load_classroom.py --url http://127.0.0.1:5000 --children 600
+    python benchmarks/load_classroom.py --mode stream --children 50 --think-scale 0.1
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Add backend directory to path for app imports
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+ACTIONS = ['pass', 'pass', 'pass', 'dribble', 'dribble', 'shoot']
+LANGUAGES = ['en', 'el', 'de']
+
+# (median seconds, sigma) of log-normal think times
+READ_QUESTION = (6.0, 0.5)
+CHOOSE_ACTION = (1.5, 0.4)
+BETWEEN_GAMES = (10.0, 0.5)
+
+# Report row for TCP connection setup, kept out of the endpoint latencies
+CONNECT = '(tcp connect)'
+
+# Report row for a message's round trip to its event in stream mode
+STREAM_ACTION = 'stream action (message -> event)'
+
+# Rows counted as one game action, per mode
+ACTION_ROWS = {'POST /api/game/action', STREAM_ACTION}
+
+
+def think(distribution: Tuple[float, float], scale: float, stop: threading.Event):
+    """Sleep for a log-normal think time, waking early if the run stops."""
+    median, sigma = distribution
+    stop.wait(random.lognormvariate(0, sigma) * median * scale)
+
+
+class Stats:
+    """Latencies and outcomes per endpoint, shared by all children."""
+    
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+    
+    def record(self, endpoint: str, elapsed: float, ok: bool):
+        with self._lock:
+            self.latencies[endpoint].append(elapsed)
+            if not ok:
+                self.errors[endpoint] += 1
+    
+    def report(self, duration: float) -> List[Dict]:
+        """Summarize each endpoint; latencies in milliseconds."""
+        rows = []
+        with self._lock:
+            items = [(endpoint, sorted(samples)) for endpoint, samples in self.latencies.items()]
+        for endpoint, samples in sorted(items):
+            rows.append({
+                'endpoint': endpoint,
+                'requests': len(samples),
+                'rps': len(samples) / duration,
+                'p50_ms': percentile(samples, 50) * 1000,
+                'p95_ms': percentile(samples, 95) * 1000,
+                'p99_ms': percentile(samples, 99) * 1000,
+                'error_rate': self.errors[endpoint] / len(samples)
+            })
+        return rows
+
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_samples))))
+    return sorted_samples[min(rank, len(sorted_samples)) - 1]
+
+
+class Child:
+    """One simulated pupil playing games in a loop."""
+    
+    def __init__(self, base_url: str, categories: List[str], stats: Stats,
+                 think_scale: float, stop: threading.Event, mode: str = 'rest'):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port
+        self.connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        self.prefix = parts.path.rstrip('/')
+        self.mode = mode
+        self.category = random.choice(categories)
+        self.language = random.choice(LANGUAGES)
+        self.accuracy = random.uniform(0.5, 0.95)
+        self.stats = stats
+        self.think_scale = think_scale
+        self.stop = stop
+    
+    def request(self, method: str, path: str, endpoint: str, body: Optional[Dict] = None,
+                content_type: str = 'application/json') -> Tuple[int, Optional[Dict]]:
+        """Send a request and record its latency under ``endpoint``."""
+        payload = json.dumps(body) if body is not None else None
+        headers = {'Content-Type': content_type} if body is not None else {}
+        started = time.perf_counter()
+        try:
+            if self.connection.sock is None:
+                # Time new connections separately: the development server
+                # closes the connection after every response
+                self.connection.connect()
+                self.stats.record(CONNECT, time.perf_counter() - started, ok=True)
+                started = time.perf_counter()
+            self.connection.request(method, self.prefix + path, payload, headers)
+            response = self.connection.getresponse()
+            data = response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            self.stats.record(endpoint, time.perf_counter() - started, ok=False)
+            return 0, None
+        self.stats.record(endpoint, time.perf_counter() - started, ok=status < 500)
+        try:
+            return status, json.loads(data)
+        except ValueError:
+            return status, None
+    
+    def play(self):
+        """Play games until the run stops."""
+        while not self.stop.is_set():
+            status, game = self.request('POST', '/api/game/start', 'POST /api/game/start',
+                                        {'duration': 'short'})
+            if status != 201:
+                think(BETWEEN_GAMES, self.think_scale, self.stop)
+                continue
+            if self.mode == 'stream':
+                self.play_game_stream(game['game_id'])
+            else:
+                self.play_game(game['game_id'])
+            think(BETWEEN_GAMES, self.think_scale, self.stop)
+        self.connection.close()
+    
+    def play_game(self, game_id: str):
+        """Answer questions and act until the game is over."""
+        while not self.stop.is_set():
+            status, data = self.request(
+                'GET', f'/api/questions/random/{self.category}?language={self.language}',
+                'GET /api/questions/random/<category>'
+            )
+            if status != 200:
+                return
+            think(READ_QUESTION, self.think_scale, self.stop)
+            
+            think(CHOOSE_ACTION, self.think_scale, self.stop)
+            action = random.choice(ACTIONS)
+            status, result = self.request('POST', '/api/game/action', 'POST /api/game/action', {
+                'game_id': game_id,
+                'action': action,
+                'question_correct': random.random() < self.accuracy
+            })
+            if status != 200 or result['game']['is_game_over']:
+                return
+            
+            if action == 'shoot' and result['action_success']:
+                self.request('POST', '/api/game/score', 'POST /api/game/score',
+                             {'game_id': game_id, 'team': 'blue'})
+    
+    def play_game_stream(self, game_id: str):
+        """Play a game over its event stream, sending actions as messages."""
+        stream = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        try:
+            stream.request('GET', f'{self.prefix}/api/game/events/{game_id}'
+                                  f'?category={self.category}&language={self.language}')
+            events = stream.getresponse()
+            if events.status != 200:
+                self.stats.record('GET /api/game/events/<id>', 0.0, ok=False)
+                return
+            read_event(events)  # state
+            read_event(events)  # first question
+            
+            while not self.stop.is_set():
+                think(READ_QUESTION, self.think_scale, self.stop)
+                think(CHOOSE_ACTION, self.think_scale, self.stop)
+                action = random.choice(ACTIONS)
+                started = time.perf_counter()
+                status, _ = self.message(game_id, {
+                    'type': 'action',
+                    'action': action,
+                    'question_correct': random.random() < self.accuracy
+                })
+                if status != 204:
+                    return
+                name, event = read_event(events)
+                self.stats.record(STREAM_ACTION, time.perf_counter() - started, ok=name == 'action')
+                if name != 'action' or event['game']['is_game_over']:
+                    return
+                read_event(events)  # next question
+                
+                if action == 'shoot' and event['action_success']:
+                    self.message(game_id, {'type': 'score', 'team': 'blue'})
+                    name, event = read_event(events)
+                    if name != 'score' or event['game']['is_game_over']:
+                        return
+        except (OSError, http.client.HTTPException, ValueError):
+            self.stats.record(STREAM_ACTION, 0.0, ok=False)
+        finally:
+            stream.close()
+    
+    def message(self, game_id: str, body: Dict) -> Tuple[int, Optional[Dict]]:
+        """Send a text/plain game message, as a browser would without a preflight."""
+        return self.request('POST', f'/api/game/message/{game_id}', 'POST /api/game/message/<id>',
+                            body, content_type='text/plain')
+
+
+def read_event(response: http.client.HTTPResponse) -> Tuple[Optional[str], Optional[Dict]]:
+    """Read the next Server-Sent Event, skipping heartbeats."""
+    name, data = None, None
+    while True:
+        line = response.readline()
+        if not line:
+            return None, None
+        line = line.decode('utf-8').rstrip('\n')
+        if line.startswith('event: '):
+            name = line[len('event: '):]
+        elif line.startswith('data: '):
+            data = json.loads(line[len('data: '):])
+        elif not line and name is not None:
+            return name, data
+
+
+def seed_questions(db_path: str, categories: int = 6, per_category: int = 50):
+    """Create a database filled with synthetic questions."""
+    from database.db import Database
+    
+    db = Database(db_path)
+    with open(os.path.join(backend_dir, 'database', 'schema.sql'), 'r', encoding='utf-8') as f:
+        schema_sql = f.read()
+    rows = []
+    for c in range(categories):
+        for q in range(per_category):
+            answers = json.dumps([str(q + offset) for offset in range(4)])
+            rows.append((f'math_{c + 1}', f'What is {q} + 0?', f'Πόσο κάνει {q} + 0;',
+                         f'Was ist {q} + 0?', answers, 0))
+    with db.get_connection() as conn:
+        conn.executescript(schema_sql)
+        conn.executemany(
+            "INSERT INTO questions "
+            "(category, question_en, question_el, question_de, answers, correct_answer_index) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows
+        )
+
+
+def start_local_server(database: Optional[str] = None) -> Tuple[str, object]:
+    """Serve the app in a background thread on a free port."""
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    from app import create_app
+    
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+    
+    work_dir = tempfile.mkdtemp(prefix='smartkick-load-')
+    if database is None:
+        database = os.path.join(work_dir, 'load.db')
+        seed_questions(database)
+    app = create_app({
+        'WARM_UP': True,
+        'DATABASE_PATH': database,
+        'ACTION_LOG_PATH': os.path.join(work_dir, 'actions.log'),
+        # The sampler would also walk the stacks of every simulated child
+        'SAMPLING_PROFILER_HZ': 0,
+        # All simulated children share one address
+        'ADMISSION_CLIENT_RATE': 1e6,
+        'ADMISSION_CLIENT_BURST': 1e6
+    })
+    server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, name='server', daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}', server
+
+
+def fetch_categories(base_url: str) -> List[str]:
+    parts = urlsplit(base_url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+    connection.request('GET', parts.path.rstrip('/') + '/api/questions/categories')
+    categories = json.loads(connection.getresponse().read())['categories']
+    connection.close()
+    return categories
+
+
+def server_cpu_seconds(base_url: str) -> Optional[float]:
+    """Read the server's CPU time from /api/metrics, or None if unavailable."""
+    parts = urlsplit(base_url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+    try:
+        connection.request('GET', parts.path.rstrip('/') + '/api/metrics')
+        for line in connection.getresponse().read().decode('utf-8').splitlines():
+            if line.startswith('smartkick_process_cpu_seconds_total '):
+                return float(line.split()[1])
+    except (OSError, http.client.HTTPException, ValueError):
+        pass
+    finally:
+        connection.close()
+    return None
+
+
+def run(base_url: str, children: int, duration: float, ramp_up: float,
+        think_scale: float, mode: str = 'rest') -> Tuple[List[Dict], float]:
+    """
+    Run the simulation.
+    
+    Returns:
+        Per-endpoint report rows and the measured duration in seconds
+    """
+    categories = fetch_categories(base_url)
+    stats = Stats()
+    stop = threading.Event()
+    threads = []
+    
+    started = time.perf_counter()
+    for i in range(children):
+        child = Child(base_url, categories, stats, think_scale, stop, mode)
+        thread = threading.Thread(target=child.play, name=f'child-{i}', daemon=True)
+        thread.start()
+        threads.append(thread)
+        if ramp_up:
+            time.sleep(ramp_up / children)
+    
+    stop.wait(max(0.0, duration - (time.perf_counter() - started)))
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return stats.report(elapsed), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate classrooms playing against the API')
+    parser.add_argument('--url', help='Base URL of a running server (default: serve in-process)')
+    parser.add_argument('--database', help='Database for the in-process server '
+                                           '(default: temporary database with synthetic questions)')
+    parser.add_argument('--children', type=int, default=30, help='Concurrent simulated children')
+    parser.add_argument('--duration', type=float, default=60, help='Run time in seconds')
+    parser.add_argument('--ramp-up', type=float, default=5, help='Seconds to start all children')
+    parser.add_argument('--think-scale', type=float, default=1.0,
+                        help='Multiplier for think times (e.g. 0.1 for a 10x denser load)')
+    parser.add_argument('--mode', choices=['rest', 'stream'], default='rest',
+                        help='Play over REST requests or over a per-game event stream')
+    parser.add_argument('--json', help='Also write the report to this file')
+    args = parser.parse_args()
+    
+    server = None
+    base_url = args.url
+    if base_url is None:
+        base_url, server = start_local_server(args.database)
+    
+    print(f"Simulating {args.children} children against {base_url} for {args.duration:g}s "
+          f"({args.mode} mode)...")
+    cpu_before = server_cpu_seconds(base_url)
+    rows, elapsed = run(base_url, args.children, args.duration, args.ramp_up, args.think_scale,
+                        args.mode)
+    cpu_after = server_cpu_seconds(base_url)
+    if server is not None:
+        server.shutdown()
+    
+    print(f"\n{'endpoint':<40} {'requests':>9} {'req/s':>8} {'p50 ms':>8} "
+          f"{'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for row in rows:
+        print(f"{row['endpoint']:<40} {row['requests']:>9} {row['rps']:>8.1f} "
+              f"{row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f} "
+              f"{row['error_rate']:>7.2%}")
+    
+    total = sum(row['requests'] for row in rows if row['endpoint'] not in (CONNECT, STREAM_ACTION))
+    print(f"\n{total} requests in {elapsed:.1f}s ({total / elapsed:.1f} req/s) "
+          f"from {args.children} children")
+    
+    cpu = None
+    if cpu_before is not None and cpu_after is not None:
+        cpu = cpu_after - cpu_before
+        actions = sum(row['requests'] for row in rows if row['endpoint'] in ACTION_ROWS)
+        note = ' (includes the load generator)' if server is not None else ''
+        print(f"Server CPU {cpu:.2f}s{note}, "
+              f"{cpu / max(actions, 1) * 1000:.2f} ms per game action")
+    
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'children': args.children, 'mode': args.mode, 'duration': elapsed,
+                       'server_cpu_seconds': cpu, 'endpoints': rows}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,19 +3,57 @@ Database connection and utility functions.
 """
 import sqlite3
 import os
-from typing import Optional, Tuple
+import time
+from typing import Callable, Iterable, List, Optional, Tuple
 from contextlib import contextmanager
+from database.deadline import DeadlineExceeded, deadline_exceeded, expires_at
+from database.query_budget import record_connection, record_query
+from database.questions import migrate_content_hash
+from database.slow_query_log import DEFAULT_SLOW_QUERY_MS, SlowQueryLog
+
+# Seconds a connection waits for a lock when no deadline is active (sqlite3 default)
+DEFAULT_BUSY_TIMEOUT = 5.0
+
+# SQLite VM instructions between deadline checks
+PROGRESS_CHECK_STEPS = 1000
+
+# Callables invoked as listener(query, elapsed_seconds) after every statement
+_query_listeners: List[Callable[[str, float], None]] = []
+
+
+def add_query_listener(listener: Callable[[str, float], None]):
+    """
+    Register a function called after every executed statement.
+    
+    Args:
+        listener: Callable taking the SQL string and its duration in seconds
+    """
+    if listener not in _query_listeners:
+        _query_listeners.append(listener)
+
+
+def remove_query_listener(listener: Callable[[str, float], None]):
+    """Unregister a function added with add_query_listener()."""
+    if listener in _query_listeners:
+        _query_listeners.remove(listener)
+
+
+def _notify_query(query: str, elapsed: float):
+    """Report an executed statement to all listeners."""
+    for listener in _query_listeners:
+        listener(query, elapsed)
 
 
 class Database:
     """Database connection manager."""
     
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None, slow_query_ms: float = DEFAULT_SLOW_QUERY_MS):
         """
         Initialize database connection.
         
         Args:
             db_path: Path to SQLite database file. Defaults to backend/database/football_edu.db
+            slow_query_ms: Statements taking at least this long go to the slow query log
         """
         if db_path is None:
             # Get the directory of this file
@@ -23,6 +61,7 @@ class Database:
             db_path = os.path.join(current_dir, 'football_edu.db')
         
         self.db_path = db_path
+        self.slow_queries = SlowQueryLog(slow_query_ms)
         self._ensure_database_directory()
     
     def _ensure_database_directory(self):
@@ -41,17 +80,46 @@ class Database:
                 cursor = conn.cursor()
                 cursor.execute(...)
         """
-        conn = sqlite3.connect(self.db_path)
+        expires = expires_at()
+        if expires is None:
+            timeout = DEFAULT_BUSY_TIMEOUT
+        else:
+            timeout = expires - time.monotonic()
+            if timeout <= 0:
+                raise deadline_exceeded()
+        
+        conn = sqlite3.connect(self.db_path, timeout=timeout)
+        record_connection()
         conn.row_factory = sqlite3.Row  # Enable column access by name
+        if expires is not None:
+            # Returning True from the handler interrupts the running statement
+            conn.set_progress_handler(lambda: time.monotonic() > expires, PROGRESS_CHECK_STEPS)
         try:
             yield conn
             conn.commit()
+        except sqlite3.OperationalError as e:
+            conn.rollback()
+            # The busy timeout is the time left before the deadline, so running
+            # out of it waiting for a lock means the deadline ran out too, even
+            # if SQLite's sleep accounting gives up a moment early
+            if (expires is not None and not isinstance(e, DeadlineExceeded)
+                    and (time.monotonic() > expires or 'locked' in str(e))):
+                raise deadline_exceeded(f'Database deadline exceeded: {e}') from e
+            raise
         except Exception:
             conn.rollback()
             raise
         finally:
             conn.close()
     
+    def _record_statement(self, conn: sqlite3.Connection, query: str, params: Tuple,
+                          start: float):
+        """Report a finished statement to listeners and the slow query log."""
+        elapsed = time.perf_counter() - start
+        _notify_query(query, elapsed)
+        record_query(query)
+        self.slow_queries.record(query, params, elapsed, conn)
+    
     def execute(self, query: str, params: Tuple = ()):
         """
         Execute a query and return results.
@@ -65,8 +133,11 @@ class Database:
         """
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            start = time.perf_counter()
             cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+            rows = [dict(row) for row in cursor.fetchall()]
+            self._record_statement(conn, query, params, start)
+            return rows
     
     def execute_one(self, query: str, params: Tuple = ()):
         """
@@ -81,8 +152,10 @@ class Database:
         """
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            start = time.perf_counter()
             cursor.execute(query, params)
             row = cursor.fetchone()
+            self._record_statement(conn, query, params, start)
             return dict(row) if row else None
     
     def execute_update(self, query: str, params: Tuple = ()):
@@ -98,7 +171,31 @@ class Database:
         """
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            start = time.perf_counter()
             cursor.execute(query, params)
+            self._record_statement(conn, query, params, start)
+            return cursor.rowcount
+    
+    def execute_many(self, query: str, rows: Iterable[Tuple]):
+        """
+        Execute one statement for each parameter tuple, in a single transaction.
+        
+        Args:
+            query: SQL query string
+            rows: Parameter tuples
+        
+        Returns:
+            Total number of affected rows
+        """
+        rows = list(rows)
+        if not rows:
+            return 0
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            start = time.perf_counter()
+            cursor.executemany(query, rows)
+            # The first row's parameters stand in for the batch in the query plan
+            self._record_statement(conn, query, rows[0], start)
             return cursor.rowcount
 
 
@@ -114,8 +211,20 @@ def get_db() -> Database:
     return _db_instance
 
 
+def reset_db(db_path: str = None):
+    """
+    Reset the singleton database instance.
+    
+    Args:
+        db_path: Optional path for the new instance. If omitted, the next
+            get_db() call creates an instance at the default location.
+    """
+    global _db_instance
+    _db_instance = Database(db_path) if db_path else None
+
+
 def init_database():
-    """Initialize database schema from schema.sql."""
+    """Initialize database schema from schema.sql and bring existing tables up to date."""
     db = get_db()
     schema_file = os.path.join(os.path.dirname(__file__), 'schema.sql')
     
@@ -127,3 +236,6 @@ def init_database():
     
     with db.get_connection() as conn:
         conn.executescript(schema_sql)
+        removed = migrate_content_hash(conn)
+    if removed:
+        print(f"Removed {removed} duplicate questions")
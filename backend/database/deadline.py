@@ -0,0 +1,65 @@
+"""
+Deadlines for database work.
+
+A deadline is stored in a context variable, so it follows the request (or
+background task) that set it into every Database call it makes:
+
+    with deadline(0.5):
+        db.execute(...)
+
+While a deadline is active, connections wait for locks at most until the
+deadline (SQLite busy timeout), statements are interrupted by a progress
+handler once it passes, and work that starts after it raises immediately.
+All of these surface as DeadlineExceeded and are counted.
+"""
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+_deadline: ContextVar[Optional[float]] = ContextVar('db_deadline', default=None)
+
+_hits = 0
+_hits_lock = threading.Lock()
+
+
+class DeadlineExceeded(sqlite3.OperationalError):
+    """Database work was abandoned because its deadline passed."""
+
+
+@contextmanager
+def deadline(seconds: float):
+    """
+    Limit database work in the enclosed block to ``seconds`` from now.
+    
+    A nested deadline never extends an enclosing one.
+    """
+    expires = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        expires = min(expires, current)
+    token = _deadline.set(expires)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def expires_at() -> Optional[float]:
+    """Monotonic time at which the active deadline passes, or None."""
+    return _deadline.get()
+
+
+def deadline_exceeded(message: str = 'Database deadline exceeded') -> DeadlineExceeded:
+    """Count a deadline hit and build the exception to raise."""
+    global _hits
+    with _hits_lock:
+        _hits += 1
+    return DeadlineExceeded(message)
+
+
+def deadline_hits() -> int:
+    """Number of database operations abandoned at their deadline."""
+    return _hits
@@ -0,0 +1,113 @@
+"""
+Query and connection budgets for units of work.
+
+A tracker counts the statements executed and connections opened by the
+Database wrapper while it is active, so N+1 patterns (one query per row or per
+category) show up as a number instead of as latency:
+
+    with track_queries('import', max_queries=10) as tracker:
+        ...
+    print(tracker.summary())
+
+Trackers are stored in a context variable, so concurrent requests on other
+threads are counted separately. Nested trackers also count towards the
+trackers enclosing them.
+"""
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised by strict trackers that exceed their budget."""
+
+
+class QueryTracker:
+    """Counts statements and connections for one unit of work."""
+    
+    def __init__(self, name: str, max_queries: Optional[int] = None,
+                 max_connections: Optional[int] = None,
+                 parent: Optional['QueryTracker'] = None):
+        """
+        Initialize the tracker.
+        
+        Args:
+            name: Unit of work being tracked, used in messages
+            max_queries: Allowed number of statements (None for no limit)
+            max_connections: Allowed number of connections (None for no limit)
+            parent: Enclosing tracker that also receives the counts
+        """
+        self.name = name
+        self.max_queries = max_queries
+        self.max_connections = max_connections
+        self.parent = parent
+        self.queries: List[str] = []
+        self.connections = 0
+    
+    def violations(self) -> List[str]:
+        """Describe each exceeded budget."""
+        problems = []
+        if self.max_queries is not None and len(self.queries) > self.max_queries:
+            problems.append(f"{len(self.queries)} queries (budget {self.max_queries})")
+        if self.max_connections is not None and self.connections > self.max_connections:
+            problems.append(f"{self.connections} connections (budget {self.max_connections})")
+        return problems
+    
+    def summary(self) -> str:
+        """Format the counts as one line."""
+        return f"{self.name}: {len(self.queries)} queries, {self.connections} connections"
+
+
+_current_tracker: ContextVar[Optional[QueryTracker]] = ContextVar('query_tracker', default=None)
+
+
+def record_query(query: str):
+    """Count a statement against the active trackers."""
+    tracker = _current_tracker.get()
+    while tracker is not None:
+        tracker.queries.append(query)
+        tracker = tracker.parent
+
+
+def record_connection():
+    """Count an opened connection against the active trackers."""
+    tracker = _current_tracker.get()
+    while tracker is not None:
+        tracker.connections += 1
+        tracker = tracker.parent
+
+
+@contextmanager
+def track_queries(name: str, max_queries: Optional[int] = None,
+                  max_connections: Optional[int] = None, strict: bool = False):
+    """
+    Track statements and connections for the enclosed block.
+    
+    When the block finishes and a budget was exceeded, a warning is logged,
+    or QueryBudgetExceeded is raised if strict is set (as in tests).
+    
+    Args:
+        name: Unit of work being tracked, used in messages
+        max_queries: Allowed number of statements (None for no limit)
+        max_connections: Allowed number of connections (None for no limit)
+        strict: Raise instead of logging when the budget is exceeded
+    
+    Yields:
+        The QueryTracker collecting the counts
+    """
+    tracker = QueryTracker(name, max_queries, max_connections, parent=_current_tracker.get())
+    token = _current_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _current_tracker.reset(token)
+    
+    problems = tracker.violations()
+    if problems:
+        message = f"Query budget exceeded in {name}: {', '.join(problems)}"
+        if strict:
+            raise QueryBudgetExceeded(f"{message}\n  " + '\n  '.join(tracker.queries))
+        logger.warning(message)
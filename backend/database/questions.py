@@ -0,0 +1,170 @@
+"""
+Question rows: content hashes and duplicate-free bulk inserts.
+
+Every question carries a content_hash over its category, question texts,
+answers and correct answer, normalized so that differences in case, Unicode
+form, whitespace or answer order do not make a new question. A unique index
+on the column lets importers insert in bulk with ON CONFLICT DO NOTHING
+instead of querying for each row whether it already exists.
+
+Usage:
+    rows = [question_row('math_1', {'en': 'What is 2 + 2?'}, ['3', '4'], 1)]
+    inserted = insert_questions(get_db(), rows)
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+INSERT_QUESTION = """
+    INSERT INTO questions
+    (category, question_en, question_el, question_de, answers, correct_answer_index, content_hash)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(content_hash) DO NOTHING
+"""
+
+# Rows hashed per statement batch when backfilling an existing database
+BACKFILL_BATCH = 1000
+
+
+def _normalize(text: Optional[str]) -> str:
+    return ' '.join(unicodedata.normalize('NFKC', text or '').split()).casefold()
+
+
+def content_hash(category: str, question_en: Optional[str], question_el: Optional[str],
+                 question_de: Optional[str], answers: Sequence[str],
+                 correct_answer_index: int) -> str:
+    """
+    Hash a question's normalized content.
+    
+    Args:
+        category: Question category
+        question_en: English text
+        question_el: Greek text (optional)
+        question_de: German text (optional)
+        answers: Answer strings, in any order
+        correct_answer_index: Index of the correct answer in ``answers``
+    
+    Returns:
+        Hex SHA-256 digest
+    
+    Raises:
+        ValueError: If answers is not a list or the index is not one of its positions
+    """
+    if not isinstance(answers, (list, tuple)):
+        raise ValueError('answers must be a list')
+    if (not isinstance(correct_answer_index, int) or isinstance(correct_answer_index, bool)
+            or not 0 <= correct_answer_index < len(answers)):
+        raise ValueError(f'correct_answer_index {correct_answer_index!r} is out of range '
+                         f'for {len(answers)} answers')
+    parts = [category.strip(), _normalize(question_en), _normalize(question_el),
+             _normalize(question_de), '\x1f'.join(sorted(_normalize(str(a)) for a in answers)),
+             _normalize(str(answers[correct_answer_index]))]
+    return hashlib.sha256('\x1e'.join(parts).encode('utf-8')).hexdigest()
+
+
+def question_row(category: str, question: Dict[str, str], answers: List[str],
+                 correct_answer_index: int) -> Tuple:
+    """
+    Build the INSERT_QUESTION parameters for one question.
+    
+    Args:
+        category: Question category
+        question: Question text by language ('en', 'el', 'de')
+        answers: Answer strings
+        correct_answer_index: Index of the correct answer
+    
+    Raises:
+        ValueError: If the correct answer index is out of range
+    """
+    question_en = question.get('en', '')
+    question_el = question.get('el', '')
+    question_de = question.get('de', '')
+    return (category, question_en, question_el, question_de,
+            json.dumps(answers, ensure_ascii=False), correct_answer_index,
+            content_hash(category, question_en, question_el, question_de, answers,
+                         correct_answer_index))
+
+
+def json_question_rows(category: str, questions: Iterable[Dict]) -> List[Tuple]:
+    """
+    Build rows for questions in the config/questions.json format.
+    
+    Questions whose correct answer index is out of range are logged and left out.
+    """
+    rows = []
+    for question_data in questions:
+        try:
+            rows.append(question_row(category, question_data.get('question', {}),
+                                     question_data.get('answers', []),
+                                     question_data.get('correct_answer', 0)))
+        except ValueError as e:
+            logger.warning("Skipping question in %s: %s", category, e)
+    return rows
+
+
+def insert_questions(db, rows: Iterable[Tuple]) -> int:
+    """
+    Insert question rows in one transaction, skipping duplicates.
+    
+    Args:
+        db: Database instance
+        rows: Parameters built with question_row()
+    
+    Returns:
+        Number of rows inserted
+    """
+    return db.execute_many(INSERT_QUESTION, rows)
+
+
+def migrate_content_hash(conn: sqlite3.Connection) -> int:
+    """
+    Add and backfill the content_hash column, removing duplicate questions.
+    
+    Safe to run on every startup: it only hashes rows without a hash. Of
+    questions with the same content, the oldest (lowest id) is kept. Rows
+    that cannot be hashed (malformed answers or an out-of-range correct
+    answer index) are logged and keep a NULL hash.
+    
+    Args:
+        conn: Open connection; the caller commits
+    
+    Returns:
+        Number of duplicate questions removed
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(questions)")}
+    if 'content_hash' not in columns:
+        conn.execute("ALTER TABLE questions ADD COLUMN content_hash TEXT")
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_questions_content_hash ON questions(content_hash)"
+    )
+    
+    removed = 0
+    last_id = -1
+    while True:
+        rows = conn.execute(
+            "SELECT id, category, question_en, question_el, question_de, answers, correct_answer_index "
+            "FROM questions WHERE content_hash IS NULL AND id > ? ORDER BY id LIMIT ?",
+            (last_id, BACKFILL_BATCH)
+        ).fetchall()
+        if not rows:
+            return removed
+        last_id = rows[-1][0]
+        
+        hashes = []
+        for id_, category, question_en, question_el, question_de, answers, correct_answer_index in rows:
+            try:
+                hashes.append((content_hash(category, question_en, question_el, question_de,
+                                            json.loads(answers), correct_answer_index), id_))
+            except (TypeError, ValueError) as e:
+                logger.warning("Question %s has invalid answers, leaving it unhashed: %s", id_, e)
+        # A hashed row whose hash is already taken keeps NULL and is a duplicate
+        conn.executemany("UPDATE OR IGNORE questions SET content_hash = ? WHERE id = ?", hashes)
+        removed += conn.executemany(
+            "DELETE FROM questions WHERE id = ? AND content_hash IS NULL",
+            [(id_,) for _, id_ in hashes]
+        ).rowcount
@@ -10,6 +10,7 @@ CREATE TABLE IF NOT EXISTS questions (
     question_de TEXT,
     answers TEXT NOT NULL,  -- JSON array of answer strings
     correct_answer_index INTEGER NOT NULL,  -- Index in answers array (0-based)
+    content_hash TEXT,  -- Normalized content hash (see database/questions.py)
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -20,6 +21,9 @@ CREATE INDEX IF NOT EXISTS idx_questions_category ON questions(category);
 -- Index for faster random selection within category
 CREATE INDEX IF NOT EXISTS idx_questions_category_id ON questions(category, id);
 
+-- Unique index idx_questions_content_hash is created by init_database(), after
+-- the column has been added to databases created before it existed
+
 -- Game states table (for future use)
 CREATE TABLE IF NOT EXISTS game_states (
     id TEXT PRIMARY KEY,
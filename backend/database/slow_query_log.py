@@ -0,0 +1,132 @@
+"""
+Slow query log for the Database wrapper.
+
+Statements slower than a threshold are aggregated by normalized SQL (literals
+replaced with ``?`` and whitespace collapsed). The first time a distinct
+statement is seen to be slow, its ``EXPLAIN QUERY PLAN`` output is captured
+on the same connection, so the report shows both how often a statement is
+slow and why.
+"""
+import re
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_SLOW_QUERY_MS = 100.0
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(query: str) -> str:
+    """
+    Normalize a statement so that variants differing only in literals match.
+    
+    Example:
+        "SELECT * FROM questions WHERE id IN (1, 2,  3)"
+        -> "SELECT * FROM questions WHERE id IN (?, ...)"
+    """
+    normalized = _STRING_LITERAL.sub('?', query)
+    normalized = _NUMBER.sub('?', normalized)
+    normalized = _PLACEHOLDER_LIST.sub('(?, ...)', normalized)
+    return _WHITESPACE.sub(' ', normalized).strip()
+
+
+class SlowQueryLog:
+    """Aggregates statements slower than a threshold."""
+    
+    def __init__(self, threshold_ms: float = DEFAULT_SLOW_QUERY_MS, explain: bool = True):
+        """
+        Initialize the log.
+        
+        Args:
+            threshold_ms: Statements taking at least this long are recorded
+            explain: Capture EXPLAIN QUERY PLAN for each distinct slow statement
+        """
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+    
+    def record(self, query: str, params: Tuple, elapsed: float,
+               conn: Optional[sqlite3.Connection] = None):
+        """
+        Record a statement if it was slow.
+        
+        Args:
+            query: SQL statement as executed
+            params: Parameters it was executed with
+            elapsed: Duration in seconds
+            conn: Open connection, used to capture the query plan once
+        """
+        elapsed_ms = elapsed * 1000
+        if elapsed_ms < self.threshold_ms:
+            return
+        
+        normalized = normalize_sql(query)
+        with self._lock:
+            entry = self._entries.get(normalized)
+            if entry is None:
+                entry = self._entries[normalized] = {
+                    'statement': normalized,
+                    'count': 0,
+                    'total_ms': 0.0,
+                    'max_ms': 0.0,
+                    'plan': None
+                }
+            entry['count'] += 1
+            entry['total_ms'] += elapsed_ms
+            entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+            capture_plan = self.explain and conn is not None and entry['plan'] is None
+            if capture_plan:
+                entry['plan'] = []  # Claim the capture so it happens only once
+        
+        if capture_plan:
+            entry['plan'] = self._explain(conn, query, params)
+    
+    @staticmethod
+    def _explain(conn: sqlite3.Connection, query: str, params: Tuple) -> List[str]:
+        """Get the query plan lines for a statement."""
+        try:
+            rows = conn.execute(f'EXPLAIN QUERY PLAN {query}', params).fetchall()
+        except sqlite3.Error as e:
+            return [f'(plan unavailable: {e})']
+        return [row[-1] for row in rows]
+    
+    def report(self) -> List[Dict]:
+        """
+        Get slow statements, most total time first.
+        
+        Returns:
+            List of dictionaries with 'statement', 'count', 'total_ms',
+            'max_ms', 'avg_ms' and 'plan'
+        """
+        with self._lock:
+            entries = [dict(entry) for entry in self._entries.values()]
+        for entry in entries:
+            entry['avg_ms'] = entry['total_ms'] / entry['count']
+        return sorted(entries, key=lambda entry: entry['total_ms'], reverse=True)
+    
+    def format_report(self) -> str:
+        """Format the report as human-readable text."""
+        entries = self.report()
+        if not entries:
+            return f"No statements slower than {self.threshold_ms:g}ms"
+        
+        lines = [f"Statements slower than {self.threshold_ms:g}ms:"]
+        for entry in entries:
+            lines.append(
+                f"\n{entry['count']:>6}x  total {entry['total_ms']:.1f}ms  "
+                f"avg {entry['avg_ms']:.1f}ms  max {entry['max_ms']:.1f}ms"
+            )
+            lines.append(f"  {entry['statement']}")
+            for plan_line in entry['plan'] or []:
+                lines.append(f"    plan: {plan_line}")
+        return '\n'.join(lines)
+    
+    def reset(self):
+        """Forget all recorded statements."""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Pre-fork server entry point.
+
+The master process builds the app, loads the question bank, configuration and
+translations, then calls gc.freeze() before forking the workers. Frozen
+objects are moved out of the garbage collector's generations, so collections
+in the workers never write to their headers and the pages holding them stay
+shared copy-on-write instead of being duplicated per worker.
+
+All workers accept connections from one listening socket. Live games are
+kept in each worker's memory, so when running more than one worker, put a
+proxy in front that routes each client to the same worker (e.g. hashing on
+the client address).
+
+Each worker writes and rotates its own action log, named after its process
+ID (logs/actions.<pid>.log), because rotating one file from several
+processes loses lines.
+
+Usage:
+    python prefork.py --workers 4 --port 8000 [--report-interval 60]
+"""
+import argparse
+import gc
+import os
+import signal
+import sys
+import time
+from typing import Dict, List
+
+from app import create_app
+
+
+def read_memory_usage(pid: int) -> Dict[str, int]:
+    """
+    Read memory usage of a process from /proc (Linux only).
+    
+    Args:
+        pid: Process ID
+    
+    Returns:
+        Dictionary of sizes in kB with keys 'rss', 'pss', 'shared' and
+        'private'. Empty if the information is not available.
+    """
+    fields = {
+        'Rss': 'rss',
+        'Pss': 'pss',
+        'Shared_Clean': 'shared',
+        'Shared_Dirty': 'shared',
+        'Private_Clean': 'private',
+        'Private_Dirty': 'private'
+    }
+    usage = {'rss': 0, 'pss': 0, 'shared': 0, 'private': 0}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup', 'r') as f:
+            for line in f:
+                name, _, rest = line.partition(':')
+                if name in fields:
+                    usage[fields[name]] += int(rest.split()[0])
+    except (OSError, ValueError, IndexError):
+        return {}
+    return usage
+
+
+def format_memory_report(usage_by_pid: Dict[int, Dict[str, int]]) -> str:
+    """Format per-worker memory usage as a table."""
+    lines = [f"{'pid':>8} {'rss kB':>10} {'pss kB':>10} {'shared kB':>10} {'private kB':>10}"]
+    for pid, usage in sorted(usage_by_pid.items()):
+        if not usage:
+            lines.append(f"{pid:>8} {'n/a':>10}")
+            continue
+        lines.append(
+            f"{pid:>8} {usage['rss']:>10} {usage['pss']:>10} "
+            f"{usage['shared']:>10} {usage['private']:>10}"
+        )
+    return '\n'.join(lines)
+
+
+def preload_shared_state():
+    """Load everything workers would otherwise build on their own."""
+    from services.config_service import get_config_service
+    from services.question_service import get_question_service
+    from services.translation_service import get_translation_service
+    
+    get_config_service().get_config()
+    get_translation_service()
+    bank = get_question_service().load_bank()
+    
+    print(f"[PREFORK] Preloaded {sum(len(q) for q in bank.values())} questions "
+          f"in {len(bank)} categories")
+
+
+def spawn_worker(server) -> int:
+    """Fork a worker that serves requests from the shared socket."""
+    pid = os.fork()
+    if pid == 0:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        try:
+            server.serve_forever()
+        finally:
+            os._exit(0)
+    return pid
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the backend with pre-forked workers')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2)
+    parser.add_argument('--database', default=None,
+                        help='SQLite database path (defaults to database/football_edu.db)')
+    parser.add_argument('--report-interval', type=float, default=60.0,
+                        help='Seconds between per-worker memory reports (0 disables)')
+    args = parser.parse_args()
+    
+    from werkzeug.serving import make_server
+    
+    app = create_app({'WARM_UP': True, 'DATABASE_PATH': args.database,
+                      'ACTION_LOG_PER_PROCESS': True})
+    preload_shared_state()
+    server = make_server(args.host, args.port, app, threaded=True)
+    
+    # Move everything allocated so far out of the collected generations
+    gc.collect()
+    gc.freeze()
+    print(f"[PREFORK] Froze {gc.get_freeze_count()} objects; "
+          f"starting {args.workers} workers on {args.host}:{args.port}")
+    
+    workers: List[int] = [spawn_worker(server) for _ in range(args.workers)]
+    
+    def shutdown(signum, frame):
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        sys.exit(0)
+    
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    
+    next_report = time.monotonic() + args.report_interval
+    while True:
+        # Replace workers that exited
+        try:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            pid = 0
+        if pid and pid in workers:
+            print(f"[PREFORK] Worker {pid} exited; restarting")
+            workers[workers.index(pid)] = spawn_worker(server)
+        
+        if args.report_interval and time.monotonic() >= next_report:
+            report = {pid: read_memory_usage(pid) for pid in workers}
+            print(f"[PREFORK] Worker memory:\n{format_memory_report(report)}", flush=True)
+            next_report = time.monotonic() + args.report_interval
+        
+        time.sleep(1.0)
+
+
+if __name__ == '__main__':
+    main()
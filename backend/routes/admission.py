@@ -0,0 +1,77 @@
+"""Admission control hooks (rate limits and concurrency cap)"""
+import math
+from flask import Blueprint, current_app, g, jsonify, request
+from services.metrics import CallbackMetric, registry
+
+admission_bp = Blueprint('admission', __name__)
+
+# Endpoints that must keep answering when the process is overloaded
+EXEMPT_ENDPOINTS = {'api.health_check', 'metrics.get_metrics'}
+
+
+def _controller():
+    return current_app.extensions.get('admission')
+
+
+def _rejections():
+    controller = _controller()
+    if controller is None:
+        return {}
+    return {(reason,): count for reason, count in controller.stats()['rejected'].items()}
+
+
+def _active_requests():
+    controller = _controller()
+    return controller.active if controller is not None else 0
+
+
+registry.register(CallbackMetric(
+    'smartkick_admission_rejected_total',
+    'Requests rejected by admission control, by limit (concurrency, client, game)',
+    'counter', _rejections, ('limit',)
+))
+registry.register(CallbackMetric(
+    'smartkick_admission_active_requests',
+    'Requests currently holding a concurrency slot',
+    'gauge', _active_requests
+))
+
+
+def _game_id():
+    """Find the game a request is about, from the URL or the JSON body."""
+    game_id = (request.view_args or {}).get('game_id')
+    if game_id is None and request.is_json:
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            game_id = data.get('game_id')
+    return game_id if isinstance(game_id, str) else None
+
+
+@admission_bp.before_app_request
+def _admit_request():
+    controller = _controller()
+    if controller is None or request.endpoint in EXEMPT_ENDPOINTS:
+        return None
+    
+    if not controller.acquire_slot():
+        response = jsonify({'success': False, 'error': 'Server busy, please retry'})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+    g.admission_slot = True
+    
+    rejection = controller.check_rate(request.remote_addr or 'unknown', _game_id())
+    if rejection is not None:
+        response = jsonify({
+            'success': False,
+            'error': 'Too many requests',
+            'limit': rejection['limit']
+        })
+        response.headers['Retry-After'] = str(max(1, math.ceil(rejection['retry_after'])))
+        return response, 429
+    return None
+
+
+@admission_bp.teardown_app_request
+def _release_slot(exc):
+    if g.pop('admission_slot', False):
+        _controller().release_slot()
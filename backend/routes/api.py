@@ -1,2 +1,81 @@
-# API endpoints - to be implemented
+"""General API routes (health check, game configuration and translations)"""
+from typing import Dict, Optional, Tuple
+from flask import Blueprint, request
+from services.config_service import get_config_service
+from services.http_cache import (CachedPayload, VersionedPayload, conditional_response,
+                                 negotiated_content_type)
+from services.translation_service import get_translation_service
+from routes.query_budget import query_budget
 
+api_bp = Blueprint('api', __name__)
+
+# Translations only change with a deploy; clients revalidate with the ETag after that
+TRANSLATIONS_CACHE_CONTROL = 'public, max-age=300'
+
+# Serialized translation documents by (language, content type); language
+# None holds all languages
+_translation_payloads: Dict[Tuple[Optional[str], str], CachedPayload] = {}
+
+
+@api_bp.route('/health', methods=['GET'])
+@query_budget(max_queries=0, max_connections=0)
+def health_check():
+    """Health check endpoint"""
+    return {'status': 'ok'}, 200
+
+
+def _config_document():
+    """Build the game configuration in the format expected by the frontend."""
+    probabilities = get_config_service().get_config().get('probabilities', {})
+    return {
+        'success': True,
+        'probabilities': {
+            'pass': probabilities.get('player', {}).get('pass', 0.80),
+            'dribble': probabilities.get('player', {}).get('dribble', 0.60),
+            'shoot': probabilities.get('player', {}).get('shoot', 0.50),
+            'tackle': probabilities.get('player', {}).get('tackle', 0.75)
+        },
+        'goalkeeper_save': probabilities.get('goalkeeper_save', 0.50)
+    }
+
+
+_config_payload = VersionedPayload(_config_document)
+
+
+@api_bp.route('/config', methods=['GET'])
+@query_budget(max_queries=0, max_connections=0)
+def get_config():
+    """Get game configuration (rebuilt only when the config changes)"""
+    return conditional_response(_config_payload.get(get_config_service().version))
+
+
+@api_bp.route('/translations', methods=['GET'])
+@query_budget(max_queries=0, max_connections=0)
+def get_translations():
+    """
+    Get UI translations.
+    
+    Query parameters:
+        lang: Optional language code; only that language is returned
+    
+    Returns:
+        Translations document keyed by language code, with a strong ETag
+        (304 when If-None-Match matches) and a gzip body when accepted
+    """
+    language = request.args.get('lang')
+    content_type = negotiated_content_type()
+    payload = _translation_payloads.get((language, content_type))
+    if payload is None:
+        translation_service = get_translation_service()
+        if language is None:
+            data = translation_service.get_translations()
+        else:
+            translations = translation_service.get_language(language)
+            if translations is None:
+                return {'success': False, 'error': f"Unknown language: {language}"}, 404
+            data = {language: translations}
+        payload = _translation_payloads[language, content_type] = CachedPayload.from_document(
+            data, content_type
+        )
+    
+    return conditional_response(payload, TRANSLATIONS_CACHE_CONTROL)
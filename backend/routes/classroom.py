@@ -0,0 +1,100 @@
+"""Classroom API routes (teacher dashboard)"""
+from flask import Blueprint, current_app, jsonify, request
+from services.classroom_service import classroom_topic, get_classroom_service
+from services.event_bus import get_event_bus
+from services.game_service import get_game_service
+from services.sse import HEARTBEAT, event_stream_response, format_event
+from routes.query_budget import query_budget
+
+classroom_bp = Blueprint('classroom', __name__)
+
+
+@classroom_bp.route('', methods=['POST'])
+@query_budget(max_queries=0, max_connections=0)
+def create_classroom():
+    """Create a classroom"""
+    data = request.get_json(silent=True) or {}
+    name = data.get('name') or 'Classroom'
+    
+    classroom = get_classroom_service().create_classroom(name)
+    if classroom is None:
+        return jsonify({'success': False, 'error': 'Too many classrooms, please retry later'}), 503
+    return jsonify({
+        'success': True,
+        'classroom_id': classroom.classroom_id,
+        'name': classroom.name
+    }), 201
+
+
+@classroom_bp.route('/<classroom_id>', methods=['GET'])
+@query_budget(max_queries=0, max_connections=0)
+def get_classroom(classroom_id):
+    """Get a classroom's games and totals"""
+    snapshot = get_classroom_service().get_snapshot(classroom_id)
+    if snapshot is None:
+        return jsonify({'success': False, 'error': 'Classroom not found'}), 404
+    
+    return jsonify({
+        'success': True,
+        'classroom': snapshot
+    }), 200
+
+
+@classroom_bp.route('/<classroom_id>/games', methods=['POST'])
+@query_budget(max_queries=0, max_connections=0)
+def add_game(classroom_id):
+    """Add an existing game to a classroom"""
+    data = request.get_json(silent=True) or {}
+    game_id = data.get('game_id')
+    if not game_id:
+        return jsonify({'success': False, 'error': 'Missing game_id'}), 400
+    
+    game = get_game_service().get_game_snapshot(game_id)
+    if game is None:
+        return jsonify({'success': False, 'error': 'Game not found'}), 404
+    
+    try:
+        added = get_classroom_service().add_game(classroom_id, game)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 409
+    if not added:
+        return jsonify({'success': False, 'error': 'Classroom not found or full'}), 404
+    
+    return jsonify({'success': True}), 200
+
+
+@classroom_bp.route('/<classroom_id>/stream', methods=['GET'])
+@query_budget(max_queries=0, max_connections=0)
+def stream_classroom(classroom_id):
+    """
+    Stream a classroom's dashboard as Server-Sent Events.
+    
+    Events: 'snapshot' with every game summary and the totals, then 'update'
+    with the changed fields of one game and the new totals. Comment lines
+    are sent as heartbeats while the classroom is idle.
+    """
+    bus = get_event_bus()
+    if bus.subscriber_count() >= current_app.config['EVENT_STREAMS_MAX']:
+        response = jsonify({'success': False, 'error': 'Too many event streams, please retry'})
+        response.headers['Retry-After'] = '5'
+        return response, 503
+    
+    # Subscribe before taking the snapshot so no delta falls in between
+    subscription = bus.subscribe(classroom_topic(classroom_id))
+    snapshot = get_classroom_service().get_snapshot(classroom_id)
+    if snapshot is None:
+        subscription.close()
+        return jsonify({'success': False, 'error': 'Classroom not found'}), 404
+    
+    heartbeat = current_app.config['EVENT_STREAM_HEARTBEAT_SECONDS']
+    
+    def generate():
+        yield format_event('snapshot', snapshot)
+        while not subscription.closed:
+            delta = subscription.get(timeout=heartbeat)
+            yield HEARTBEAT if delta is None else format_event('update', delta)
+    
+    response = event_stream_response(generate())
+    # Runs when the client disconnects, even if the stream never started
+    response.call_on_close(subscription.close)
+    return response
@@ -0,0 +1,44 @@
+"""Response compression hook (gzip, and brotli if installed)"""
+from flask import Blueprint, current_app, request
+from services.compression import available_encodings, compress, negotiate
+
+compression_bp = Blueprint('compression', __name__)
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/javascript', 'image/svg+xml'}
+
+
+def _compressible(response) -> bool:
+    """Check whether a response may be compressed here."""
+    if response.status_code != 200 or response.direct_passthrough or response.is_streamed:
+        return False
+    if 'Content-Encoding' in response.headers:
+        # Already compressed, e.g. a precompressed cached payload
+        return False
+    mimetype = response.mimetype or ''
+    return mimetype.startswith('text/') or mimetype in COMPRESSIBLE_MIMETYPES
+
+
+@compression_bp.after_app_request
+def _compress_response(response):
+    if not current_app.config['COMPRESSION_ENABLED'] or not _compressible(response):
+        return response
+    
+    body = response.get_data()
+    if len(body) < current_app.config['COMPRESSION_MIN_SIZE']:
+        return response
+    response.vary.add('Accept-Encoding')
+    
+    encoding = negotiate(request.headers.get('Accept-Encoding', ''), available_encodings())
+    if encoding is None:
+        return response
+    compressed = compress(body, encoding)
+    if len(compressed) >= len(body):
+        return response
+    
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        # The compressed representation needs its own strong ETag
+        response.set_etag(f'{etag}-{encoding}')
+    return response
@@ -0,0 +1,26 @@
+"""Per-route deadlines for database work"""
+import functools
+from typing import Callable
+from database.deadline import deadline
+
+
+def request_deadline(seconds: float) -> Callable:
+    """
+    Abandon database work in a view after ``seconds``.
+    
+    Database calls made past the deadline raise DeadlineExceeded, which
+    views should answer with 503 rather than holding the worker thread.
+    
+    Usage:
+        @questions_bp.route('/categories', methods=['GET'])
+        @request_deadline(1.0)
+        def get_categories():
+            ...
+    """
+    def decorator(view: Callable) -> Callable:
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            with deadline(seconds):
+                return view(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,104 @@
+"""
+Debugging and profiling hooks.
+
+The debug endpoints expose internals (stacks, SQL) and are off unless
+DEBUG_ENDPOINTS_ENABLED is set; with DEBUG_ENDPOINTS_TOKEN they also
+require that bearer token. Reading is a GET; DELETE returns the same report
+and clears it.
+"""
+import hmac
+import os
+import time
+from flask import Blueprint, Response, current_app, g, jsonify, request
+from database.db import get_db
+from services.sampling_profiler import get_sampling_profiler
+
+debug_bp = Blueprint('debug', __name__)
+
+PROFILE_HEADER = 'X-Profile-Request'
+
+
+@debug_bp.before_app_request
+def _start_profiling():
+    profiler = current_app.extensions.get('request_profiler')
+    if profiler is None or not profiler.should_profile(PROFILE_HEADER in request.headers):
+        return
+    profile = profiler.start()
+    if profile is not None:
+        g.profile = profile
+        g.profile_start = time.perf_counter()
+
+
+@debug_bp.after_app_request
+def _save_profile(response):
+    profile = g.pop('profile', None)
+    if profile is not None:
+        profiler = current_app.extensions['request_profiler']
+        saved = profiler.stop(
+            profile,
+            endpoint=request.endpoint or 'unmatched',
+            method=request.method,
+            path=request.path,
+            status=response.status_code,
+            duration=time.perf_counter() - g.pop('profile_start')
+        )
+        # Relative to the profile directory, so server paths are not disclosed
+        response.headers['X-Profile-Saved'] = os.path.relpath(saved, profiler.profile_dir)
+    return response
+
+
+@debug_bp.before_request
+def _check_access():
+    if not current_app.config['DEBUG_ENDPOINTS_ENABLED']:
+        return jsonify({'success': False, 'error': 'Debug endpoints are disabled'}), 404
+    token = current_app.config['DEBUG_ENDPOINTS_TOKEN']
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''),
+                                         f'Bearer {token}'):
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 401
+    return None
+
+
+@debug_bp.route('/flamegraph', methods=['GET', 'DELETE'])
+def get_flamegraph():
+    """
+    Get sampled stacks in collapsed-stack format.
+    
+    DELETE returns the stacks and clears them, starting a new window.
+    Feed the output to flamegraph.pl or speedscope to render a flame graph.
+    """
+    profiler = get_sampling_profiler()
+    if profiler is None:
+        return jsonify({'success': False, 'error': 'Sampling profiler is disabled'}), 404
+    
+    folded = profiler.folded(reset=request.method == 'DELETE')
+    stats = profiler.stats()
+    response = Response(folded, content_type='text/plain; charset=utf-8')
+    response.headers['X-Profile-Samples'] = str(stats['samples'])
+    return response
+
+
+@debug_bp.route('/slow-queries', methods=['GET', 'DELETE'])
+def get_slow_queries():
+    """
+    Get statements slower than the slow query threshold.
+    
+    Query parameters:
+        format: 'text' for a human-readable report (default: JSON)
+    
+    DELETE returns the report and clears the log.
+    
+    Statements are aggregated by normalized SQL, most total time first, with
+    the EXPLAIN QUERY PLAN output captured the first time each was slow.
+    """
+    slow_queries = get_db().slow_queries
+    if request.args.get('format') == 'text':
+        response = Response(slow_queries.format_report(), content_type='text/plain; charset=utf-8')
+    else:
+        response = jsonify({
+            'success': True,
+            'threshold_ms': slow_queries.threshold_ms,
+            'statements': slow_queries.report()
+        })
+    if request.method == 'DELETE':
+        slow_queries.reset()
+    return response
@@ -1,12 +1,27 @@
 """Game logic API routes"""
-from flask import Blueprint, request, jsonify
-from services.game_service import get_game_service
+import json
+import time
+from typing import Dict, Optional
+from flask import Blueprint, current_app, request, jsonify
+from services.action_log import log_action
+from services.classroom_service import get_classroom_service
+from services.event_bus import get_event_bus
+from services.game_service import game_topic, get_game_service
+from services.question_service import get_question_service
+from services.replay_cache import KeyReused
+from services.sse import HEARTBEAT, event_stream_response, format_event
 from services.config_service import get_config_service
+from services.http_cache import VersionedPayload, conditional_response
+from routes.query_budget import query_budget
 
 game_bp = Blueprint('game', __name__)
 
+# Longest accepted Idempotency-Key (clients normally send a UUID)
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
 
 @game_bp.route('/start', methods=['POST'])
+@query_budget(max_queries=0, max_connections=0)
 def start_game():
     """Start a new game"""
     data = request.get_json() or {}
@@ -16,9 +31,23 @@ def start_game():
     if duration not in ['tiny', 'short', 'regular', 'long']:
         duration = 'regular'
     
+    # Optionally join a classroom so the game shows on the teacher dashboard
+    classroom_id = data.get('classroom_id')
+    if classroom_id is not None and not isinstance(classroom_id, str):
+        return jsonify({'success': False, 'error': 'classroom_id must be a string'}), 400
+    classroom_service = get_classroom_service()
+    if classroom_id and not classroom_service.has_room(classroom_id):
+        return jsonify({'success': False, 'error': 'Classroom not found or full'}), 404
+    
     game_service = get_game_service()
     game_state = game_service.create_game(duration=duration)
     
+    # The classroom may have filled up or expired since the check
+    if classroom_id and not classroom_service.add_game(
+            classroom_id, game_service.get_game_snapshot(game_state.game_id)):
+        game_service.delete_game(game_state.game_id)
+        return jsonify({'success': False, 'error': 'Classroom not found or full'}), 404
+    
     return jsonify({
         'success': True,
         'game_id': game_state.game_id,
@@ -31,21 +60,105 @@ def start_game():
 
 
 @game_bp.route('/state/<game_id>', methods=['GET'])
+@query_budget(max_queries=0, max_connections=0)
 def get_game_state(game_id):
     """Get current game state"""
     game_service = get_game_service()
-    game_state = game_service.get_game(game_id)
+    snapshot = game_service.get_game_snapshot(game_id)
     
-    if not game_state:
+    if not snapshot:
         return jsonify({'success': False, 'error': 'Game not found'}), 404
     
     return jsonify({
         'success': True,
-        'game': game_state.to_dict()
+        'game': snapshot
+    }), 200
+
+
+@game_bp.route('/states', methods=['POST'])
+@query_budget(max_queries=0, max_connections=0)
+def get_game_states():
+    """
+    Get the current state of several games.
+    
+    Body: {"game_ids": [...]}. Unknown IDs are listed under 'missing'
+    instead of failing the request.
+    """
+    data = request.get_json(silent=True) or {}
+    game_ids = data.get('game_ids')
+    if not isinstance(game_ids, list) or not all(isinstance(game_id, str) for game_id in game_ids):
+        return jsonify({'success': False, 'error': 'game_ids must be a list of strings'}), 400
+    
+    max_ids = current_app.config['GAME_STATES_MAX_IDS']
+    if len(game_ids) > max_ids:
+        return jsonify({'success': False, 'error': f'At most {max_ids} game_ids per request'}), 400
+    
+    games = get_game_service().get_game_snapshots(game_ids)
+    return jsonify({
+        'success': True,
+        'games': games,
+        'missing': [game_id for game_id in dict.fromkeys(game_ids) if game_id not in games]
     }), 200
 
 
+def _idempotency_key() -> Optional[str]:
+    """
+    Get the request's Idempotency-Key header, if any.
+    
+    Raises:
+        ValueError: If the key is too long
+    """
+    key = request.headers.get('Idempotency-Key')
+    if key is not None and len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+        raise ValueError(f'Idempotency-Key longer than {MAX_IDEMPOTENCY_KEY_LENGTH} characters')
+    return key
+
+
+def _points(value) -> int:
+    """
+    Check the points of a score update.
+    
+    Raises:
+        ValueError: If the value is not an integer
+    """
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError('points must be an integer')
+    return value
+
+
+def _perform_action(game_id: str, action: str, question_correct: bool,
+                    idempotency_key: Optional[str] = None) -> Optional[Dict]:
+    """
+    Execute an action through the game service and log it.
+    
+    Raises:
+        KeyReused: If the idempotency key was used for a different action
+    """
+    started = time.perf_counter()
+    result = get_game_service().perform_action(game_id, action, question_correct,
+                                               idempotency_key=idempotency_key)
+    if result is None or not result['success']:
+        return result
+    if result.pop('replayed', False):
+        # The action was logged when it first ran
+        result.pop('roll')
+        return result
+    
+    log_action(
+        'action',
+        game_id=game_id,
+        action=action,
+        question_correct=question_correct,
+        probability=result['probability'],
+        roll=result.pop('roll'),
+        action_success=result['action_success'],
+        latency_ms=round((time.perf_counter() - started) * 1000, 3)
+    )
+    return result
+
+
 @game_bp.route('/action', methods=['POST'])
+@query_budget(max_queries=0, max_connections=0)
 def execute_action():
     """Execute a player action"""
     data = request.get_json()
@@ -56,77 +169,169 @@ def execute_action():
     if not game_id or not action:
         return jsonify({'success': False, 'error': 'Missing game_id or action'}), 400
     
-    game_service = get_game_service()
-    game_state = game_service.get_game(game_id)
-    
-    if not game_state:
+    try:
+        result = _perform_action(game_id, action, question_correct, _idempotency_key())
+    except KeyReused as e:
+        return jsonify({'success': False, 'error': str(e)}), 422
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    if result is None:
         return jsonify({'success': False, 'error': 'Game not found'}), 404
-    
-    if game_state.is_game_over:
-        return jsonify({
-            'success': False,
-            'error': 'Game is over',
-            'reason': game_state.game_over_reason
-        }), 400
-    
-    # Adjust probability based on question result (temporary for this action only)
-    game_state.adjust_probability(action, question_correct)
-    
-    # Get current probability for this action (includes temporary adjustment)
-    probability = game_state.get_current_probability('player', action)
-    
-    # Increment player action count
-    game_state.increment_player_action()
-    
-    # Check if action succeeds (using the adjusted probability)
-    success = False
-    if question_correct:
-        import random
-        random_value = random.random()
-        success = random_value < probability
-        # Debug logging
-        print(f"[BACKEND] Action: {action}, Correct: {question_correct}, Probability: {probability:.2f}, Random: {random_value:.3f}, Success: {success}")
-    else:
-        print(f"[BACKEND] Action: {action}, Correct: {question_correct}, Success: False (question wrong)")
-    
-    # Reset probability adjustment after using it (so it doesn't accumulate)
-    # Clear the temporary adjustment so next action starts from base
-    game_state.current_probabilities['player'][action] = None
-    
-    return jsonify({
-        'success': True,
-        'action_success': success,
-        'probability': probability,
-        'game': game_state.to_dict()
-    }), 200
+    if not result['success']:
+        return jsonify(result), 400
+    return jsonify(result), 200
 
 
 @game_bp.route('/score', methods=['POST'])
+@query_budget(max_queries=0, max_connections=0)
 def update_score():
     """Update game score"""
     data = request.get_json()
     game_id = data.get('game_id')
     team = data.get('team')  # 'blue' or 'red'
-    points = data.get('points', 1)
     
     if not game_id or not team:
         return jsonify({'success': False, 'error': 'Missing game_id or team'}), 400
+    if not isinstance(team, str):
+        return jsonify({'success': False, 'error': 'team must be a string'}), 400
     
-    game_service = get_game_service()
-    game_state = game_service.get_game(game_id)
-    
-    if not game_state:
+    try:
+        game = get_game_service().update_score(game_id, team, _points(data.get('points', 1)),
+                                               idempotency_key=_idempotency_key())
+    except KeyReused as e:
+        return jsonify({'success': False, 'error': str(e)}), 422
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    if game is None:
         return jsonify({'success': False, 'error': 'Game not found'}), 404
     
-    game_state.update_score(team, points)
-    
     return jsonify({
         'success': True,
-        'game': game_state.to_dict()
+        'game': game
     }), 200
 
 
+@game_bp.route('/message/<game_id>', methods=['POST'])
+@query_budget(max_queries=0, max_connections=0)
+def post_message(game_id):
+    """
+    Send an action or score over the game's event stream.
+    
+    The body is a JSON object sent as text/plain, which browsers send as a
+    simple request without a CORS preflight:
+        {'type': 'action', 'action': str, 'question_correct': bool}
+        {'type': 'score', 'team': str, 'points': int (optional)}
+    
+    Either may carry an 'idempotency_key' (a custom header would cost a
+    preflight), with the same meaning as the Idempotency-Key header.
+    
+    The outcome is pushed to /events/<game_id> subscribers, so a success is
+    answered with an empty 204.
+    """
+    try:
+        message = json.loads(request.get_data(as_text=True))
+    except ValueError:
+        message = None
+    if not isinstance(message, dict):
+        return jsonify({'success': False, 'error': 'Body must be a JSON object'}), 400
+    
+    idempotency_key = message.get('idempotency_key')
+    if idempotency_key is not None and (not isinstance(idempotency_key, str)
+                                        or len(idempotency_key) > MAX_IDEMPOTENCY_KEY_LENGTH):
+        return jsonify({'success': False, 'error': 'Invalid idempotency_key'}), 400
+    
+    try:
+        if message.get('type') == 'action' and message.get('action'):
+            result = _perform_action(game_id, message['action'], message.get('question_correct', False),
+                                     idempotency_key)
+            if result is not None and not result['success']:
+                return jsonify(result), 400
+        elif message.get('type') == 'score' and isinstance(message.get('team'), str):
+            result = get_game_service().update_score(game_id, message['team'],
+                                                     _points(message.get('points', 1)),
+                                                     idempotency_key=idempotency_key)
+        else:
+            return jsonify({'success': False, 'error': 'Unknown message'}), 400
+    except KeyReused as e:
+        return jsonify({'success': False, 'error': str(e)}), 422
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    if result is None:
+        return jsonify({'success': False, 'error': 'Game not found'}), 404
+    return '', 204
+
+
+@game_bp.route('/events/<game_id>', methods=['GET'])
+@query_budget(max_queries=0, max_connections=0)
+def stream_events(game_id):
+    """
+    Stream a game's updates as Server-Sent Events.
+    
+    Query parameters:
+        category: Optional question category; a 'question' event with the
+            next question is sent at the start and after every action
+        language: Question language ('en', 'el', 'de'). Defaults to 'en'.
+    
+    Events: 'state' (first event and generic updates), 'action', 'score',
+    'question' and 'end' when the game is over or removed (reason
+    'removed'). Comment lines are sent as heartbeats while the game is idle.
+    """
+    category = request.args.get('category')
+    language = request.args.get('language', 'en')
+    if language not in ['en', 'el', 'de']:
+        return jsonify({'success': False, 'error': f"Invalid language code: {language}"}), 400
+    
+    bus = get_event_bus()
+    if bus.subscriber_count() >= current_app.config['EVENT_STREAMS_MAX']:
+        response = jsonify({'success': False, 'error': 'Too many event streams, please retry'})
+        response.headers['Retry-After'] = '5'
+        return response, 503
+    
+    # Subscribe before reading the snapshot so no update falls in between
+    subscription = bus.subscribe(game_topic(game_id))
+    snapshot = get_game_service().get_game_snapshot(game_id)
+    if snapshot is None:
+        subscription.close()
+        return jsonify({'success': False, 'error': 'Game not found'}), 404
+    
+    heartbeat = current_app.config['EVENT_STREAM_HEARTBEAT_SECONDS']
+    
+    def next_question():
+        question = get_question_service().get_random_question(category, language)
+        return format_event('question', {'game_id': game_id, 'question': question})
+    
+    def generate():
+        yield format_event('state', {'type': 'state', 'game_id': game_id, 'game': snapshot})
+        if category:
+            yield next_question()
+        if snapshot['is_game_over']:
+            yield format_event('end', {'game_id': game_id, 'reason': snapshot['game_over_reason']})
+            return
+        while not subscription.closed:
+            event = subscription.get(timeout=heartbeat)
+            if event is None:
+                yield HEARTBEAT
+                continue
+            game = event['game']
+            if game is None:
+                yield format_event('end', {'game_id': game_id, 'reason': 'removed'})
+                return
+            yield format_event(event['type'], event)
+            if game['is_game_over']:
+                yield format_event('end', {'game_id': game_id, 'reason': game['game_over_reason']})
+                return
+            if category and event['type'] == 'action':
+                yield next_question()
+    
+    response = event_stream_response(generate())
+    # Runs when the client disconnects or the stream ends, even if it never started
+    response.call_on_close(subscription.close)
+    return response
+
+
 @game_bp.route('/probability/<game_id>/<actor>/<action>', methods=['GET'])
+@query_budget(max_queries=0, max_connections=0)
 def get_probability(game_id, actor, action):
     """Get current probability for an action"""
     game_service = get_game_service()
@@ -147,13 +352,18 @@ def get_probability(game_id, actor, action):
         return jsonify({'success': False, 'error': str(e)}), 400
 
 
+def _duration_settings_document():
+    return {
+        'success': True,
+        'duration_settings': get_config_service().get_game_duration()
+    }
+
+
+_duration_settings_payload = VersionedPayload(_duration_settings_document)
+
+
 @game_bp.route('/settings/duration', methods=['GET'])
+@query_budget(max_queries=0, max_connections=0)
 def get_duration_settings():
-    """Get game duration settings"""
-    config_service = get_config_service()
-    duration_config = config_service.get_game_duration()
-    
-    return jsonify({
-        'success': True,
-        'duration_settings': duration_config
-    }), 200
+    """Get game duration settings (rebuilt only when the config changes)"""
+    return conditional_response(_duration_settings_payload.get(get_config_service().version))
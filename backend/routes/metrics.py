@@ -0,0 +1,149 @@
+"""Metrics API route and request instrumentation"""
+import time
+from flask import Blueprint, Response, g, has_request_context, request
+from database.db import add_query_listener, get_db
+from database.deadline import deadline_hits
+from services.metrics import (
+    CallbackMetric, db_queries_per_request, db_queries_total, registry,
+    request_latency, requests_total
+)
+
+metrics_bp = Blueprint('metrics', __name__)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _question_cache_stats():
+    from services.question_service import get_question_service
+    stats = get_question_service().stats
+    return {('hit',): stats['cache_hits'], ('miss',): stats['cache_misses']}
+
+
+def _question_bank_degraded():
+    from services.question_service import get_question_service
+    return get_question_service().stats['degraded']
+
+
+def _question_bank_age():
+    from services.question_service import get_question_service
+    return get_question_service().bank_age()
+
+
+def _game_counts():
+    from services.game_service import get_game_service
+    stats = get_game_service().get_store_stats()
+    return {('live',): stats['live'], ('evicted',): stats['evicted']}
+
+
+def _dropped_log_records():
+    from services.action_log import dropped_records
+    return dropped_records()
+
+
+def _config_reloads():
+    from services.config_service import get_config_service
+    return get_config_service().reload_count
+
+
+def _open_event_streams():
+    from services.event_bus import get_event_bus
+    return get_event_bus().subscriber_count()
+
+
+def _slow_query_counts():
+    return {(entry['statement'],): entry['count'] for entry in get_db().slow_queries.report()}
+
+
+def _slow_query_seconds():
+    return {(entry['statement'],): entry['total_ms'] / 1000
+            for entry in get_db().slow_queries.report()}
+
+
+registry.register(CallbackMetric(
+    'smartkick_question_cache_lookups_total',
+    'Question bank lookups served from memory (hit) or requiring a reload check (miss)',
+    'counter', _question_cache_stats, ('result',)
+))
+registry.register(CallbackMetric(
+    'smartkick_question_bank_degraded_total',
+    'Question bank revalidations that failed or missed their deadline; stale questions were served',
+    'counter', _question_bank_degraded
+))
+registry.register(CallbackMetric(
+    'smartkick_question_bank_age_seconds',
+    'Seconds since the question bank was last confirmed current',
+    'gauge', _question_bank_age
+))
+registry.register(CallbackMetric(
+    'smartkick_games',
+    'Games currently held in memory (live) and evicted since startup (evicted)',
+    'gauge', _game_counts, ('state',)
+))
+registry.register(CallbackMetric(
+    'smartkick_action_log_dropped_total',
+    'Action log records dropped because the writer queue was full',
+    'counter', _dropped_log_records
+))
+registry.register(CallbackMetric(
+    'smartkick_config_reloads_total',
+    'Game configuration reloads',
+    'counter', _config_reloads
+))
+registry.register(CallbackMetric(
+    'smartkick_db_deadline_exceeded_total',
+    'Database operations abandoned because their deadline passed',
+    'counter', deadline_hits
+))
+registry.register(CallbackMetric(
+    'smartkick_event_streams',
+    'Open event bus subscriptions (game and dashboard streams)',
+    'gauge', _open_event_streams
+))
+registry.register(CallbackMetric(
+    'smartkick_process_cpu_seconds_total',
+    'CPU time used by this process (user and system)',
+    'counter', time.process_time
+))
+registry.register(CallbackMetric(
+    'smartkick_db_slow_queries_total',
+    'Statements slower than the slow query threshold, by normalized SQL',
+    'counter', _slow_query_counts, ('statement',)
+))
+registry.register(CallbackMetric(
+    'smartkick_db_slow_query_seconds_total',
+    'Time spent in statements slower than the slow query threshold, by normalized SQL',
+    'counter', _slow_query_seconds, ('statement',)
+))
+
+
+def _count_db_query(query: str, elapsed: float):
+    """Count a statement globally and against the current request."""
+    db_queries_total.inc()
+    if has_request_context():
+        g.db_queries = g.get('db_queries', 0) + 1
+
+
+add_query_listener(_count_db_query)
+
+
+@metrics_bp.before_app_request
+def _start_request_timer():
+    g.request_start = time.perf_counter()
+    g.db_queries = 0
+
+
+@metrics_bp.after_app_request
+def _record_request_metrics(response):
+    start = g.get('request_start')
+    if start is not None:
+        endpoint = request.endpoint or 'unmatched'
+        request_latency.observe(time.perf_counter() - start, endpoint, request.method)
+        requests_total.inc(endpoint, request.method, str(response.status_code))
+        db_queries_per_request.observe(g.get('db_queries', 0), endpoint)
+    return response
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Expose metrics in the Prometheus text format"""
+    return Response(registry.render(), mimetype=None, content_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,31 @@
+"""Per-route database query budgets"""
+import functools
+from typing import Callable, Optional
+from flask import current_app, request
+from database.query_budget import track_queries
+
+
+def query_budget(max_queries: Optional[int] = None,
+                 max_connections: Optional[int] = None) -> Callable:
+    """
+    Limit the statements and connections a view may use.
+    
+    Exceeding the budget logs a warning, or raises QueryBudgetExceeded when
+    the app is testing or QUERY_BUDGET_STRICT is set, so that query-count
+    regressions fail the route tests.
+    
+    Usage:
+        @questions_bp.route('/categories', methods=['GET'])
+        @query_budget(max_queries=2, max_connections=2)
+        def get_categories():
+            ...
+    """
+    def decorator(view: Callable) -> Callable:
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            strict = current_app.testing or current_app.config['QUERY_BUDGET_STRICT']
+            with track_queries(request.endpoint or view.__name__, max_queries,
+                               max_connections, strict=strict):
+                return view(*args, **kwargs)
+        return wrapper
+    return decorator
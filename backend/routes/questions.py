@@ -1,23 +1,52 @@
 """
 API routes for question management.
 """
+from typing import Dict, Tuple
 from flask import Blueprint, request, jsonify
+from database.deadline import DeadlineExceeded
+from services.http_cache import VersionedPayload, conditional_response
 from services.question_service import get_question_service
+from services.serialization import raw_json_response, wants_msgpack, writes_fragments_verbatim
 from models.question import Question
+from routes.deadline import request_deadline
+from routes.query_budget import query_budget
 
 questions_bp = Blueprint('questions', __name__)
 
+# Reloading a stale question bank takes a fingerprint read and a full load
+bank_query_budget = query_budget(max_queries=2, max_connections=2)
+
+# Longest a request may wait for the database (only cold bank loads touch it)
+QUESTION_DEADLINE_SECONDS = 2.0
+
+
+def _deadline_response():
+    return jsonify({
+        'success': False,
+        'error': 'Question database is busy, please retry'
+    }), 503
+
+
+def _categories_document():
+    return {
+        'success': True,
+        'categories': get_question_service().get_categories()
+    }
+
+
+_categories_payload = VersionedPayload(_categories_document)
+
 
 @questions_bp.route('/categories', methods=['GET'])
+@bank_query_budget
+@request_deadline(QUESTION_DEADLINE_SECONDS)
 def get_categories():
-    """Get list of all available question categories."""
+    """Get list of all available question categories (rebuilt only when the bank changes)."""
     try:
         question_service = get_question_service()
-        categories = question_service.get_categories()
-        return jsonify({
-            'success': True,
-            'categories': categories
-        }), 200
+        return conditional_response(_categories_payload.get(question_service.get_bank_version()))
+    except DeadlineExceeded:
+        return _deadline_response()
     except Exception as e:
         return jsonify({
             'success': False,
@@ -26,6 +55,8 @@ def get_categories():
 
 
 @questions_bp.route('/random/<category>', methods=['GET'])
+@bank_query_budget
+@request_deadline(QUESTION_DEADLINE_SECONDS)
 def get_random_question(category: str):
     """
     Get a random question from the specified category.
@@ -46,7 +77,11 @@ def get_random_question(category: str):
             }), 400
         
         question_service = get_question_service()
-        question_data = question_service.get_random_question(category, language)
+        if wants_msgpack() or not writes_fragments_verbatim():
+            question_data = question_service.get_random_question(category, language)
+        else:
+            # Assembled from bytes serialized when the question bank was loaded
+            question_data = question_service.get_random_question_json(category, language)
         
         if question_data is None:
             return jsonify({
@@ -54,11 +89,82 @@ def get_random_question(category: str):
                 'error': f"Category '{category}' not found or empty."
             }), 404
         
+        if isinstance(question_data, bytes):
+            return raw_json_response(b'{"success":true,"question":' + question_data + b'}')
         return jsonify({
             'success': True,
             'question': question_data
         }), 200
+    
+    except DeadlineExceeded:
+        return _deadline_response()
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+def _batch_document(category: str, language: str):
+    return {
+        'success': True,
+        'category': category,
+        'questions': get_question_service().get_question_batch(category, language)
+    }
+
+
+# (bank version, payloads by (category, language)); replaced as a whole when
+# the question bank changes, so categories that left the bank are forgotten
+_batch_payloads: Tuple[int, Dict[Tuple[str, str], VersionedPayload]] = (0, {})
+
+
+@questions_bp.route('/batch/<category>', methods=['GET'])
+@bank_query_budget
+@request_deadline(QUESTION_DEADLINE_SECONDS)
+def get_question_batch(category: str):
+    """
+    Get all questions of a category in one response.
+    
+    Answers are shuffled once per question bank load, so the response is
+    serialized and compressed once and revalidated with its ETag until the
+    bank changes.
+    
+    Query parameters:
+        language: Language code ('en', 'el', 'de'). Defaults to 'en'.
+    """
+    try:
+        language = request.args.get('language', 'en')
         
+        if language not in ['en', 'el', 'de']:
+            return jsonify({
+                'success': False,
+                'error': f"Invalid language code: {language}. Must be 'en', 'el', or 'de'."
+            }), 400
+        
+        global _batch_payloads
+        question_service = get_question_service()
+        version = question_service.get_bank_version()
+        payloads_version, payloads = _batch_payloads
+        if payloads_version != version:
+            payloads = {}
+            _batch_payloads = (version, payloads)
+        
+        key = (category, language)
+        payload = payloads.get(key)
+        if payload is None:
+            if category not in question_service.get_categories():
+                return jsonify({
+                    'success': False,
+                    'error': f"Category '{category}' not found or empty."
+                }), 404
+            payload = payloads.setdefault(
+                key, VersionedPayload(lambda: _batch_document(category, language))
+            )
+        
+        return conditional_response(payload.get(version))
+    
+    except DeadlineExceeded:
+        return _deadline_response()
     except Exception as e:
         return jsonify({
             'success': False,
@@ -67,6 +173,8 @@ def get_random_question(category: str):
 
 
 @questions_bp.route('/validate', methods=['POST'])
+@bank_query_budget
+@request_deadline(QUESTION_DEADLINE_SECONDS)
 def validate_answer():
     """
     Validate an answer for a question.
@@ -104,6 +212,17 @@ def validate_answer():
                 'error': 'Missing required fields: category, question_id, answer_index'
             }), 400
         
+        # Accept numeric strings, as the database lookup this replaced did
+        try:
+            if isinstance(question_id, bool) or not isinstance(question_id, (int, str)):
+                raise ValueError
+            question_id = int(question_id)
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'question_id must be an integer'
+            }), 400
+        
         question_service = get_question_service()
         is_correct = question_service.validate_answer(
             category, question_id, answer_index, language
@@ -113,7 +232,9 @@ def validate_answer():
             'success': True,
             'correct': is_correct
         }), 200
-        
+    
+    except DeadlineExceeded:
+        return _deadline_response()
     except Exception as e:
         return jsonify({
             'success': False,
@@ -0,0 +1,174 @@
+"""
+Asynchronous structured logging for game actions.
+
+Request threads only build a log record and put it on an in-memory queue; a
+background writer thread formats records as JSON lines and writes them to a
+rotating file. The request path therefore never blocks on disk or terminal
+I/O. Sampling and level filtering happen before a record is queued, and
+records are dropped (and counted) rather than blocking when the queue is full.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+ACTION_LOGGER_NAME = 'smartkick.actions'
+
+DEFAULT_LOG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'logs', 'actions.log'
+)
+
+logger = logging.getLogger(ACTION_LOGGER_NAME)
+logger.propagate = False
+logger.addHandler(logging.NullHandler())
+
+
+class JsonLineFormatter(logging.Formatter):
+    """Format a record and its structured fields as one JSON line."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'event': record.getMessage()
+        }
+        payload.update(getattr(record, 'fields', {}))
+        return json.dumps(payload, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a random fraction of records."""
+    
+    def __init__(self, sample_rate: float = 1.0):
+        super().__init__()
+        self.sample_rate = sample_rate
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Queue handler that defers all formatting to the writer thread.
+    
+    The stock QueueHandler formats the message in the calling thread and
+    reports a full queue through handleError(), which writes to stderr.
+    """
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_state_lock = threading.Lock()
+_handler: Optional[NonBlockingQueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def process_log_path(path: str, pid: Optional[int] = None) -> str:
+    """Insert a process ID before the extension: logs/actions.log -> logs/actions.1234.log"""
+    root, ext = os.path.splitext(path)
+    return f'{root}.{pid or os.getpid()}{ext}'
+
+
+def configure_action_log(path: Optional[str] = None, level: str = 'INFO',
+                         sample_rate: float = 1.0, max_bytes: int = 10 * 1024 * 1024,
+                         backup_count: int = 5, queue_size: int = 10000,
+                         per_process: bool = False):
+    """
+    Start the background writer for the action log.
+    
+    Calling this again replaces the previous configuration. It must be
+    called in every process that logs (e.g. after forking workers), because
+    the writer thread does not survive a fork.
+    
+    A RotatingFileHandler must be the only writer of its file: two processes
+    rotating the same file rename it under each other and lose lines. Processes
+    sharing a path should pass per_process=True to log to a file of their own.
+    
+    Args:
+        path: Log file path. Defaults to backend/logs/actions.log
+        level: Minimum level name to record ('DEBUG', 'INFO', ...)
+        sample_rate: Fraction of records to keep (0.0 to 1.0)
+        max_bytes: Size at which the log file is rotated
+        backup_count: Number of rotated files to keep
+        queue_size: Maximum number of records waiting to be written
+        per_process: Add the process ID to the file name (see process_log_path())
+    """
+    global _handler, _listener
+    path = path or DEFAULT_LOG_PATH
+    if per_process:
+        path = process_log_path(path)
+    log_dir = os.path.dirname(path)
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+    
+    file_handler = RotatingFileHandler(path, maxBytes=max_bytes,
+                                       backupCount=backup_count, encoding='utf-8')
+    file_handler.setFormatter(JsonLineFormatter())
+    
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    handler = NonBlockingQueueHandler(log_queue)
+    handler.addFilter(SamplingFilter(sample_rate))
+    listener = QueueListener(log_queue, file_handler)
+    
+    with _state_lock:
+        _shutdown_locked()
+        logger.setLevel(level)
+        logger.addHandler(handler)
+        listener.start()
+        _handler, _listener = handler, listener
+
+
+def _shutdown_locked():
+    """Stop the current writer, flushing queued records (caller holds lock)."""
+    global _handler, _listener
+    if _handler is not None:
+        logger.removeHandler(_handler)
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+    _handler, _listener = None, None
+
+
+def shutdown_action_log():
+    """Flush queued records and stop the writer thread."""
+    with _state_lock:
+        _shutdown_locked()
+
+
+def dropped_records() -> int:
+    """Number of records dropped because the queue was full."""
+    return _handler.dropped if _handler is not None else 0
+
+
+def log_action(event: str, level: int = logging.INFO, **fields):
+    """
+    Queue a structured record without doing any I/O.
+    
+    Args:
+        event: Short event name, e.g. 'action'
+        level: Logging level of the record
+        **fields: JSON-serializable fields to include in the line
+    """
+    if logger.isEnabledFor(level):
+        logger.log(level, event, extra={'fields': fields})
+
+
+atexit.register(shutdown_action_log)
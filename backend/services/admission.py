@@ -0,0 +1,151 @@
+"""
+In-process admission control.
+
+Requests are admitted only if the process has a free concurrency slot and
+the caller has tokens left in its buckets: one bucket per client address and
+one per game. Rejections are cheap (no database or game work happens), so an
+overloaded process answers quickly with 429/503 instead of queueing and
+slowing every child down.
+
+Each bucket is two floats kept in an LRU-ordered table that evicts buckets
+idle for longer than it takes them to refill, so memory stays bounded by the
+number of recently active clients.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+class TokenBucketTable:
+    """Token buckets keyed by client or game, with idle eviction."""
+    
+    def __init__(self, rate: float, burst: float, max_entries: int = 100000):
+        """
+        Initialize the table.
+        
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity (requests allowed at once)
+            max_entries: Maximum number of buckets; least recently used are
+                evicted first
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_entries = max_entries
+        # A bucket idle this long is full again and equivalent to a new one
+        self.idle_timeout = burst / rate
+        self.lock = threading.Lock()
+        # key -> [tokens, last update], ordered least recently used first
+        self.buckets: 'OrderedDict[str, List[float]]' = OrderedDict()
+    
+    def take(self, key: str) -> float:
+        """
+        Take one token for ``key``.
+        
+        Returns:
+            0.0 if the request is allowed, otherwise the seconds until a token
+            becomes available
+        """
+        now = time.monotonic()
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = [self.burst, now]
+            else:
+                self.buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            
+            if bucket[0] >= 1.0:
+                bucket[0] -= 1.0
+                wait = 0.0
+            else:
+                wait = (1.0 - bucket[0]) / self.rate
+            self._evict(now)
+            return wait
+    
+    def _evict(self, now: float):
+        """Drop idle buckets and buckets over capacity (caller holds lock)."""
+        while self.buckets:
+            key, (_, updated) = next(iter(self.buckets.items()))
+            if len(self.buckets) <= self.max_entries and now - updated <= self.idle_timeout:
+                break
+            del self.buckets[key]
+    
+    def __len__(self) -> int:
+        return len(self.buckets)
+
+
+class AdmissionController:
+    """Concurrency cap plus per-client and per-game rate limits."""
+    
+    def __init__(self, max_concurrent: int = 64,
+                 client_rate: float = 200.0, client_burst: float = 400.0,
+                 game_rate: float = 5.0, game_burst: float = 10.0):
+        """
+        Initialize the controller.
+        
+        Args:
+            max_concurrent: Requests processed at once before answering 503
+            client_rate: Requests per second allowed per client address.
+                A school behind NAT shares one address, so size this for
+                all of its pupils rather than one child.
+            client_burst: Requests a client may send at once
+            game_rate: Requests per second allowed per game
+            game_burst: Requests a game may send at once
+        """
+        self.max_concurrent = max_concurrent
+        self.clients = TokenBucketTable(client_rate, client_burst)
+        self.games = TokenBucketTable(game_rate, game_burst)
+        self.active = 0
+        self._lock = threading.Lock()
+        self.rejected: Dict[str, int] = {'concurrency': 0, 'client': 0, 'game': 0}
+    
+    def acquire_slot(self) -> bool:
+        """Claim a concurrency slot; False if the process is at capacity."""
+        with self._lock:
+            if self.active >= self.max_concurrent:
+                self.rejected['concurrency'] += 1
+                return False
+            self.active += 1
+            return True
+    
+    def release_slot(self):
+        """Release a slot claimed with acquire_slot()."""
+        with self._lock:
+            self.active -= 1
+    
+    def check_rate(self, client: str, game_id: Optional[str] = None) -> Optional[Dict]:
+        """
+        Apply the client and game rate limits.
+        
+        Returns:
+            None if allowed, otherwise a dictionary with the limit hit
+            ('client' or 'game') and 'retry_after' in seconds
+        """
+        wait = self.clients.take(client)
+        if wait:
+            self._count_rejection('client')
+            return {'limit': 'client', 'retry_after': wait}
+        if game_id:
+            wait = self.games.take(game_id)
+            if wait:
+                self._count_rejection('game')
+                return {'limit': 'game', 'retry_after': wait}
+        return None
+    
+    def _count_rejection(self, limit: str):
+        with self._lock:
+            self.rejected[limit] += 1
+    
+    def stats(self) -> Dict:
+        """Get active requests, tracked buckets and rejection counts."""
+        with self._lock:
+            rejected = dict(self.rejected)
+        return {
+            'active': self.active,
+            'client_buckets': len(self.clients),
+            'game_buckets': len(self.games),
+            'rejected': rejected
+        }
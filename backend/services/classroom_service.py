@@ -0,0 +1,248 @@
+"""
+Classrooms: groups of games watched together on a teacher dashboard.
+
+A classroom keeps a small summary of each of its games (scores and progress)
+and classroom totals. The summaries are updated from the game events that
+GameService publishes on the event bus, so they never require reading the game
+store. Each change is published once, as a delta, on the classroom's topic
+(see classroom_topic()). Every dashboard watching the classroom subscribes to
+that topic, so the cost of an update does not grow with the number of
+watchers.
+
+Like games, classrooms live in memory in the process that serves them. Their
+number is capped, and a classroom without activity for idle_timeout seconds
+is dropped. A game leaves its classroom's event routing when it ends or is
+removed from the game store; its last summary stays on the dashboard.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from services.event_bus import EventBus, get_event_bus
+
+# Game fields shown on the dashboard
+SUMMARY_FIELDS = (
+    'blue_score', 'red_score', 'max_score', 'player_action_count',
+    'max_player_actions', 'is_game_over', 'game_over_reason'
+)
+
+GAME_TOPIC_PREFIX = 'game:'
+
+
+def classroom_topic(classroom_id: str) -> str:
+    """Event bus topic carrying a classroom's dashboard deltas."""
+    return f'classroom:{classroom_id}'
+
+
+class Classroom:
+    """A named group of games with their summaries and totals."""
+    
+    def __init__(self, name: str):
+        self.classroom_id = str(uuid.uuid4())
+        self.name = name
+        self.games: Dict[str, Dict] = {}
+        self.totals = {'games': 0, 'finished': 0, 'goals': 0, 'actions': 0}
+    
+    def to_dict(self) -> Dict:
+        """Convert the classroom to a dashboard snapshot."""
+        return {
+            'classroom_id': self.classroom_id,
+            'name': self.name,
+            'games': {game_id: dict(summary) for game_id, summary in self.games.items()},
+            'totals': dict(self.totals)
+        }
+
+
+def _summarize(game: Dict) -> Dict:
+    return {field: game.get(field) for field in SUMMARY_FIELDS}
+
+
+class ClassroomService:
+    """Service for classrooms and their aggregated dashboard updates."""
+    
+    def __init__(self, bus: Optional[EventBus] = None, max_games_per_classroom: int = 200,
+                 max_classrooms: int = 1000, idle_timeout: Optional[float] = 4 * 3600):
+        """
+        Initialize the service and start listening to game events.
+        
+        Args:
+            bus: Event bus to read game events from and publish deltas to.
+                Defaults to the shared instance.
+            max_games_per_classroom: Games a classroom may hold
+            max_classrooms: Classrooms kept at once
+            idle_timeout: Seconds without activity after which a classroom
+                is dropped, or None to keep classrooms until the cap
+        """
+        self.bus = bus or get_event_bus()
+        self.max_games_per_classroom = max_games_per_classroom
+        self.max_classrooms = max_classrooms
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        # Least recently active first
+        self._classrooms: 'OrderedDict[str, Classroom]' = OrderedDict()
+        self._last_active: Dict[str, float] = {}
+        # game_id -> classroom_id, so an event finds its classroom in O(1)
+        self._classroom_of_game: Dict[str, str] = {}
+        self.bus.add_listener(self._on_event)
+    
+    def close(self):
+        """Stop listening to game events."""
+        self.bus.remove_listener(self._on_event)
+    
+    def create_classroom(self, name: str) -> Optional[Classroom]:
+        """
+        Create an empty classroom.
+        
+        Returns:
+            The classroom, or None if max_classrooms are already active
+        """
+        with self._lock:
+            self._expire()
+            if len(self._classrooms) >= self.max_classrooms:
+                return None
+            classroom = Classroom(name)
+            self._classrooms[classroom.classroom_id] = classroom
+            self._touch(classroom.classroom_id)
+        return classroom
+    
+    def get_snapshot(self, classroom_id: str) -> Optional[Dict]:
+        """Get a classroom's current dashboard state, or None if it does not exist."""
+        with self._lock:
+            self._expire()
+            classroom = self._classrooms.get(classroom_id)
+            if classroom is None:
+                return None
+            self._touch(classroom_id)
+            return classroom.to_dict()
+    
+    def has_room(self, classroom_id: str) -> bool:
+        """Whether a classroom exists and can take another game."""
+        with self._lock:
+            self._expire()
+            classroom = self._classrooms.get(classroom_id)
+            return classroom is not None and len(classroom.games) < self.max_games_per_classroom
+    
+    def _touch(self, classroom_id: str):
+        """Mark a classroom as active (caller holds lock)."""
+        self._classrooms.move_to_end(classroom_id)
+        self._last_active[classroom_id] = time.monotonic()
+    
+    def _expire(self):
+        """Drop classrooms idle past the timeout (caller holds lock)."""
+        if self.idle_timeout is None:
+            return
+        now = time.monotonic()
+        while self._classrooms:
+            classroom_id = next(iter(self._classrooms))
+            if now - self._last_active[classroom_id] <= self.idle_timeout:
+                break
+            classroom = self._classrooms.pop(classroom_id)
+            del self._last_active[classroom_id]
+            for game_id in classroom.games:
+                if self._classroom_of_game.get(game_id) == classroom_id:
+                    del self._classroom_of_game[game_id]
+    
+    def add_game(self, classroom_id: str, game: Dict) -> bool:
+        """
+        Add a game to a classroom.
+        
+        Args:
+            classroom_id: Classroom to join
+            game: Current snapshot of the game
+        
+        Returns:
+            False if the classroom does not exist or is full
+        
+        Raises:
+            ValueError: If the game already belongs to another classroom
+        """
+        game_id = game['game_id']
+        with self._lock:
+            self._expire()
+            classroom = self._classrooms.get(classroom_id)
+            if classroom is None:
+                return False
+            current = self._classroom_of_game.get(game_id)
+            if current == classroom_id:
+                return True
+            if current is not None:
+                raise ValueError(f"Game {game_id} already belongs to another classroom")
+            if len(classroom.games) >= self.max_games_per_classroom:
+                return False
+            
+            # A finished game sends no more updates worth routing
+            if not game['is_game_over']:
+                self._classroom_of_game[game_id] = classroom_id
+            summary = classroom.games[game_id] = _summarize(game)
+            self._touch(classroom_id)
+            self._apply_totals(classroom, None, summary)
+            self._publish(classroom, game_id, dict(summary))
+        return True
+    
+    def _on_event(self, topic: str, event: Any):
+        """Fold a game event into its classroom and publish the delta."""
+        if not topic.startswith(GAME_TOPIC_PREFIX):
+            return
+        game_id = topic[len(GAME_TOPIC_PREFIX):]
+        with self._lock:
+            classroom_id = self._classroom_of_game.get(game_id)
+            if classroom_id is None:
+                return
+            if event['game'] is None:
+                # Removed from the game store; keep its last summary
+                del self._classroom_of_game[game_id]
+                return
+            classroom = self._classrooms[classroom_id]
+            previous = classroom.games[game_id]
+            summary = _summarize(event['game'])
+            if summary['is_game_over']:
+                del self._classroom_of_game[game_id]
+            changes = {field: value for field, value in summary.items() if previous[field] != value}
+            if not changes:
+                return
+            classroom.games[game_id] = summary
+            self._touch(classroom_id)
+            self._apply_totals(classroom, previous, summary)
+            self._publish(classroom, game_id, changes)
+    
+    def _apply_totals(self, classroom: Classroom, previous: Optional[Dict], summary: Dict):
+        """Update classroom totals for a changed game summary (caller holds lock)."""
+        totals = classroom.totals
+        if previous is None:
+            totals['games'] += 1
+            previous = {'blue_score': 0, 'red_score': 0, 'player_action_count': 0,
+                        'is_game_over': False}
+        totals['goals'] += (summary['blue_score'] + summary['red_score']
+                            - previous['blue_score'] - previous['red_score'])
+        totals['actions'] += summary['player_action_count'] - previous['player_action_count']
+        totals['finished'] += int(bool(summary['is_game_over'])) - int(bool(previous['is_game_over']))
+    
+    def _publish(self, classroom: Classroom, game_id: str, changes: Dict):
+        """Publish one delta to all watchers (caller holds lock, keeping deltas in order)."""
+        self.bus.publish(classroom_topic(classroom.classroom_id), {
+            'classroom_id': classroom.classroom_id,
+            'game_id': game_id,
+            'changes': changes,
+            'totals': dict(classroom.totals)
+        })
+
+
+# Singleton instance
+_classroom_service: Optional[ClassroomService] = None
+
+
+def get_classroom_service() -> ClassroomService:
+    """Get singleton classroom service instance"""
+    global _classroom_service
+    if _classroom_service is None:
+        _classroom_service = ClassroomService()
+    return _classroom_service
+
+
+def reset_classroom_service():
+    """Reset the singleton instance. Useful for testing."""
+    global _classroom_service
+    if _classroom_service is not None:
+        _classroom_service.close()
+    _classroom_service = None
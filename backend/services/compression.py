@@ -0,0 +1,85 @@
+"""
+Content-Encoding negotiation and compression (gzip, and brotli if installed).
+
+Dynamic responses are compressed per request at a fast level; payloads that
+are compressed once and kept in memory (see http_cache) use the highest
+level, since the cost is paid only when they change.
+"""
+import gzip
+from typing import Dict, Iterable, Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are not worth compressing
+DEFAULT_MIN_SIZE = 512
+
+# Level (gzip) or quality (brotli) per request and for payloads compressed once
+DYNAMIC_LEVELS = {'gzip': 6, 'br': 4}
+STATIC_LEVELS = {'gzip': 9, 'br': 11}
+
+
+def available_encodings() -> tuple:
+    """Encodings this process can produce, most preferred first."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def _parse_accept_encoding(accept_encoding: str) -> Dict[str, float]:
+    """Map each coding in an Accept-Encoding header to its quality."""
+    qualities = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        qualities[coding] = q
+    return qualities
+
+
+def negotiate(accept_encoding: str, offered: Iterable[str]) -> Optional[str]:
+    """
+    Pick the encoding to use for a request.
+    
+    Args:
+        accept_encoding: Accept-Encoding request header
+        offered: Encodings available for the response, most preferred first
+    
+    Returns:
+        The accepted encoding with the highest quality (ties go to the most
+        preferred), or None to send the body uncompressed
+    """
+    qualities = _parse_accept_encoding(accept_encoding)
+    best, best_q = None, 0.0
+    for encoding in offered:
+        q = qualities.get(encoding, qualities.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str, static: bool = False) -> bytes:
+    """
+    Compress a body.
+    
+    Args:
+        body: Uncompressed bytes
+        encoding: 'gzip' or 'br'
+        static: Use the highest level, for payloads compressed once
+    
+    Returns:
+        Compressed bytes
+    """
+    level = (STATIC_LEVELS if static else DYNAMIC_LEVELS)[encoding]
+    if encoding == 'br':
+        return brotli.compress(body, quality=level)
+    # mtime=0 keeps the compressed bytes identical across restarts
+    return gzip.compress(body, compresslevel=level, mtime=0)
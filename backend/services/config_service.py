@@ -1,27 +1,85 @@
 """Configuration management service"""
+import itertools
 import json
 import os
-from typing import Dict, Optional
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+# Config versions are unique across instances, so a cached response can never
+# be mistaken for one built from another instance's config
+_versions = itertools.count(1)
 
 
 class ConfigService:
     """Service for loading and managing game configuration"""
     
-    def __init__(self, config_path: Optional[str] = None):
-        """Initialize config service with path to config file"""
+    def __init__(self, config_path: Optional[str] = None, check_interval: float = 1.0):
+        """
+        Initialize config service with path to config file.
+        
+        Args:
+            config_path: Path to game_config.json (defaults to the config directory)
+            check_interval: Seconds between checks whether the file was edited
+        """
         if config_path is None:
             # Default to config directory relative to this file
             current_dir = os.path.dirname(os.path.abspath(__file__))
             config_path = os.path.join(current_dir, '..', 'config', 'game_config.json')
         self.config_path = config_path
+        self.check_interval = check_interval
         self._config = None
+        self._file_stamp: Optional[Tuple[int, int]] = None
+        self._checked_at = time.monotonic()
+        self._check_lock = threading.Lock()
+        self.reload_count = 0
+        self.version = 0
         self._load_config()
     
+    def reload(self):
+        """Re-read the configuration file, e.g. after it was edited"""
+        self._load_config()
+        self.reload_count += 1
+    
+    def reload_if_changed(self) -> bool:
+        """
+        Reload the configuration if the file changed since it was last read.
+        
+        Checks at most once per check_interval. A file that cannot be parsed
+        (e.g. while an editor is still writing it) keeps the current config.
+        
+        Returns:
+            True if the configuration was reloaded
+        """
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return False
+        if not self._check_lock.acquire(blocking=False):
+            return False
+        try:
+            self._checked_at = time.monotonic()
+            try:
+                if self._stamp() == self._file_stamp:
+                    return False
+                self.reload()
+            except (OSError, ValueError):
+                return False
+            return True
+        finally:
+            self._check_lock.release()
+    
+    def _stamp(self) -> Tuple[int, int]:
+        """Modification time and size of the config file."""
+        stat = os.stat(self.config_path)
+        return stat.st_mtime_ns, stat.st_size
+    
     def _load_config(self):
         """Load configuration from JSON file"""
         try:
+            # Stamp before reading, so an edit made during the read is seen next time
+            self._file_stamp = self._stamp()
             with open(self.config_path, 'r', encoding='utf-8') as f:
                 self._config = json.load(f)
+            self.version = next(_versions)
         except FileNotFoundError:
             raise FileNotFoundError(f"Config file not found: {self.config_path}")
         except json.JSONDecodeError as e:
@@ -86,6 +144,7 @@ class ConfigService:
             self._config['variables'] = {}
         
         self._config['variables'][variable_key] = value
+        self.version = next(_versions)
         
         # Save to file
         self._save_config()
@@ -95,6 +154,8 @@ class ConfigService:
         try:
             with open(self.config_path, 'w', encoding='utf-8') as f:
                 json.dump(self._config, f, indent=2)
+            # Our own write is not an edit to reload
+            self._file_stamp = self._stamp()
         except Exception as e:
             raise IOError(f"Failed to save config: {e}")
     
@@ -117,6 +178,16 @@ class ConfigService:
             'default': 'regular'
         })
     
+    def get_game_store_settings(self) -> Dict:
+        """Get in-process game store configuration (sharding and eviction)"""
+        return self._config.get('game_store', {
+            'shards': 16,
+            'max_games_per_shard': 2000,
+            'idle_timeout_seconds': 7200,
+            'replay_cache_size': 32,
+            'replay_ttl_seconds': 300
+        })
+    
     def get_config(self) -> Dict:
         """Get full configuration"""
         return self._config.copy()
@@ -127,8 +198,10 @@ _config_service = None
 
 
 def get_config_service() -> ConfigService:
-    """Get singleton config service instance"""
+    """Get singleton config service instance, reloading it if the file was edited"""
     global _config_service
     if _config_service is None:
         _config_service = ConfigService()
+    else:
+        _config_service.reload_if_changed()
     return _config_service
@@ -0,0 +1,162 @@
+"""
+In-process publish/subscribe for live game updates.
+
+Publishers hand an event to every subscription of a topic (e.g.
+``game:<id>``); each subscription buffers events in a bounded queue that its
+consumer, typically a streaming response, drains. A consumer that falls
+behind loses its oldest events rather than slowing the publisher down, and
+the number of dropped events is counted so the consumer can resynchronize.
+
+Usage:
+    bus = get_event_bus()
+    with bus.subscribe('game:abc') as subscription:
+        event = subscription.get(timeout=15)
+    
+    bus.publish('game:abc', {'type': 'state', ...})
+"""
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set
+
+
+class Subscription:
+    """Events delivered to one subscriber, oldest first."""
+    
+    def __init__(self, bus: 'EventBus', topics: tuple, max_pending: int):
+        """
+        Initialize the subscription.
+        
+        Args:
+            bus: Bus the subscription belongs to
+            topics: Topics subscribed to
+            max_pending: Events buffered before the oldest are dropped
+        """
+        self.bus = bus
+        self.topics = topics
+        self.dropped = 0
+        self.closed = False
+        self._events: Deque[Any] = deque(maxlen=max_pending)
+        self._ready = threading.Condition()
+    
+    def deliver(self, event: Any):
+        """Queue an event (called by the bus)."""
+        with self._ready:
+            if len(self._events) == self._events.maxlen:
+                self.dropped += 1
+            self._events.append(event)
+            self._ready.notify()
+    
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Wait for the next event.
+        
+        Returns:
+            The event, or None if none arrived within ``timeout`` or the
+            subscription was closed
+        """
+        with self._ready:
+            if not self._events and not self.closed:
+                self._ready.wait(timeout)
+            return self._events.popleft() if self._events else None
+    
+    def close(self):
+        """Stop receiving events and wake a waiting consumer. Safe to call twice."""
+        if not self.closed:
+            self.bus.unsubscribe(self)
+        with self._ready:
+            self.closed = True
+            self._ready.notify_all()
+    
+    def __enter__(self) -> 'Subscription':
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class EventBus:
+    """Topic-based fan-out to subscriptions and listener callbacks."""
+    
+    DEFAULT_MAX_PENDING = 100
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        self._open: Set[Subscription] = set()
+        self._listeners: List[Callable[[str, Any], None]] = []
+        self.published = 0
+    
+    def subscribe(self, *topics: str, max_pending: int = DEFAULT_MAX_PENDING) -> Subscription:
+        """Subscribe to one or more topics."""
+        subscription = Subscription(self, topics, max_pending)
+        with self._lock:
+            for topic in topics:
+                self._subscriptions.setdefault(topic, set()).add(subscription)
+            self._open.add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a subscription from all of its topics."""
+        with self._lock:
+            self._open.discard(subscription)
+            for topic in subscription.topics:
+                subscribers = self._subscriptions.get(topic)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscriptions[topic]
+    
+    def add_listener(self, listener: Callable[[str, Any], None]):
+        """
+        Register a function called as listener(topic, event) for every event.
+        
+        Listeners run synchronously in the publishing thread and must be quick.
+        """
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[str, Any], None]):
+        """Unregister a function added with add_listener()."""
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+    
+    def publish(self, topic: str, event: Any) -> int:
+        """
+        Publish an event to a topic.
+        
+        Returns:
+            Number of subscriptions the event was delivered to
+        """
+        with self._lock:
+            subscribers = list(self._subscriptions.get(topic, ()))
+            listeners = list(self._listeners)
+            self.published += 1
+        for listener in listeners:
+            listener(topic, event)
+        for subscription in subscribers:
+            subscription.deliver(event)
+        return len(subscribers)
+    
+    def subscriber_count(self) -> int:
+        """Number of open subscriptions across all topics."""
+        return len(self._open)
+
+
+# Singleton instance
+_event_bus: Optional[EventBus] = None
+
+
+def get_event_bus() -> EventBus:
+    """Get singleton event bus instance."""
+    global _event_bus
+    if _event_bus is None:
+        _event_bus = EventBus()
+    return _event_bus
+
+
+def reset_event_bus():
+    """Reset the singleton instance. Useful for testing."""
+    global _event_bus
+    _event_bus = None
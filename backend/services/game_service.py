@@ -1,9 +1,18 @@
 """Game state management service"""
 import random
 import uuid
-from typing import Dict, Optional
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Optional
 from datetime import datetime
 from services.config_service import get_config_service
+from services.event_bus import get_event_bus
+from services.game_store import GameStore
+from services.replay_cache import ReplayCache
+
+
+def game_topic(game_id: str) -> str:
+    """Event bus topic carrying a game's updates."""
+    return f'game:{game_id}'
 
 
 class GameState:
@@ -22,6 +31,7 @@ class GameState:
         self.is_game_over = False
         self.game_over_reason = None
         self.created_at = datetime.now()
+        self.replay_cache = ReplayCache()  # Results of recent requests by idempotency key
         
         # Dynamic probabilities (can be adjusted based on question results)
         self.current_probabilities = {
@@ -190,15 +200,34 @@ class GameState:
 
 
 class GameService:
-    """Service for managing game state"""
+    """
+    Service for managing game state.
     
-    def __init__(self):
-        self._games: Dict[str, GameState] = {}
+    Games live in a sharded store: each shard has its own lock, so concurrent
+    requests for the same game serialize while games in other shards proceed
+    in parallel. Every mutation publishes an immutable snapshot of the game,
+    which readers can fetch without taking any lock, and an event carrying
+    the snapshot to the game's event bus topic (see game_topic()).
+    """
+    
+    def __init__(self, shard_count: Optional[int] = None):
         self.config_service = get_config_service()
         
         # Load max_player_actions from config
         game_rules = self.config_service.get_game_rules()
         self.max_player_actions = game_rules.get('max_player_actions', 100)
+        
+        store_settings = self.config_service.get_game_store_settings()
+        if shard_count is None:
+            shard_count = store_settings.get('shards', GameStore.DEFAULT_SHARDS)
+        self._store = GameStore(
+            shard_count=shard_count,
+            max_games_per_shard=store_settings.get('max_games_per_shard'),
+            idle_timeout=store_settings.get('idle_timeout_seconds'),
+            on_remove=self._on_removed
+        )
+        self.replay_cache_size = store_settings.get('replay_cache_size', 32)
+        self.replay_ttl = store_settings.get('replay_ttl_seconds', 300)
     
     def create_game(self, duration: str = 'regular') -> GameState:
         """
@@ -212,24 +241,212 @@ class GameService:
         """
         game_state = GameState(duration=duration)
         game_state.max_player_actions = self.max_player_actions
-        self._games[game_state.game_id] = game_state
+        game_state.replay_cache = ReplayCache(self.replay_cache_size, self.replay_ttl)
+        self._store.add(game_state.game_id, game_state, game_state.to_dict())
         return game_state
     
+    def delete_game(self, game_id: str) -> bool:
+        """
+        Remove a game.
+        
+        Returns:
+            False if the game does not exist
+        """
+        return self._store.remove(game_id)
+    
     def get_game(self, game_id: str) -> Optional[GameState]:
-        """Get game state by ID"""
-        return self._games.get(game_id)
+        """
+        Get game state by ID.
+        
+        The returned object is live; use locked_game() to modify it safely.
+        """
+        return self._store.get(game_id)
+    
+    def get_game_snapshot(self, game_id: str) -> Optional[Dict]:
+        """
+        Get the last published state of a game without locking.
+        
+        Snapshots are replaced wholesale on every mutation and never modified
+        in place, so a reader always sees a consistent state.
+        """
+        return self._store.get_snapshot(game_id)
+    
+    def get_game_snapshots(self, game_ids: Iterable[str]) -> Dict[str, Dict]:
+        """Get the last published states of many games; unknown IDs are left out."""
+        return self._store.get_snapshots(game_ids)
+    
+    @contextmanager
+    def locked_game(self, game_id: str) -> Iterator[Optional[GameState]]:
+        """
+        Hold a game's lock for a read-modify-write sequence.
+        
+        Usage:
+            with game_service.locked_game(game_id) as game:
+                if game:
+                    game.increment_player_action()
+        
+        Yields None if the game does not exist. A fresh snapshot is published
+        when the block exits, with a 'state' event.
+        """
+        with self._store.locked(game_id) as game:
+            try:
+                yield game
+            finally:
+                if game is not None:
+                    self._publish(game_id, game, {'type': 'state'})
+    
+    def _publish(self, game_id: str, game: GameState, event: Dict) -> Dict:
+        """
+        Publish a game's snapshot to readers and an event to its topic.
+        
+        Called with the game's lock held, so events of one game are published
+        in the order the mutations happened.
+        
+        Returns:
+            The new snapshot
+        """
+        snapshot = game.to_dict()
+        self._store.publish(game_id, snapshot)
+        get_event_bus().publish(game_topic(game_id), dict(event, game_id=game_id, game=snapshot))
+        return snapshot
+    
+    def _on_removed(self, game_id: str):
+        """Publish a 'removed' event when a game is deleted or evicted (shard lock held)."""
+        get_event_bus().publish(game_topic(game_id), {'type': 'removed', 'game_id': game_id, 'game': None})
+    
+    def perform_action(self, game_id: str, action: str, question_correct: bool,
+                       idempotency_key: Optional[str] = None) -> Optional[Dict]:
+        """
+        Execute a player action.
+        
+        Args:
+            game_id: Game to act in
+            action: 'pass', 'dribble', 'shoot', or 'tackle'
+            question_correct: Whether the question before the action was answered correctly
+            idempotency_key: Client key of the request; a retry with the same
+                key gets the first result back without acting again
+        
+        Returns:
+            None if the game does not exist; otherwise a result with
+            'success' False and an 'error' if the game is over, or 'success'
+            True with 'action_success', 'probability', 'roll' and 'game'
+            (plus 'replayed' True when the result comes from a retried key)
+        
+        Raises:
+            KeyReused: If the key was first used for a different action
+        """
+        with self._store.locked(game_id) as game_state:
+            if not game_state:
+                return None
+            
+            replay_key = ('action', idempotency_key)
+            fingerprint = (action, bool(question_correct))
+            if idempotency_key is not None:
+                replay = game_state.replay_cache.get(replay_key, fingerprint)
+                if replay is not None:
+                    return dict(replay, replayed=True)
+            
+            if game_state.is_game_over:
+                return {
+                    'success': False,
+                    'error': 'Game is over',
+                    'reason': game_state.game_over_reason
+                }
+            
+            event = {'type': 'state'}
+            try:
+                # Adjust probability based on question result (temporary for this action only)
+                game_state.adjust_probability(action, question_correct)
+                
+                # Get current probability for this action (includes temporary adjustment)
+                probability = game_state.get_current_probability('player', action)
+                
+                # Increment player action count
+                game_state.increment_player_action()
+                
+                # Check if action succeeds (using the adjusted probability)
+                success = False
+                random_value = None
+                if question_correct:
+                    random_value = random.random()
+                    success = random_value < probability
+                
+                # Reset probability adjustment after using it (so it doesn't accumulate)
+                # Clear the temporary adjustment so next action starts from base
+                game_state.current_probabilities['player'][action] = None
+                
+                event = {
+                    'type': 'action',
+                    'action': action,
+                    'action_success': success,
+                    'probability': probability
+                }
+            finally:
+                game = self._publish(game_id, game_state, event)
+            
+            result = {
+                'success': True,
+                'action_success': success,
+                'probability': probability,
+                'roll': random_value,
+                'game': game
+            }
+            if idempotency_key is not None:
+                game_state.replay_cache.put(replay_key, fingerprint, result)
+        return dict(result)
+    
+    def update_score(self, game_id: str, team: str, points: int = 1,
+                     idempotency_key: Optional[str] = None) -> Optional[Dict]:
+        """
+        Add points to a team.
+        
+        Args:
+            idempotency_key: Client key of the request; a retry with the same
+                key gets the first snapshot back without scoring again
+        
+        Returns:
+            The game's snapshot after the goal, or None if the game does not exist
+        
+        Raises:
+            KeyReused: If the key was first used for a different goal
+        """
+        with self._store.locked(game_id) as game_state:
+            if not game_state:
+                return None
+            
+            replay_key = ('score', idempotency_key)
+            fingerprint = (team, points)
+            if idempotency_key is not None:
+                replay = game_state.replay_cache.get(replay_key, fingerprint)
+                if replay is not None:
+                    return replay
+            
+            event = {'type': 'state'}
+            try:
+                game_state.update_score(team, points)
+                event = {'type': 'score', 'team': team, 'points': points}
+            finally:
+                game = self._publish(game_id, game_state, event)
+            
+            if idempotency_key is not None:
+                game_state.replay_cache.put(replay_key, fingerprint, game)
+        return game
     
     def update_game(self, game_id: str, **kwargs) -> Optional[GameState]:
         """Update game state"""
-        game = self.get_game(game_id)
-        if not game:
-            return None
-        
-        for key, value in kwargs.items():
-            if hasattr(game, key):
-                setattr(game, key, value)
+        with self.locked_game(game_id) as game:
+            if not game:
+                return None
+            
+            for key, value in kwargs.items():
+                if hasattr(game, key):
+                    setattr(game, key, value)
         
         return game
+    
+    def get_store_stats(self) -> Dict:
+        """Get live/evicted game counts and per-shard statistics"""
+        return self._store.stats()
 
 
 # Singleton instance
@@ -0,0 +1,205 @@
+"""
+Sharded in-process storage for live games.
+
+Games are partitioned across a fixed number of shards by game ID hash. Each
+shard owns its games outright: it has its own lock, its own eviction queue
+(least recently touched first) and its own statistics, so threads working on
+games in different shards never contend with each other.
+"""
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+
+class GameShard:
+    """A single partition of the game store."""
+    
+    def __init__(self, max_games: Optional[int] = None,
+                 idle_timeout: Optional[float] = None,
+                 on_remove: Optional[Callable[[str], None]] = None):
+        """
+        Initialize an empty shard.
+        
+        Args:
+            max_games: Maximum number of games kept before the least recently
+                touched game is evicted. None means unbounded.
+            idle_timeout: Seconds after which an untouched game is evicted.
+                None disables idle eviction.
+            on_remove: Called with the game ID of every evicted or removed
+                game, with the shard lock held
+        """
+        self.lock = threading.Lock()
+        self.max_games = max_games
+        self.idle_timeout = idle_timeout
+        self.on_remove = on_remove
+        # Eviction queue: game_id -> game, ordered oldest touch first
+        self.games: 'OrderedDict[str, object]' = OrderedDict()
+        self.last_touched: Dict[str, float] = {}
+        self.snapshots: Dict[str, Dict] = {}
+        self.stats = {
+            'created': 0,
+            'evicted': 0,
+            'lookups': 0,
+            'misses': 0
+        }
+    
+    def touch(self, game_id: str):
+        """Move a game to the back of the eviction queue (caller holds lock)."""
+        self.games.move_to_end(game_id)
+        self.last_touched[game_id] = time.monotonic()
+    
+    def evict(self):
+        """Evict games over capacity or past the idle timeout (caller holds lock)."""
+        now = time.monotonic()
+        while self.games:
+            oldest_id = next(iter(self.games))
+            over_capacity = self.max_games is not None and len(self.games) > self.max_games
+            idle = (self.idle_timeout is not None and
+                    now - self.last_touched[oldest_id] > self.idle_timeout)
+            if not (over_capacity or idle):
+                break
+            self.remove(oldest_id)
+            self.stats['evicted'] += 1
+    
+    def remove(self, game_id: str):
+        """Drop a game and its snapshot (caller holds lock)."""
+        del self.games[game_id]
+        del self.last_touched[game_id]
+        self.snapshots.pop(game_id, None)
+        if self.on_remove is not None:
+            self.on_remove(game_id)
+
+
+class GameStore:
+    """Game storage partitioned across independently locked shards."""
+    
+    DEFAULT_SHARDS = 16
+    
+    def __init__(self, shard_count: int = DEFAULT_SHARDS,
+                 max_games_per_shard: Optional[int] = None,
+                 idle_timeout: Optional[float] = None,
+                 on_remove: Optional[Callable[[str], None]] = None):
+        """
+        Initialize the store.
+        
+        Args:
+            shard_count: Number of shards (1 behaves like a single locked dict)
+            max_games_per_shard: Capacity of each shard, or None for unbounded
+            idle_timeout: Seconds before an untouched game is evicted, or None
+            on_remove: Called with the ID of every evicted or removed game,
+                with the owning shard's lock held
+        """
+        self._shards: List[GameShard] = [
+            GameShard(max_games_per_shard, idle_timeout, on_remove)
+            for _ in range(max(1, shard_count))
+        ]
+    
+    @property
+    def shard_count(self) -> int:
+        """Number of shards in the store."""
+        return len(self._shards)
+    
+    def shard_for(self, game_id: str) -> GameShard:
+        """Get the shard that owns a game ID."""
+        return self._shards[hash(game_id) % len(self._shards)]
+    
+    def add(self, game_id: str, game, snapshot: Dict):
+        """Store a new game together with its first snapshot."""
+        shard = self.shard_for(game_id)
+        with shard.lock:
+            shard.games[game_id] = game
+            shard.snapshots[game_id] = snapshot
+            shard.touch(game_id)
+            shard.stats['created'] += 1
+            shard.evict()
+    
+    def get(self, game_id: str):
+        """Get a live game object without locking, or None."""
+        return self.shard_for(game_id).games.get(game_id)
+    
+    def get_snapshot(self, game_id: str) -> Optional[Dict]:
+        """Get the last published snapshot of a game without locking, or None."""
+        return self.shard_for(game_id).snapshots.get(game_id)
+    
+    def get_snapshots(self, game_ids: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Get the last published snapshots of many games without locking.
+        
+        One dictionary lookup per ID; unknown or evicted IDs are left out.
+        
+        Returns:
+            Dictionary of game_id -> snapshot
+        """
+        snapshots = {}
+        for game_id in game_ids:
+            snapshot = self.shard_for(game_id).snapshots.get(game_id)
+            if snapshot is not None:
+                snapshots[game_id] = snapshot
+        return snapshots
+    
+    def remove(self, game_id: str) -> bool:
+        """
+        Remove a game.
+        
+        Returns:
+            False if the game was not in the store
+        """
+        shard = self.shard_for(game_id)
+        with shard.lock:
+            if game_id not in shard.games:
+                return False
+            shard.remove(game_id)
+            return True
+    
+    @contextmanager
+    def locked(self, game_id: str) -> Iterator[Optional[object]]:
+        """
+        Hold the owning shard's lock while working on a game.
+        
+        Yields the game (or None if unknown) and marks it as recently used.
+        """
+        shard = self.shard_for(game_id)
+        with shard.lock:
+            shard.stats['lookups'] += 1
+            game = shard.games.get(game_id)
+            if game is None:
+                shard.stats['misses'] += 1
+            else:
+                shard.touch(game_id)
+            yield game
+    
+    def publish(self, game_id: str, snapshot: Dict):
+        """Replace a game's snapshot (caller holds the shard lock)."""
+        shard = self.shard_for(game_id)
+        if game_id in shard.games:
+            shard.snapshots[game_id] = snapshot
+    
+    def __len__(self) -> int:
+        return sum(len(shard.games) for shard in self._shards)
+    
+    def stats(self) -> Dict:
+        """
+        Get store statistics.
+        
+        Returns:
+            Dictionary with totals and a per-shard breakdown:
+            {
+                'shards': int,
+                'live': int,
+                'created': int,
+                'evicted': int,
+                'lookups': int,
+                'misses': int,
+                'per_shard': List[Dict]
+            }
+        """
+        per_shard = []
+        for shard in self._shards:
+            with shard.lock:
+                per_shard.append(dict(shard.stats, live=len(shard.games)))
+        
+        totals = {key: sum(s[key] for s in per_shard)
+                  for key in ('live', 'created', 'evicted', 'lookups', 'misses')}
+        return dict(totals, shards=len(self._shards), per_shard=per_shard)
@@ -0,0 +1,161 @@
+"""
+Pre-serialized responses with validators for read-mostly endpoints.
+
+A CachedPayload holds a JSON document serialized once, its compressed forms
+(gzip, and brotli if installed) and a strong ETag derived from the bytes.
+conditional_response() turns it into a Flask response, answering 304 when
+the client already has the current version and picking the compressed body
+the client accepts, so repeated requests cost neither serialization nor
+compression.
+
+Documents derived from data that can change at runtime (the game config, the
+question bank) go through a VersionedPayload, which rebuilds the payload only
+when the version of its source changes.
+
+Like other responses, cached documents are sent as MessagePack to clients
+that ask for it (see services.serialization); each format is serialized once
+and cached next to the other.
+"""
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from services import serialization
+from services.compression import DEFAULT_MIN_SIZE, available_encodings, compress, negotiate
+from services.serialization import JSON_MIMETYPE, MSGPACK_MIMETYPE, dumps_json, dumps_msgpack
+
+JSON_CONTENT_TYPE = JSON_MIMETYPE
+
+
+def negotiated_content_type() -> str:
+    """Content type of cached documents for the current request."""
+    return MSGPACK_MIMETYPE if serialization.wants_msgpack() else JSON_CONTENT_TYPE
+
+
+class CachedPayload:
+    """A serialized response body with its compressed variants and ETag."""
+    
+    __slots__ = ('body', 'encoded', 'etag', 'content_type')
+    
+    def __init__(self, body: bytes, content_type: str = JSON_CONTENT_TYPE):
+        """
+        Initialize the payload.
+        
+        Args:
+            body: Uncompressed response body
+            content_type: Content-Type of the body
+        """
+        self.body = body
+        self.content_type = content_type
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        # Content-Encoding -> compressed body, in order of preference
+        self.encoded: Dict[str, bytes] = {}
+        if len(body) >= DEFAULT_MIN_SIZE:
+            for encoding in available_encodings():
+                compressed = compress(body, encoding, static=True)
+                if len(compressed) < len(body):
+                    self.encoded[encoding] = compressed
+    
+    @classmethod
+    def from_json(cls, data: Any) -> 'CachedPayload':
+        """Serialize a JSON document into a payload."""
+        return cls(dumps_json(data, sort_keys=True))
+    
+    @classmethod
+    def from_document(cls, data: Any, content_type: str = JSON_CONTENT_TYPE) -> 'CachedPayload':
+        """Serialize a document as JSON or MessagePack."""
+        if content_type == MSGPACK_MIMETYPE:
+            return cls(dumps_msgpack(data), MSGPACK_MIMETYPE)
+        return cls.from_json(data)
+
+
+class VersionedPayload:
+    """A document's payloads, rebuilt only when the version of its source changes."""
+    
+    def __init__(self, build: Callable[[], Any]):
+        """
+        Initialize the payload.
+        
+        Args:
+            build: Returns the document for the current source data
+        """
+        self.build = build
+        self.builds = 0
+        self._lock = threading.Lock()
+        # (version, document, payloads by content type) swapped as one
+        # reference so readers never mix versions
+        self._current: Optional[Tuple[Hashable, Any, Dict[str, CachedPayload]]] = None
+    
+    def get(self, version: Hashable, content_type: Optional[str] = None) -> CachedPayload:
+        """
+        Get the payload for ``version``, building it on first use.
+        
+        Args:
+            version: Version of the source data
+            content_type: Format to serialize to; defaults to the one the
+                current request negotiates (see negotiated_content_type())
+        """
+        content_type = content_type or negotiated_content_type()
+        current = self._current
+        if current is not None and current[0] == version:
+            payload = current[2].get(content_type)
+            if payload is not None:
+                return payload
+        with self._lock:
+            current = self._current
+            if current is None or current[0] != version:
+                current = self._current = (version, self.build(), {})
+                self.builds += 1
+            payloads = current[2]
+            if content_type not in payloads:
+                payloads[content_type] = CachedPayload.from_document(current[1], content_type)
+            return payloads[content_type]
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header against an entity tag (weak comparison)."""
+    if if_none_match.strip() == '*':
+        return True
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        # Variants carry a suffix (e.g. "<tag>-gzip") but share the tag
+        if candidate.strip('"').split('-', 1)[0] == etag:
+            return True
+    return False
+
+
+def conditional_response(payload: CachedPayload, cache_control: str = 'no-cache'):
+    """
+    Build a response for a cached payload in the current request.
+    
+    Args:
+        payload: Payload to serve
+        cache_control: Cache-Control header value
+    
+    Returns:
+        Flask response: 304 if If-None-Match matches, otherwise 200 with the
+        best compressed body the client accepts
+    """
+    from flask import Response, request
+    
+    encoding = negotiate(request.headers.get('Accept-Encoding', ''), payload.encoded)
+    # Each representation needs its own strong ETag
+    etag = f'{payload.etag}-{encoding}' if encoding else payload.etag
+    
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match and _etag_matches(if_none_match, payload.etag):
+        response = Response(status=304)
+    else:
+        response = Response(payload.encoded[encoding] if encoding else payload.body,
+                            content_type=payload.content_type)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    if payload.encoded:
+        response.vary.add('Accept-Encoding')
+    if serialization.msgpack is not None:
+        response.vary.add('Accept')
+    return response
@@ -0,0 +1,206 @@
+"""
+Low-overhead in-process metrics rendered in the Prometheus text format.
+
+Recording a sample is a dictionary lookup plus a few additions under a
+per-metric lock, so instrumenting the request path costs well under a few
+microseconds. Values that already live elsewhere (cache statistics, game
+counts) are exported through callback metrics that are only evaluated when
+the metrics are scraped.
+"""
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Latency buckets in seconds, from 0.5ms to 10s
+DEFAULT_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(labelnames: Tuple[str, ...], values: Tuple, extra: str = '') -> str:
+    """Format a label set as {name="value",...}."""
+    parts = []
+    for name, value in zip(labelnames, values):
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{name}="{escaped}"')
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value."""
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric(ABC):
+    """Base class for a named metric family."""
+    
+    metric_type = 'untyped'
+    
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+    
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """Get sample lines for this metric."""
+    
+    def render(self) -> str:
+        """Render the metric family with HELP and TYPE lines."""
+        lines = [f'# HELP {self.name} {self.documentation}',
+                 f'# TYPE {self.name} {self.metric_type}']
+        lines.extend(self.samples())
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing counter."""
+    
+    metric_type = 'counter'
+    
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple, float] = {}
+    
+    def inc(self, *label_values, amount: float = 1):
+        """Increment the counter for a label set."""
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+    
+    def value(self, *label_values) -> float:
+        """Get the current value for a label set."""
+        return self._values.get(label_values, 0)
+    
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f'{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}'
+                for labels, value in items]
+
+
+class Histogram(Metric):
+    """Histogram with fixed cumulative buckets."""
+    
+    metric_type = 'histogram'
+    
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Tuple, list] = {}
+    
+    def observe(self, value: float, *label_values):
+        """Record one observation for a label set."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+    
+    def count(self, *label_values) -> int:
+        """Get the number of observations for a label set."""
+        series = self._series.get(label_values)
+        return series[2] if series else 0
+    
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((labels, ([*s[0]], s[1], s[2])) for labels, s in self._series.items())
+        
+        lines = []
+        bounds = self.buckets + (float('inf'),)
+        for labels, (bucket_counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, bucket_counts):
+                cumulative += bucket_count
+                le = _format_labels(self.labelnames, labels, f'le="{_format_value(bound)}"')
+                lines.append(f'{self.name}_bucket{le} {cumulative}')
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f'{self.name}_sum{label_str} {_format_value(total)}')
+            lines.append(f'{self.name}_count{label_str} {count}')
+        return lines
+
+
+class CallbackMetric(Metric):
+    """
+    Metric whose values are read from a function at scrape time.
+    
+    The function returns either a single number or a dictionary mapping
+    label value tuples to numbers.
+    """
+    
+    def __init__(self, name: str, documentation: str, metric_type: str,
+                 callback: Callable, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.metric_type = metric_type
+        self.callback = callback
+    
+    def samples(self) -> List[str]:
+        try:
+            result = self.callback()
+        except Exception:
+            # A failing source must not break the whole scrape
+            return []
+        if not isinstance(result, dict):
+            result = {(): result}
+        return [f'{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}'
+                for labels, value in sorted(result.items())]
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+    
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+    
+    def register(self, metric: Metric) -> Metric:
+        """Register a metric, replacing any existing metric with the same name."""
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+    
+    def get(self, name: str) -> Optional[Metric]:
+        """Get a registered metric by name."""
+        return self._metrics.get(name)
+    
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+
+# Shared registry used by the application
+registry = MetricsRegistry()
+
+request_latency = registry.register(Histogram(
+    'smartkick_http_request_duration_seconds',
+    'HTTP request latency by route',
+    ('endpoint', 'method')
+))
+requests_total = registry.register(Counter(
+    'smartkick_http_requests_total',
+    'HTTP requests by route and status code',
+    ('endpoint', 'method', 'status')
+))
+db_queries_per_request = registry.register(Histogram(
+    'smartkick_db_queries_per_request',
+    'Database queries issued while handling one request',
+    ('endpoint',),
+    buckets=(0, 1, 2, 3, 5, 10, 25, 50, 100)
+))
+db_queries_total = registry.register(Counter(
+    'smartkick_db_queries_total',
+    'Database queries executed'
+))
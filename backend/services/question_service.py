@@ -2,18 +2,205 @@
 Question management service for loading and retrieving questions from database.
 Supports multilingual questions and answer randomization.
 """
+import itertools
 import json
 import random
-from typing import Dict, List, Optional
-from database.db import get_db
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from database.db import Database, get_db
+from database.deadline import deadline
+from services.serialization import dumps_json
+
+# Bank versions are unique across instances (see get_bank_version)
+_bank_versions = itertools.count(1)
+
+# Languages whose question payloads are serialized when the bank is loaded
+SERIALIZED_LANGUAGES = ('en', 'el', 'de')
 
 
 class QuestionService:
-    """Service for managing questions from database."""
+    """
+    Service for managing questions from database.
+    
+    Questions are served from an in-memory question bank that is loaded from
+    the database in one query, so imports made by other processes are picked
+    up. The bank can be loaded ahead of time with load_bank() (e.g. before
+    forking workers).
+    
+    Once loaded, requests never wait for the database: after
+    ``refresh_interval`` seconds the current bank keeps being served while a
+    background thread revalidates it. If revalidation fails (e.g. the
+    database is locked by an import) or is interrupted at
+    ``revalidate_deadline``, the service counts itself degraded, keeps the
+    last known good bank and retries after ``retry_interval`` seconds.
+    """
+    
+    DEFAULT_REFRESH_INTERVAL = 60.0
+    DEFAULT_REVALIDATE_DEADLINE = 1.0
+    DEFAULT_RETRY_INTERVAL = 5.0
+    
+    def __init__(self, db: Optional[Database] = None,
+                 refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+                 revalidate_deadline: float = DEFAULT_REVALIDATE_DEADLINE,
+                 retry_interval: float = DEFAULT_RETRY_INTERVAL):
+        """
+        Initialize the question service.
+        
+        Args:
+            db: Database to read from. Defaults to the shared instance.
+            refresh_interval: Seconds before the question bank is revalidated
+            revalidate_deadline: Seconds a revalidation may spend on the
+                database before it is abandoned
+            retry_interval: Seconds to wait after a failed revalidation
+        """
+        self.db = db or get_db()
+        self.refresh_interval = refresh_interval
+        self.revalidate_deadline = revalidate_deadline
+        self.retry_interval = retry_interval
+        self._bank: Optional[Dict[str, List[Dict]]] = None
+        self._by_id: Dict[int, Dict] = {}
+        self._loaded_at = 0.0
+        self._fingerprint: Optional[Dict] = None
+        self._bank_version = 0
+        self._load_lock = threading.Lock()
+        self._revalidation: Optional[threading.Thread] = None
+        self._retry_at = 0.0
+        self.degraded = False
+        self.stats = {
+            'cache_hits': 0,
+            'cache_misses': 0,
+            'bank_loads': 0,
+            'revalidations': 0,
+            'degraded': 0
+        }
+    
+    def _read_fingerprint(self) -> Optional[Dict]:
+        """Read a cheap summary of the questions table that changes on any import."""
+        return self.db.execute_one(
+            "SELECT COUNT(*) AS count, MAX(id) AS max_id, MAX(updated_at) AS updated_at "
+            "FROM questions"
+        )
+    
+    def load_bank(self, fingerprint: Optional[Dict] = None) -> Dict[str, List[Dict]]:
+        """
+        Load all questions from the database into memory.
+        
+        Args:
+            fingerprint: Table fingerprint if the caller already read it
+        
+        Returns:
+            Question bank mapping category -> list of question records
+        """
+        query = """
+            SELECT id, category, question_en, question_el, question_de, 
+                   answers, correct_answer_index
+            FROM questions
+            ORDER BY category, id
+        """
+        if fingerprint is None:
+            fingerprint = self._read_fingerprint()
+        bank: Dict[str, List[Dict]] = {}
+        by_id: Dict[int, Dict] = {}
+        for row in self.db.execute(query):
+            # Parse answers JSON once at load time
+            try:
+                row['answers'] = json.loads(row['answers'])
+            except (json.JSONDecodeError, TypeError):
+                continue
+            row['_serialized'] = {
+                language: self._serialize_fragments(row, language) for language in SERIALIZED_LANGUAGES
+            }
+            bank.setdefault(row['category'], []).append(row)
+            by_id[row['id']] = row
+        
+        # Swap in the new bank in one step so readers never see a partial load
+        self._bank, self._by_id = bank, by_id
+        self._fingerprint = fingerprint
+        self._bank_version = next(_bank_versions)
+        self._loaded_at = time.monotonic()
+        self.stats['bank_loads'] += 1
+        return bank
     
-    def __init__(self):
-        """Initialize the question service."""
-        self.db = get_db()
+    def _get_bank(self) -> Dict[str, List[Dict]]:
+        """Get the question bank, loading it if missing and revalidating it if stale."""
+        bank = self._bank
+        if bank is None:
+            self.stats['cache_misses'] += 1
+            with self._load_lock:
+                # Another thread may have loaded the bank while we waited
+                if self._bank is not None:
+                    return self._bank
+                return self.load_bank()
+        
+        if time.monotonic() - self._loaded_at < self.refresh_interval:
+            self.stats['cache_hits'] += 1
+        else:
+            self.stats['cache_misses'] += 1
+            self._start_revalidation()
+        return bank
+    
+    def _start_revalidation(self):
+        """Revalidate the bank in a background thread unless one is running."""
+        with self._load_lock:
+            running = self._revalidation is not None and self._revalidation.is_alive()
+            if running or time.monotonic() < self._retry_at:
+                return
+            self._revalidation = threading.Thread(
+                target=self.revalidate, name='question-bank-revalidate', daemon=True
+            )
+            self._revalidation.start()
+    
+    def revalidate(self) -> bool:
+        """
+        Reload the bank if the questions table changed since it was loaded.
+        
+        Returns:
+            True if the bank is known to be current, False if the service is
+            degraded and keeps serving the last known good bank
+        """
+        try:
+            with deadline(self.revalidate_deadline):
+                # Keep the existing bank (and its shared memory pages) if nothing changed
+                fingerprint = self._read_fingerprint()
+                if fingerprint == self._fingerprint:
+                    self._loaded_at = time.monotonic()
+                else:
+                    self.load_bank(fingerprint)
+        except sqlite3.OperationalError:
+            # 'database is locked' by an import, or DeadlineExceeded
+            self._mark_degraded()
+            return False
+        finally:
+            self.stats['revalidations'] += 1
+        self.degraded = False
+        return True
+    
+    def _mark_degraded(self):
+        self.degraded = True
+        self.stats['degraded'] += 1
+        self._retry_at = time.monotonic() + self.retry_interval
+    
+    def wait_for_revalidation(self, timeout: Optional[float] = None):
+        """Wait for a running background revalidation to finish."""
+        thread = self._revalidation
+        if thread is not None:
+            thread.join(timeout)
+    
+    def bank_age(self) -> float:
+        """Seconds since the bank was last confirmed current."""
+        return time.monotonic() - self._loaded_at if self._bank is not None else 0.0
+    
+    def get_bank_version(self) -> int:
+        """
+        Get the version of the question bank being served.
+        
+        The version changes whenever a different bank is loaded, so responses
+        derived from the bank can be cached until then.
+        """
+        self._get_bank()
+        return self._bank_version
     
     def get_categories(self) -> List[str]:
         """
@@ -22,9 +209,7 @@ class QuestionService:
         Returns:
             List of category names (e.g., ['math_1', 'math_2', ...])
         """
-        query = "SELECT DISTINCT category FROM questions ORDER BY category"
-        rows = self.db.execute(query)
-        return [row['category'] for row in rows]
+        return sorted(self._get_bank())
     
     def get_random_question(self, category: str, language: str = 'en') -> Optional[Dict]:
         """
@@ -46,46 +231,95 @@ class QuestionService:
             }
             Returns None if category not found or empty.
         """
-        # First, get count of questions in category
-        count_result = self.db.execute_one(
-            "SELECT COUNT(*) as count FROM questions WHERE category = ?",
-            (category,)
-        )
-        
-        if not count_result or count_result['count'] == 0:
+        questions = self._get_bank().get(category)
+        if not questions:
             return None
         
-        # Get random question using SQLite RANDOM()
-        # SQLite doesn't have RANDOM() but we can use ORDER BY RANDOM() LIMIT 1
-        query = """
-            SELECT id, category, question_en, question_el, question_de, 
-                   answers, correct_answer_index
-            FROM questions
-            WHERE category = ?
-            ORDER BY RANDOM()
-            LIMIT 1
+        return self._build_question(random.choice(questions), language)
+    
+    def get_question_batch(self, category: str, language: str = 'en') -> List[Dict]:
+        """
+        Get every question of a category with shuffled answers.
+        
+        Args:
+            category: Category name
+            language: Language code ('en', 'el', 'de')
+        
+        Returns:
+            List of question dictionaries (empty if category not found)
+        """
+        batch = []
+        for record in self._get_bank().get(category, []):
+            question = self._build_question(record, language)
+            if question is not None:
+                batch.append(question)
+        return batch
+    
+    def get_random_question_json(self, category: str, language: str = 'en') -> Optional[bytes]:
         """
+        Get a random question serialized as JSON.
         
-        question_row = self.db.execute_one(query, (category,))
+        Same document as get_random_question(), assembled from fragments
+        serialized when the bank was loaded, so only the shuffled answer
+        order is encoded per call.
+        
+        Returns:
+            Encoded question or None if category not found or empty
+        """
+        questions = self._get_bank().get(category)
+        if not questions:
+            return None
         
-        if not question_row:
+        record = random.choice(questions)
+        serialized = record['_serialized']
+        if language in serialized:
+            fragments = serialized[language]
+        else:
+            fragments = self._serialize_fragments(record, language)
+        if fragments is None:
             return None
         
-        # Get question text in requested language
-        question_text = self._get_question_text(question_row, category, language)
+        head, answers, tail = fragments
+        order = list(range(len(answers)))
+        random.shuffle(order)
+        correct = order.index(record['correct_answer_index'])
+        return b''.join((head, b','.join([answers[i] for i in order]), tail, str(correct).encode(), b'}'))
+    
+    def _serialize_fragments(self, record: Dict, language: str) -> Optional[Tuple[bytes, List[bytes], bytes]]:
+        """
+        Serialize the parts of a question payload that do not depend on answer order.
+        
+        Returns:
+            (head, encoded answers, tail) or None if the question has no text
+        """
+        question_text = self._get_question_text(record, record['category'], language)
         if question_text is None:
             return None
+        head = b'{"id":' + dumps_json(record['id']) + b',"question":' + dumps_json(question_text) + b',"answers":['
+        answers = [dumps_json(answer) for answer in record['answers']]
+        tail = b'],"category":' + dumps_json(record['category']) + b',"correct_answer":'
+        return head, answers, tail
+    
+    def _build_question(self, record: Dict, language: str) -> Optional[Dict]:
+        """
+        Build a question response from a bank record with shuffled answers.
         
-        # Parse answers JSON
-        try:
-            original_answers = json.loads(question_row['answers'])
-        except (json.JSONDecodeError, TypeError):
+        Args:
+            record: Question record from the bank
+            language: Requested language code
+        
+        Returns:
+            Question dictionary or None if the question has no text
+        """
+        category = record['category']
+        question_text = self._get_question_text(record, category, language)
+        if question_text is None:
             return None
         
-        original_correct_index = question_row['correct_answer_index']
+        original_correct_index = record['correct_answer_index']
         
         # Randomize answer order
-        answers_with_indices = [(ans, idx) for idx, ans in enumerate(original_answers)]
+        answers_with_indices = [(ans, idx) for idx, ans in enumerate(record['answers'])]
         random.shuffle(answers_with_indices)
         
         # Find new index of correct answer
@@ -96,7 +330,7 @@ class QuestionService:
         )
         
         return {
-            'id': question_row['id'],
+            'id': record['id'],
             'question': question_text,
             'answers': shuffled_answers,
             'correct_answer': correct_answer_new_index,
@@ -135,49 +369,12 @@ class QuestionService:
         Returns:
             Dictionary with question data or None if not found
         """
-        query = """
-            SELECT id, category, question_en, question_el, question_de, 
-                   answers, correct_answer_index
-            FROM questions
-            WHERE id = ?
-        """
-        
-        question_row = self.db.execute_one(query, (question_id,))
-        
-        if not question_row:
-            return None
-        
-        category = question_row['category']
-        question_text = self._get_question_text(question_row, category, language)
-        if question_text is None:
-            return None
-        
-        # Parse answers JSON
-        try:
-            original_answers = json.loads(question_row['answers'])
-        except (json.JSONDecodeError, TypeError):
+        self._get_bank()  # Ensure the bank and its ID index are loaded and fresh
+        record = self._by_id.get(question_id)
+        if not record:
             return None
         
-        original_correct_index = question_row['correct_answer_index']
-        
-        # Randomize answer order
-        answers_with_indices = [(ans, idx) for idx, ans in enumerate(original_answers)]
-        random.shuffle(answers_with_indices)
-        
-        # Find new index of correct answer
-        shuffled_answers = [ans for ans, _ in answers_with_indices]
-        correct_answer_new_index = next(
-            idx for idx, (_, orig_idx) in enumerate(answers_with_indices)
-            if orig_idx == original_correct_index
-        )
-        
-        return {
-            'id': question_row['id'],
-            'question': question_text,
-            'answers': shuffled_answers,
-            'correct_answer': correct_answer_new_index,
-            'category': category
-        }
+        return self._build_question(record, language)
     
     def validate_answer(self, category: str, question_id: int, answer_index: int, 
                        language: str = 'en') -> bool:
@@ -216,15 +413,11 @@ class QuestionService:
         Returns:
             Number of questions
         """
+        bank = self._get_bank()
         if category:
-            result = self.db.execute_one(
-                "SELECT COUNT(*) as count FROM questions WHERE category = ?",
-                (category,)
-            )
-        else:
-            result = self.db.execute_one("SELECT COUNT(*) as count FROM questions")
+            return len(bank.get(category, []))
         
-        return result['count'] if result else 0
+        return sum(len(questions) for questions in bank.values())
 
 
 # Singleton instance
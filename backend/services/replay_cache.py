@@ -0,0 +1,74 @@
+"""
+Bounded cache of recent results, keyed by client-supplied idempotency keys.
+
+A client that retries a request with the same Idempotency-Key gets the result
+of the first attempt back instead of repeating its side effects. Each game
+has its own cache, read and written under the game's lock, so a retry racing
+the original request either waits for it or sees its result.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+class KeyReused(ValueError):
+    """An idempotency key was sent again with a different request."""
+
+
+class ReplayCache:
+    """Recent results by key, evicted oldest first past a size or age limit."""
+    
+    def __init__(self, max_entries: int = 32, ttl: float = 300.0):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            max_entries: Results kept before the oldest is evicted
+            ttl: Seconds a result can be replayed
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> (expires, fingerprint, result), oldest first
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Hashable, Any]]' = OrderedDict()
+    
+    def _expire(self, now: float):
+        while self._entries:
+            expires = next(iter(self._entries.values()))[0]
+            if expires > now:
+                break
+            self._entries.popitem(last=False)
+    
+    def get(self, key: Hashable, fingerprint: Hashable) -> Optional[Any]:
+        """
+        Look up the result stored for a key.
+        
+        Args:
+            key: Idempotency key
+            fingerprint: Identifies the request (e.g. its arguments); a key
+                is only replayed for the request it was first used with
+        
+        Returns:
+            The stored result, or None
+        
+        Raises:
+            KeyReused: If the key was first used for a different request
+        """
+        self._expire(time.monotonic())
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] != fingerprint:
+            raise KeyReused('Idempotency key was already used for a different request')
+        return entry[2]
+    
+    def put(self, key: Hashable, fingerprint: Hashable, result: Any):
+        """Store the result of a request."""
+        now = time.monotonic()
+        self._expire(now)
+        self._entries[key] = (now + self.ttl, fingerprint, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,165 @@
+"""
+Opt-in per-request profiling with cProfile.
+
+A request is profiled when it carries the profiling header (if enabled) or is
+picked by the sampling rate. Each profile is saved as a ``.prof`` file next to
+a ``.json`` file describing the route and timing, grouped in one directory per
+endpoint. Run this module to aggregate saved profiles into the hottest
+functions per endpoint:
+
+    python -m services.request_profiler [--dir profiles] [--top 15]
+"""
+import argparse
+import cProfile
+import json
+import os
+import pstats
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+
+DEFAULT_PROFILE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'profiles'
+)
+
+
+class RequestProfiler:
+    """Decides which requests to profile and saves the results."""
+    
+    def __init__(self, profile_dir: Optional[str] = None, sample_rate: float = 0.0,
+                 header_enabled: bool = False):
+        """
+        Initialize the profiler.
+        
+        Args:
+            profile_dir: Directory for saved profiles. Defaults to backend/profiles
+            sample_rate: Fraction of requests profiled without being asked (0.0 to 1.0)
+            header_enabled: Whether clients may request profiling with a header
+        """
+        self.profile_dir = profile_dir or DEFAULT_PROFILE_DIR
+        self.sample_rate = sample_rate
+        self.header_enabled = header_enabled
+        # Only one request is profiled at a time to keep the overhead bounded
+        self._busy = threading.Lock()
+    
+    def should_profile(self, header_requested: bool) -> bool:
+        """Check whether the current request should be profiled."""
+        if header_requested and self.header_enabled:
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+    
+    def start(self) -> Optional[cProfile.Profile]:
+        """Start profiling the current thread, or return None if busy."""
+        if not self._busy.acquire(blocking=False):
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is active on this thread
+            self._busy.release()
+            return None
+        return profile
+    
+    def stop(self, profile: cProfile.Profile, endpoint: str, method: str, path: str,
+             status: int, duration: float) -> str:
+        """
+        Stop profiling and save the profile with its metadata.
+        
+        Returns:
+            Path of the saved .prof file
+        """
+        try:
+            profile.disable()
+        finally:
+            self._busy.release()
+        
+        endpoint_dir = os.path.join(self.profile_dir, endpoint.replace('/', '_'))
+        os.makedirs(endpoint_dir, exist_ok=True)
+        base = os.path.join(
+            endpoint_dir,
+            f"{time.strftime('%Y%m%d-%H%M%S')}-{int(duration * 1000)}ms-{os.getpid()}-"
+            f"{threading.get_ident()}"
+        )
+        profile.dump_stats(base + '.prof')
+        with open(base + '.json', 'w', encoding='utf-8') as f:
+            json.dump({
+                'endpoint': endpoint,
+                'method': method,
+                'path': path,
+                'status': status,
+                'duration_ms': round(duration * 1000, 3),
+                'timestamp': time.time()
+            }, f)
+        return base + '.prof'
+
+
+def load_profiles(profile_dir: str) -> Dict[str, List[str]]:
+    """
+    Find saved profiles grouped by endpoint.
+    
+    Returns:
+        Dictionary mapping endpoint -> list of .prof paths
+    """
+    profiles: Dict[str, List[str]] = {}
+    if not os.path.isdir(profile_dir):
+        return profiles
+    for root, _, files in os.walk(profile_dir):
+        for name in sorted(files):
+            if not name.endswith('.prof'):
+                continue
+            prof_path = os.path.join(root, name)
+            endpoint = os.path.basename(root)
+            meta_path = prof_path[:-len('.prof')] + '.json'
+            if os.path.exists(meta_path):
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    endpoint = json.load(f).get('endpoint', endpoint)
+            profiles.setdefault(endpoint, []).append(prof_path)
+    return profiles
+
+
+def hot_functions(prof_paths: List[str], top: int = 15) -> List[Dict]:
+    """
+    Aggregate profiles and return the functions with the most own time.
+    
+    Returns:
+        List of dictionaries with 'function', 'calls', 'tottime' and 'cumtime'
+        (seconds summed over all profiles), hottest first
+    """
+    stats = pstats.Stats(prof_paths[0])
+    for path in prof_paths[1:]:
+        stats.add(path)
+    
+    rows = []
+    for (filename, line, name), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            'function': f'{filename}:{line}({name})',
+            'calls': calls,
+            'tottime': tottime,
+            'cumtime': cumtime
+        })
+    rows.sort(key=lambda row: row['tottime'], reverse=True)
+    return rows[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarize saved request profiles')
+    parser.add_argument('--dir', default=DEFAULT_PROFILE_DIR, help='Profile directory')
+    parser.add_argument('--top', type=int, default=15, help='Functions per endpoint')
+    args = parser.parse_args()
+    
+    profiles = load_profiles(args.dir)
+    if not profiles:
+        print(f"No profiles found in {args.dir}")
+        return
+    
+    for endpoint, paths in sorted(profiles.items()):
+        print(f"\n== {endpoint} ({len(paths)} profiles)")
+        print(f"{'tottime':>10} {'cumtime':>10} {'calls':>8}  function")
+        for row in hot_functions(paths, args.top):
+            print(f"{row['tottime']:>10.4f} {row['cumtime']:>10.4f} {row['calls']:>8}  {row['function']}")
+
+
+if __name__ == '__main__':
+    main()
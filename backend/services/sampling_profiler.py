@@ -0,0 +1,152 @@
+"""
+Continuous low-overhead stack sampling profiler.
+
+A background thread wakes up at a fixed rate, grabs the current stack of every
+other thread with sys._current_frames() and counts each distinct stack. The
+profiled code runs untouched between samples, so its timing is not distorted
+the way deterministic profilers distort it. Stacks are exported in the
+collapsed ("folded") format understood by flamegraph.pl and speedscope:
+
+    flask/app.py:wsgi_app;...;routes/questions.py:get_random_question 42
+"""
+import os
+import sys
+import threading
+from collections import Counter
+from typing import Dict, Optional
+
+# Leaf frames of threads that are blocked waiting for work, not running code
+IDLE_FRAMES = {
+    ('selectors.py', 'select'),
+    ('socketserver.py', 'serve_forever'),
+    ('socket.py', 'accept'),
+    ('threading.py', 'wait'),
+    ('queue.py', 'get'),
+}
+
+# Stacks beyond this many distinct entries are counted under one bucket
+MAX_DISTINCT_STACKS = 20000
+OVERFLOW_STACK = '[other]'
+
+
+def _frame_label(frame) -> str:
+    """Label a frame as <parent dir>/<file>:<function>."""
+    code = frame.f_code
+    directory, filename = os.path.split(code.co_filename)
+    return f'{os.path.basename(directory)}/{filename}:{code.co_name}'
+
+
+class SamplingProfiler:
+    """Samples all thread stacks at a fixed rate and aggregates folded stacks."""
+    
+    def __init__(self, hz: float = 10.0, max_depth: int = 64):
+        """
+        Initialize the profiler (call start() to begin sampling).
+        
+        Args:
+            hz: Samples per second
+            max_depth: Maximum frames kept per stack (innermost frames win)
+        """
+        self.interval = 1.0 / hz
+        self.max_depth = max_depth
+        self.samples = 0
+        self._stacks: Counter = Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        """Start the sampling thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop the sampling thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample(exclude=own_id)
+    
+    def sample(self, exclude: Optional[int] = None):
+        """Record the current stack of every thread except ``exclude``."""
+        frames = sys._current_frames()
+        stacks = []
+        for thread_id, frame in frames.items():
+            if thread_id == exclude:
+                continue
+            code = frame.f_code
+            if (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+                continue
+            labels = []
+            while frame is not None and len(labels) < self.max_depth:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            stacks.append(';'.join(reversed(labels)))
+        del frames
+        
+        with self._lock:
+            self.samples += 1
+            for stack in stacks:
+                if stack not in self._stacks and len(self._stacks) >= MAX_DISTINCT_STACKS:
+                    stack = OVERFLOW_STACK
+                self._stacks[stack] += 1
+    
+    def folded(self, reset: bool = False) -> str:
+        """
+        Get aggregated stacks in collapsed-stack format.
+        
+        Args:
+            reset: Clear the aggregated stacks after reading them
+        """
+        with self._lock:
+            if reset:
+                stacks, self._stacks = self._stacks, Counter()
+            else:
+                stacks = self._stacks.copy()
+        return ''.join(f'{stack} {count}\n' for stack, count in stacks.most_common())
+    
+    def stats(self) -> Dict:
+        """Get the number of samples taken and distinct stacks held."""
+        with self._lock:
+            return {'samples': self.samples, 'distinct_stacks': len(self._stacks)}
+
+
+# Per-process profiler instance
+_profiler: Optional[SamplingProfiler] = None
+
+
+def start_sampling_profiler(hz: float) -> Optional[SamplingProfiler]:
+    """
+    Start (or restart) the process-wide sampling profiler.
+    
+    Args:
+        hz: Samples per second; 0 disables the profiler
+    
+    Returns:
+        The running profiler, or None if disabled
+    """
+    global _profiler
+    stop_sampling_profiler()
+    if hz and hz > 0:
+        _profiler = SamplingProfiler(hz)
+        _profiler.start()
+    return _profiler
+
+
+def stop_sampling_profiler():
+    """Stop the process-wide sampling profiler if it is running."""
+    global _profiler
+    if _profiler is not None:
+        _profiler.stop()
+        _profiler = None
+
+
+def get_sampling_profiler() -> Optional[SamplingProfiler]:
+    """Get the running sampling profiler, if any."""
+    return _profiler
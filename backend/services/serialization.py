@@ -0,0 +1,155 @@
+"""
+Response serialization with optional fast encoders.
+
+JSON is encoded with orjson when it is installed and with the standard
+library otherwise. Clients that send ``Accept: application/msgpack`` get
+MessagePack instead when msgpack is installed. FastJSONProvider plugs both
+into Flask, so jsonify() and dictionaries returned from views use them
+without changes to the routes.
+
+Usage:
+    app.json = FastJSONProvider(app)
+
+    body = dumps_json({'success': True})
+"""
+import json
+import re
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+_NON_ASCII = re.compile(r'[^\x00-\x7f]')
+
+
+def _default(obj: Any) -> Any:
+    """Fallback for types the fast encoders do not handle (same as Flask)."""
+    return DefaultJSONProvider.default(obj)
+
+
+def _escape_non_ascii(match: 're.Match') -> str:
+    code = ord(match.group())
+    if code < 0x10000:
+        return f'\\u{code:04x}'
+    code -= 0x10000
+    return f'\\u{0xd800 | (code >> 10):04x}\\u{0xdc00 | (code & 0x3ff):04x}'
+
+
+def dumps_json(data: Any, sort_keys: bool = False, ensure_ascii: bool = False) -> bytes:
+    """
+    Serialize data as compact JSON.
+    
+    Args:
+        data: Document to serialize
+        sort_keys: Sort object keys, e.g. for output that is hashed
+        ensure_ascii: Escape non-ASCII characters as \\uXXXX instead of
+            writing them as UTF-8
+    
+    Returns:
+        Encoded JSON
+    """
+    if orjson is None:
+        return json.dumps(data, default=_default, ensure_ascii=ensure_ascii,
+                          separators=(',', ':'), sort_keys=sort_keys).encode('utf-8')
+    
+    # Dates go to Flask's encoder so both encoders produce the same text
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    body = orjson.dumps(data, default=_default, option=option)
+    if ensure_ascii and not body.isascii():
+        # Non-ASCII can only occur inside strings, so escaping every such
+        # character gives the standard library's output
+        body = _NON_ASCII.sub(_escape_non_ascii, body.decode('utf-8')).encode('ascii')
+    return body
+
+
+def dumps_msgpack(data: Any) -> bytes:
+    """Serialize data as MessagePack (requires msgpack)."""
+    return msgpack.packb(data, default=_default, use_bin_type=True)
+
+
+def wants_msgpack() -> bool:
+    """Check whether the current request prefers MessagePack and it is available."""
+    from flask import has_request_context, request
+    
+    if msgpack is None or not has_request_context():
+        return False
+    return request.accept_mimetypes.best_match([JSON_MIMETYPE, MSGPACK_MIMETYPE]) == MSGPACK_MIMETYPE
+
+
+def raw_json_response(body: bytes, status: int = 200):
+    """
+    Build a response from already serialized JSON.
+    
+    Args:
+        body: Encoded JSON document
+        status: HTTP status code
+    
+    Returns:
+        Flask response
+    """
+    from flask import current_app
+    
+    response = current_app.response_class(body, status=status, mimetype=JSON_MIMETYPE)
+    if msgpack is not None:
+        response.vary.add('Accept')
+    return response
+
+
+def writes_fragments_verbatim() -> bool:
+    """
+    Check whether the app's JSON provider writes JSON the way dumps_json()
+    does by default (unsorted keys, UTF-8 text), so pre-serialized fragments
+    can be sent as they are.
+    """
+    from flask import current_app
+    
+    provider = current_app.json
+    return not (getattr(provider, 'sort_keys', True) or getattr(provider, 'ensure_ascii', True))
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider using orjson, and MessagePack when requested.
+    
+    Unlike Flask's default provider it does not sort keys or escape non-ASCII
+    text by default; set sort_keys or ensure_ascii on app.json to get
+    Flask's key order and escaping.
+    """
+    
+    sort_keys = False
+    ensure_ascii = False
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize to a string; keyword arguments need the standard encoder."""
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps_json(obj, sort_keys=self.sort_keys, ensure_ascii=self.ensure_ascii).decode('utf-8')
+    
+    def response(self, *args: Any, **kwargs: Any):
+        """Serialize the arguments as MessagePack if requested, otherwise JSON."""
+        obj = self._prepare_response_obj(args, kwargs)
+        if wants_msgpack():
+            response = self._app.response_class(dumps_msgpack(obj), mimetype=MSGPACK_MIMETYPE)
+        elif (self.compact is None and self._app.debug) or self.compact is False:
+            # Indented output for debugging
+            response = super().response(obj)
+        else:
+            body = dumps_json(obj, sort_keys=self.sort_keys, ensure_ascii=self.ensure_ascii)
+            response = self._app.response_class(body, mimetype=self.mimetype)
+        if msgpack is not None:
+            response.vary.add('Accept')
+        return response
@@ -0,0 +1,40 @@
+"""Server-Sent Events formatting and streaming responses"""
+from typing import Any, Iterator
+from services.serialization import dumps_json
+
+# Comment line sent while a stream is idle, so proxies and clients keep the
+# connection open and a dead client is noticed on the next write
+HEARTBEAT = ': heartbeat\n\n'
+
+
+def format_event(event: str, data: Any) -> str:
+    """
+    Format one Server-Sent Event.
+    
+    Args:
+        event: Event name (the client's addEventListener type)
+        data: JSON-serializable payload
+    
+    Returns:
+        Event text ready to be written to the stream
+    """
+    return f"event: {event}\ndata: {dumps_json(data).decode('utf-8')}\n\n"
+
+
+def event_stream_response(events: Iterator[str]):
+    """
+    Build a streaming text/event-stream response.
+    
+    Args:
+        events: Iterator of formatted events
+    
+    Returns:
+        Flask response
+    """
+    from flask import Response
+    
+    response = Response(events, mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Stop nginx and similar proxies from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
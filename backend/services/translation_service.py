@@ -0,0 +1,60 @@
+"""Translation loading service"""
+import json
+import os
+from typing import Dict, List, Optional
+
+
+class TranslationService:
+    """Service for loading UI translations once and serving them from memory"""
+    
+    def __init__(self, translations_path: Optional[str] = None):
+        """Initialize translation service with path to translations file"""
+        if translations_path is None:
+            # Default to config directory relative to this file
+            current_dir = os.path.dirname(os.path.abspath(__file__))
+            translations_path = os.path.join(current_dir, '..', 'config', 'translations.json')
+        self.translations_path = translations_path
+        self._translations = None
+        self._load_translations()
+    
+    def _load_translations(self):
+        """Load translations from JSON file"""
+        try:
+            with open(self.translations_path, 'r', encoding='utf-8') as f:
+                self._translations = json.load(f)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Translations file not found: {self.translations_path}")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON in translations file: {e}")
+    
+    def get_languages(self) -> List[str]:
+        """Get available language codes"""
+        return list(self._translations.keys())
+    
+    def get_translations(self) -> Dict:
+        """Get translations for all languages"""
+        return self._translations
+    
+    def get_language(self, language: str) -> Optional[Dict]:
+        """
+        Get translations for a single language.
+        
+        Args:
+            language: Language code ('en', 'el', 'de')
+        
+        Returns:
+            Translations for the language, or None if not available
+        """
+        return self._translations.get(language)
+
+
+# Singleton instance
+_translation_service = None
+
+
+def get_translation_service() -> TranslationService:
+    """Get singleton translation service instance"""
+    global _translation_service
+    if _translation_service is None:
+        _translation_service = TranslationService()
+    return _translation_service
@@ -129,3 +129,80 @@ def sample_game_state():
         "current_action": None
     }
 
+
+
+@pytest.fixture
+def app(temp_db, tmp_path):
+    """Create a Flask application backed by a temporary database"""
+    from app import create_app
+    from database.db import reset_db
+    from services.action_log import shutdown_action_log
+    from services.classroom_service import reset_classroom_service
+    from services.event_bus import reset_event_bus
+    from services.question_service import reset_question_service
+    from services.sampling_profiler import stop_sampling_profiler
+    
+    application = create_app({
+        'TESTING': True,
+        'DATABASE_PATH': temp_db,
+        'ACTION_LOG_PATH': str(tmp_path / 'logs' / 'actions.log')
+    })
+    yield application
+    
+    shutdown_action_log()
+    stop_sampling_profiler()
+    reset_db()
+    reset_question_service()
+    reset_classroom_service()
+    reset_event_bus()
+
+
+@pytest.fixture
+def client(app):
+    """Test client for the Flask application"""
+    return app.test_client()
+
+
+@pytest.fixture
+def question_db(temp_db):
+    """Temporary database initialized with schema and a few questions"""
+    from database.db import Database
+    
+    db = Database(temp_db)
+    schema_file = os.path.join(os.path.dirname(__file__), '..', 'database', 'schema.sql')
+    with open(schema_file, 'r', encoding='utf-8') as f:
+        schema_sql = f.read()
+    with db.get_connection() as conn:
+        conn.executescript(schema_sql)
+    
+    questions = [
+        ('math_1', 'What is 2 + 2?', 'Πόσο κάνει 2 + 2;', 'Was ist 2 + 2?', ['3', '4', '5', '6'], 1),
+        ('math_1', 'What is 3 + 3?', 'Πόσο κάνει 3 + 3;', 'Was ist 3 + 3?', ['6', '7', '8', '9'], 0),
+        ('geography_1', 'What is the capital of Greece?', 'Ποια είναι η πρωτεύουσα της Ελλάδας;',
+         'Was ist die Hauptstadt von Griechenland?', ['Athens', 'Rome', 'Paris', 'Berlin'], 0),
+    ]
+    for category, q_en, q_el, q_de, answers, correct in questions:
+        db.execute_update(
+            """
+            INSERT INTO questions
+            (category, question_en, question_el, question_de, answers, correct_answer_index)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (category, q_en, q_el, q_de, json.dumps(answers, ensure_ascii=False), correct)
+        )
+    return db
+
+
+@pytest.fixture
+def read_events():
+    """Read ``count`` events from a streamed response's chunks as (name, data) pairs"""
+    def read(chunks, count):
+        events = []
+        while len(events) < count:
+            chunk = next(chunks).decode('utf-8')
+            if chunk.startswith(':'):
+                continue
+            name, data = chunk.strip().split('\n')
+            events.append((name[len('event: '):], json.loads(data[len('data: '):])))
+        return events
+    return read
@@ -0,0 +1,91 @@
+"""
+Tests for the asynchronous action log
+"""
+import json
+import logging
+import pytest
+from services import action_log
+
+
+def _read_lines(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.unit
+class TestActionLog:
+    """Test queued JSON-line logging"""
+    
+    @pytest.fixture
+    def log_path(self, tmp_path):
+        path = tmp_path / 'actions.log'
+        yield path
+        action_log.shutdown_action_log()
+    
+    def test_records_are_written_as_json_lines(self, log_path):
+        """Test that structured fields end up in the file"""
+        action_log.configure_action_log(str(log_path))
+        action_log.log_action('action', game_id='g1', action='pass', probability=0.9,
+                              roll=0.5, latency_ms=1.2)
+        action_log.shutdown_action_log()
+        
+        [record] = _read_lines(log_path)
+        assert record['event'] == 'action'
+        assert record['level'] == 'INFO'
+        assert record['game_id'] == 'g1'
+        assert record['roll'] == 0.5
+        assert 'ts' in record
+    
+    def test_level_control(self, log_path):
+        """Test that records below the configured level are skipped"""
+        action_log.configure_action_log(str(log_path), level='WARNING')
+        action_log.log_action('action', game_id='g1')
+        action_log.log_action('slow_action', level=logging.WARNING, game_id='g2')
+        action_log.shutdown_action_log()
+        
+        assert [r['game_id'] for r in _read_lines(log_path)] == ['g2']
+    
+    def test_sampling(self, log_path):
+        """Test that a zero sample rate keeps nothing"""
+        action_log.configure_action_log(str(log_path), sample_rate=0.0)
+        for _ in range(10):
+            action_log.log_action('action')
+        action_log.shutdown_action_log()
+        
+        assert _read_lines(log_path) == []
+    
+    def test_per_process_file(self, log_path):
+        """Test that per-process logs go to a file named after the process"""
+        import os
+        action_log.configure_action_log(str(log_path), per_process=True)
+        action_log.log_action('action', game_id='g1')
+        action_log.shutdown_action_log()
+        
+        path = log_path.parent / f'actions.{os.getpid()}.log'
+        assert str(path) == action_log.process_log_path(str(log_path))
+        assert [r['game_id'] for r in _read_lines(path)] == ['g1']
+        assert not log_path.exists()
+    
+    def test_full_queue_drops_instead_of_blocking(self, log_path):
+        """Test that a full queue drops and counts records"""
+        handler = action_log.NonBlockingQueueHandler(action_log.queue.Queue(maxsize=1))
+        record = logging.LogRecord('x', logging.INFO, __file__, 1, 'action', None, None)
+        handler.emit(record)
+        handler.emit(record)
+        
+        assert handler.dropped == 1
+    
+    def test_game_action_is_logged(self, client, app):
+        """Test that POST /api/game/action produces a log line"""
+        game_id = client.post('/api/game/start', json={}).get_json()['game_id']
+        client.post('/api/game/action', json={
+            'game_id': game_id, 'action': 'pass', 'question_correct': True
+        })
+        action_log.shutdown_action_log()
+        
+        [record] = _read_lines(app.config['ACTION_LOG_PATH'])
+        assert record['game_id'] == game_id
+        assert record['action'] == 'pass'
+        assert record['question_correct'] is True
+        assert 0 <= record['roll'] < 1
+        assert record['latency_ms'] >= 0
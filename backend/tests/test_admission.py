@@ -0,0 +1,140 @@
+"""
+Tests for admission control
+"""
+import pytest
+from services.admission import AdmissionController, TokenBucketTable
+
+
+@pytest.fixture
+def limited_client(temp_db, tmp_path):
+    """Test client with tight admission limits"""
+    from app import create_app
+    from database.db import reset_db
+    from services.action_log import shutdown_action_log
+    from services.sampling_profiler import stop_sampling_profiler
+    
+    app = create_app({
+        'TESTING': True,
+        'DATABASE_PATH': temp_db,
+        'ACTION_LOG_PATH': str(tmp_path / 'actions.log'),
+        'ADMISSION_CLIENT_RATE': 0.01,
+        'ADMISSION_CLIENT_BURST': 5,
+        'ADMISSION_GAME_RATE': 0.01,
+        'ADMISSION_GAME_BURST': 2
+    })
+    yield app.test_client()
+    
+    shutdown_action_log()
+    stop_sampling_profiler()
+    reset_db()
+
+
+@pytest.mark.unit
+class TestTokenBucketTable:
+    """Test token buckets and their eviction"""
+    
+    def test_burst_then_reject(self):
+        """Test that a key may use its burst and then has to wait"""
+        table = TokenBucketTable(rate=2.0, burst=3)
+        assert [table.take('a') for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert table.take('a') == pytest.approx(0.5, abs=0.01)
+        assert table.take('b') == 0.0
+    
+    def test_refill(self):
+        """Test that tokens are added back over time"""
+        table = TokenBucketTable(rate=1.0, burst=1)
+        table.take('a')
+        table.buckets['a'][1] -= 1.0  # One second passes
+        assert table.take('a') == 0.0
+    
+    def test_idle_buckets_evicted(self):
+        """Test that buckets idle long enough to be full again are dropped"""
+        table = TokenBucketTable(rate=1.0, burst=2)
+        table.take('old')
+        table.buckets['old'][1] -= 10
+        table.take('new')
+        assert list(table.buckets) == ['new']
+    
+    def test_max_entries(self):
+        """Test that the least recently used bucket goes first"""
+        table = TokenBucketTable(rate=1.0, burst=2, max_entries=2)
+        for key in ('a', 'b', 'a', 'c'):
+            table.take(key)
+        assert list(table.buckets) == ['a', 'c']
+    
+    def test_concurrency_cap(self):
+        """Test that slots are limited and released"""
+        controller = AdmissionController(max_concurrent=1)
+        assert controller.acquire_slot() is True
+        assert controller.acquire_slot() is False
+        controller.release_slot()
+        assert controller.acquire_slot() is True
+        assert controller.stats()['rejected']['concurrency'] == 1
+    
+    def test_concurrent_rejections_are_counted(self):
+        """Test that rate limit rejections from many threads are all counted"""
+        import sys
+        import threading
+        controller = AdmissionController(client_rate=0.001, client_burst=1)
+        barrier = threading.Barrier(16)
+        
+        def worker():
+            barrier.wait()
+            for _ in range(500):
+                controller.check_rate('client')
+        
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=worker) for _ in range(16)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+        assert controller.stats()['rejected']['client'] == 16 * 500 - 1
+
+
+@pytest.mark.integration
+class TestAdmissionHooks:
+    """Test 429/503 responses from the request hooks"""
+    
+    def test_client_limit(self, limited_client):
+        """Test that a client over its limit gets 429 with Retry-After"""
+        statuses = [limited_client.get('/api/config').status_code for _ in range(6)]
+        assert statuses == [200] * 5 + [429]
+        
+        response = limited_client.get('/api/config')
+        assert response.get_json() == {'success': False, 'error': 'Too many requests', 'limit': 'client'}
+        assert int(response.headers['Retry-After']) >= 1
+    
+    def test_game_limit(self, limited_client):
+        """Test that one game cannot flood the action endpoint"""
+        game_id = limited_client.post('/api/game/start', json={}).get_json()['game_id']
+        statuses = [
+            limited_client.post('/api/game/action', json={'game_id': game_id, 'action': 'pass'}).status_code
+            for _ in range(3)
+        ]
+        assert statuses == [200, 200, 429]
+        
+        response = limited_client.get(f'/api/game/state/{game_id}')
+        assert response.get_json()['limit'] == 'game'
+    
+    def test_health_and_metrics_exempt(self, limited_client):
+        """Test that monitoring keeps working under rejection"""
+        for _ in range(10):
+            assert limited_client.get('/api/health').status_code == 200
+        
+        metrics = limited_client.get('/api/metrics').get_data(as_text=True)
+        assert 'smartkick_admission_active_requests 0' in metrics
+    
+    def test_concurrency_cap_returns_503(self, limited_client):
+        """Test that a full process answers 503 immediately"""
+        controller = limited_client.application.extensions['admission']
+        controller.max_concurrent = 0
+        
+        response = limited_client.get('/api/config')
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+        assert controller.active == 0
@@ -0,0 +1,82 @@
+"""
+Tests for the application factory
+"""
+import os
+import pytest
+
+
+@pytest.mark.unit
+class TestAppFactory:
+    """Test lazy application startup"""
+    
+    def test_create_app_does_not_touch_database(self, app, temp_db):
+        """Test that creating the app defers database initialization"""
+        assert app.extensions['warmed_up'] is False
+        assert not os.path.exists(temp_db)
+    
+    def test_first_request_warms_up(self, app, client, temp_db):
+        """Test that the first request initializes the database"""
+        response = client.get('/api/health')
+        
+        assert response.status_code == 200
+        assert response.get_json() == {'status': 'ok'}
+        assert app.extensions['warmed_up'] is True
+        assert os.path.exists(temp_db)
+    
+    def test_explicit_warm_up(self, temp_db):
+        """Test that WARM_UP initializes the database inside create_app"""
+        from app import create_app
+        from database.db import reset_db
+        
+        app = create_app({'TESTING': True, 'DATABASE_PATH': temp_db, 'WARM_UP': True})
+        try:
+            assert app.extensions['warmed_up'] is True
+            assert os.path.exists(temp_db)
+        finally:
+            reset_db()
+    
+    def test_config_endpoint(self, client):
+        """Test that the game configuration endpoint is registered"""
+        response = client.get('/api/config')
+        data = response.get_json()
+        
+        assert response.status_code == 200
+        assert data['success'] is True
+        assert set(data['probabilities']) == {'pass', 'dribble', 'shoot', 'tackle'}
+    
+    def test_game_routes_are_registered(self, client):
+        """Test that blueprints are registered by the factory"""
+        response = client.post('/api/game/start', json={'duration': 'tiny'})
+        game_id = response.get_json()['game_id']
+        
+        response = client.get(f'/api/game/state/{game_id}')
+        assert response.status_code == 200
+        assert response.get_json()['game']['game_id'] == game_id
+
+
+@pytest.mark.integration
+class TestGameStatesEndpoint:
+    """Test fetching several game states in one request"""
+    
+    def test_bulk_states(self, client):
+        """Test that known games are returned and unknown IDs listed"""
+        game_ids = [client.post('/api/game/start', json={}).get_json()['game_id']
+                    for _ in range(3)]
+        
+        response = client.post('/api/game/states',
+                               json={'game_ids': game_ids + ['missing', 'missing']})
+        data = response.get_json()
+        
+        assert response.status_code == 200
+        assert set(data['games']) == set(game_ids)
+        assert data['games'][game_ids[0]]['game_id'] == game_ids[0]
+        assert data['missing'] == ['missing']
+    
+    def test_invalid_requests(self, app, client):
+        """Test validation of the ID list"""
+        assert client.post('/api/game/states', json={}).status_code == 400
+        assert client.post('/api/game/states', json={'game_ids': [1, 2]}).status_code == 400
+        
+        app.config['GAME_STATES_MAX_IDS'] = 2
+        response = client.post('/api/game/states', json={'game_ids': ['a', 'b', 'c']})
+        assert response.status_code == 400
@@ -0,0 +1,177 @@
+"""
+Tests for classrooms and the teacher dashboard stream
+"""
+import pytest
+from services.classroom_service import ClassroomService, classroom_topic
+from services.event_bus import EventBus
+
+
+def game_snapshot(game_id, **fields):
+    game = {'game_id': game_id, 'blue_score': 0, 'red_score': 0, 'max_score': 3,
+            'player_action_count': 0, 'max_player_actions': 100,
+            'is_game_over': False, 'game_over_reason': None}
+    game.update(fields)
+    return game
+
+
+@pytest.mark.unit
+class TestClassroomService:
+    """Test aggregation of game events into classroom deltas"""
+    
+    @pytest.fixture
+    def bus(self):
+        return EventBus()
+    
+    @pytest.fixture
+    def service(self, bus):
+        service = ClassroomService(bus)
+        yield service
+        service.close()
+    
+    def test_deltas_and_totals(self, bus, service):
+        """Test that game events become one delta with changed fields only"""
+        classroom = service.create_classroom('5A')
+        watcher = bus.subscribe(classroom_topic(classroom.classroom_id))
+        assert service.add_game(classroom.classroom_id, game_snapshot('g1'))
+        assert watcher.get(0)['totals'] == {'games': 1, 'finished': 0, 'goals': 0, 'actions': 0}
+        
+        bus.publish('game:g1', {'type': 'action', 'game': game_snapshot('g1', player_action_count=1)})
+        bus.publish('game:g1', {'type': 'score', 'game': game_snapshot('g1', player_action_count=1,
+                                                                       blue_score=1)})
+        first, second = watcher.get(0), watcher.get(0)
+        assert first['changes'] == {'player_action_count': 1}
+        assert second['changes'] == {'blue_score': 1}
+        assert second['totals'] == {'games': 1, 'finished': 0, 'goals': 1, 'actions': 1}
+        
+        # Unchanged summaries and other games publish nothing
+        bus.publish('game:g1', {'type': 'state', 'game': game_snapshot('g1', player_action_count=1,
+                                                                       blue_score=1)})
+        bus.publish('game:other', {'type': 'state', 'game': game_snapshot('other', red_score=2)})
+        assert watcher.get(0) is None
+        
+        snapshot = service.get_snapshot(classroom.classroom_id)
+        assert snapshot['games']['g1']['blue_score'] == 1
+        assert snapshot['name'] == '5A'
+    
+    def test_game_in_one_classroom(self, service):
+        """Test that a game cannot be counted twice"""
+        first = service.create_classroom('A')
+        second = service.create_classroom('B')
+        assert service.add_game(first.classroom_id, game_snapshot('g1'))
+        assert service.add_game(first.classroom_id, game_snapshot('g1'))
+        with pytest.raises(ValueError):
+            service.add_game(second.classroom_id, game_snapshot('g1'))
+        assert service.get_snapshot(first.classroom_id)['totals']['games'] == 1
+        assert not service.add_game('missing', game_snapshot('g2'))
+    
+    def test_classroom_full(self, bus):
+        """Test the per-classroom game limit"""
+        service = ClassroomService(bus, max_games_per_classroom=1)
+        classroom = service.create_classroom('A')
+        assert service.add_game(classroom.classroom_id, game_snapshot('g1'))
+        assert not service.add_game(classroom.classroom_id, game_snapshot('g2'))
+        service.close()
+    
+    def test_classroom_limit_and_expiry(self, bus, monkeypatch):
+        """Test the classroom cap and that idle classrooms are dropped"""
+        import services.classroom_service as classroom_service
+        clock = [1000.0]
+        monkeypatch.setattr(classroom_service.time, 'monotonic', lambda: clock[0])
+        
+        service = ClassroomService(bus, max_classrooms=1, idle_timeout=60)
+        first = service.create_classroom('A')
+        assert service.add_game(first.classroom_id, game_snapshot('g1'))
+        assert service.create_classroom('B') is None
+        
+        clock[0] += 61
+        second = service.create_classroom('B')
+        assert second is not None
+        assert service.get_snapshot(first.classroom_id) is None
+        # The expired classroom's game can join another one
+        assert service.add_game(second.classroom_id, game_snapshot('g1'))
+        service.close()
+    
+    def test_finished_and_removed_games_stop_routing(self, bus, service):
+        """Test that ended or removed games leave the event routing but keep their summary"""
+        classroom = service.create_classroom('A')
+        service.add_game(classroom.classroom_id, game_snapshot('g1'))
+        service.add_game(classroom.classroom_id, game_snapshot('g2'))
+        service.add_game(classroom.classroom_id, game_snapshot('g3', is_game_over=True))
+        
+        bus.publish('game:g1', {'type': 'score', 'game': game_snapshot('g1', red_score=3,
+                                                                       is_game_over=True)})
+        bus.publish('game:g2', {'type': 'removed', 'game': None})
+        assert service._classroom_of_game == {}
+        
+        snapshot = service.get_snapshot(classroom.classroom_id)
+        assert snapshot['games']['g1']['red_score'] == 3
+        assert snapshot['totals'] == {'games': 3, 'finished': 2, 'goals': 3, 'actions': 0}
+
+
+@pytest.mark.integration
+class TestClassroomRoutes:
+    """Test the classroom API and dashboard stream"""
+    
+    def test_dashboard_stream(self, client, read_events):
+        """Test that one game update reaches every watcher once"""
+        from services.event_bus import get_event_bus
+        classroom_id = client.post('/api/classrooms', json={'name': '5A'}).get_json()['classroom_id']
+        game_id = client.post('/api/game/start', json={'classroom_id': classroom_id}).get_json()['game_id']
+        
+        watchers = [client.get(f'/api/classrooms/{classroom_id}/stream', buffered=False)
+                    for _ in range(2)]
+        streams = [iter(watcher.response) for watcher in watchers]
+        for stream in streams:
+            [(name, snapshot)] = read_events(stream, 1)
+            assert name == 'snapshot'
+            assert list(snapshot['games']) == [game_id]
+        
+        published = get_event_bus().published
+        client.post('/api/game/score', json={'game_id': game_id, 'team': 'red'})
+        # One game event and one classroom delta, whatever the number of watchers
+        assert get_event_bus().published == published + 2
+        for stream in streams:
+            [(name, update)] = read_events(stream, 1)
+            assert name == 'update'
+            assert update['game_id'] == game_id
+            assert update['changes'] == {'red_score': 1}
+            assert update['totals']['goals'] == 1
+        
+        for watcher in watchers:
+            watcher.close()
+    
+    def test_add_existing_game(self, client):
+        """Test joining a running game and reading the classroom"""
+        classroom_id = client.post('/api/classrooms', json={}).get_json()['classroom_id']
+        game_id = client.post('/api/game/start', json={}).get_json()['game_id']
+        
+        response = client.post(f'/api/classrooms/{classroom_id}/games', json={'game_id': game_id})
+        assert response.status_code == 200
+        data = client.get(f'/api/classrooms/{classroom_id}').get_json()
+        assert data['classroom']['totals']['games'] == 1
+        
+        other_id = client.post('/api/classrooms', json={}).get_json()['classroom_id']
+        assert client.post(f'/api/classrooms/{other_id}/games',
+                           json={'game_id': game_id}).status_code == 409
+        assert client.post(f'/api/classrooms/{classroom_id}/games',
+                           json={'game_id': 'missing'}).status_code == 404
+    
+    def test_unknown_classroom(self, client):
+        """Test 404s for classrooms that do not exist"""
+        assert client.get('/api/classrooms/missing').status_code == 404
+        assert client.get('/api/classrooms/missing/stream').status_code == 404
+        assert client.post('/api/game/start', json={'classroom_id': 'missing'}).status_code == 404
+    
+    def test_start_game_validates_classroom_first(self, client):
+        """Test that a rejected classroom_id does not leave a game behind"""
+        from services.game_service import get_game_service
+        created = get_game_service().get_store_stats()['created']
+        assert client.post('/api/game/start', json={'classroom_id': 'missing'}).status_code == 404
+        assert client.post('/api/game/start', json={'classroom_id': ['x']}).status_code == 400
+        assert get_game_service().get_store_stats()['created'] == created
+    
+    def test_classroom_limit(self, client):
+        """Test 503 once the classroom cap is reached"""
+        from services.classroom_service import get_classroom_service
+        get_classroom_service().max_classrooms = 0
+        assert client.post('/api/classrooms', json={}).status_code == 503
@@ -0,0 +1,114 @@
+"""
+Tests for response compression
+"""
+import gzip
+import pytest
+from services import compression
+from services.compression import negotiate
+
+
+@pytest.mark.unit
+class TestNegotiation:
+    """Test Accept-Encoding negotiation"""
+    
+    def test_negotiate(self):
+        """Test that the highest accepted quality wins, ties by preference"""
+        assert negotiate('gzip, deflate, br', ('br', 'gzip')) == 'br'
+        assert negotiate('br;q=0.5, gzip', ('br', 'gzip')) == 'gzip'
+        assert negotiate('gzip;q=0', ('gzip',)) is None
+        assert negotiate('*', ('gzip',)) == 'gzip'
+        assert negotiate('identity', ('br', 'gzip')) is None
+        assert negotiate('', ('gzip',)) is None
+        assert negotiate('gzip;q=bad', ('gzip',)) is None
+    
+    def test_available_without_brotli(self, monkeypatch):
+        """Test that gzip is always offered"""
+        monkeypatch.setattr(compression, 'brotli', None)
+        assert compression.available_encodings() == ('gzip',)
+
+
+@pytest.fixture
+def large_route(app):
+    """Register a route returning a large JSON document"""
+    @app.route('/test/large')
+    def large():
+        return {'words': ['Τέρμα'] * 400}
+    return '/test/large'
+
+
+@pytest.mark.integration
+class TestCompressionMiddleware:
+    """Test the response compression hook"""
+    
+    def test_gzip_large_response(self, client, large_route):
+        """Test that large responses are compressed when accepted"""
+        plain = client.get(large_route)
+        assert 'Content-Encoding' not in plain.headers
+        assert 'Accept-Encoding' in plain.headers['Vary']
+        
+        response = client.get(large_route, headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert len(response.data) < len(plain.data)
+        assert gzip.decompress(response.data) == plain.data
+    
+    def test_brotli(self, client, large_route):
+        """Test that brotli is preferred when installed and accepted"""
+        brotli = pytest.importorskip('brotli')
+        response = client.get(large_route, headers={'Accept-Encoding': 'gzip, br'})
+        assert response.headers['Content-Encoding'] == 'br'
+        assert brotli.decompress(response.data).startswith(b'{"words":')
+    
+    def test_small_response_untouched(self, client):
+        """Test that bodies under the threshold are sent as they are"""
+        response = client.get('/api/health', headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in response.headers
+        assert response.get_json() == {'status': 'ok'}
+    
+    def test_disabled(self, app, client, large_route):
+        """Test that COMPRESSION_ENABLED turns the hook off"""
+        app.config['COMPRESSION_ENABLED'] = False
+        response = client.get(large_route, headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in response.headers
+
+
+@pytest.mark.integration
+class TestQuestionBatch:
+    """Test GET /api/questions/batch/<category>"""
+    
+    def test_batch(self, client, question_db):
+        """Test that a batch holds every question of the category"""
+        data = client.get('/api/questions/batch/math_1?language=el').get_json()
+        assert data['category'] == 'math_1'
+        assert [q['id'] for q in data['questions']] == [1, 2]
+        for question in data['questions']:
+            assert question['question'].startswith('Πόσο κάνει')
+        
+        assert client.get('/api/questions/batch/history_1').status_code == 404
+        assert client.get('/api/questions/batch/math_1?language=fr').status_code == 400
+    
+    def test_batch_cached_until_bank_changes(self, client, question_db):
+        """Test that the batch keeps its ETag and answer order until the bank reloads"""
+        from services.question_service import get_question_service
+        first = client.get('/api/questions/batch/math_1')
+        etag = first.headers['ETag']
+        assert client.get('/api/questions/batch/math_1').data == first.data
+        assert client.get('/api/questions/batch/math_1',
+                          headers={'If-None-Match': etag}).status_code == 304
+        
+        question_db.execute_update(
+            "INSERT INTO questions (category, question_en, answers, correct_answer_index) "
+            "VALUES ('math_1', 'What is 1 + 1?', '[\"2\", \"3\"]', 0)"
+        )
+        get_question_service().load_bank()
+        response = client.get('/api/questions/batch/math_1', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert len(response.get_json()['questions']) == 3
+    
+    def test_removed_category_is_not_served(self, client, question_db):
+        """Test that a category that left the bank gets 404 after a reload"""
+        from services.question_service import get_question_service
+        assert client.get('/api/questions/batch/geography_1').status_code == 200
+        
+        question_db.execute_update("DELETE FROM questions WHERE category = 'geography_1'")
+        get_question_service().load_bank()
+        assert client.get('/api/questions/batch/geography_1').status_code == 404
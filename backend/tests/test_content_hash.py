@@ -0,0 +1,118 @@
+"""
+Tests for question content hashes and duplicate-free imports
+"""
+import json
+import sqlite3
+import pytest
+from database.db import Database
+from database.questions import (content_hash, insert_questions, json_question_rows,
+                                migrate_content_hash, question_row)
+
+LEGACY_SCHEMA = """
+    CREATE TABLE questions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        category TEXT NOT NULL,
+        question_en TEXT NOT NULL,
+        question_el TEXT,
+        question_de TEXT,
+        answers TEXT NOT NULL,
+        correct_answer_index INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+@pytest.fixture
+def db(temp_db):
+    """Database with the current schema"""
+    from database.db import init_database, reset_db
+    reset_db(temp_db)
+    init_database()
+    yield Database(temp_db)
+    reset_db()
+
+
+@pytest.mark.unit
+class TestContentHash:
+    """Test content hashing and bulk inserts"""
+    
+    def test_normalization(self):
+        """Test that formatting differences hash the same"""
+        base = content_hash('math_1', 'What is 2 + 2?', None, '', ['3', '4'], 1)
+        assert content_hash('math_1', '  what is 2  +  2? ', '', None, ['4', '3'], 0) == base
+        assert content_hash('math_2', 'What is 2 + 2?', None, '', ['3', '4'], 1) != base
+        assert content_hash('math_1', 'What is 2 + 2?', None, '', ['3', '5'], 1) != base
+        assert content_hash('math_1', 'What is 2 + 2?', None, '', ['3', '4'], 0) != base
+    
+    @pytest.mark.parametrize('answers,index', [([], 0), (['3', '4'], 2), (['3', '4'], -1),
+                                               (['3', '4'], '1'), ('34', 0)])
+    def test_invalid_correct_answer(self, answers, index):
+        """Test that an index that is not a position in answers is rejected"""
+        with pytest.raises(ValueError):
+            content_hash('math_1', 'What is 2 + 2?', None, None, answers, index)
+    
+    def test_insert_skips_duplicates(self, db):
+        """Test that duplicates in a batch and already stored are skipped"""
+        rows = [
+            question_row('math_1', {'en': 'What is 2 + 2?'}, ['3', '4'], 1),
+            question_row('math_1', {'en': 'what is 2 + 2? '}, ['4', '3'], 0),
+            question_row('math_1', {'en': 'What is 3 + 3?'}, ['6', '7'], 0),
+        ]
+        assert insert_questions(db, rows) == 2
+        assert insert_questions(db, rows) == 0
+        assert db.execute_one("SELECT COUNT(*) AS count FROM questions")['count'] == 2
+        assert insert_questions(db, []) == 0
+    
+    def test_different_correct_answers_are_kept(self, db):
+        """Test that questions differing only in their correct answer are both stored"""
+        rows = [
+            question_row('math_1', {'en': 'Which is prime?'}, ['4', '5'], 1),
+            question_row('math_1', {'en': 'Which is prime?'}, ['4', '5'], 0),
+        ]
+        assert insert_questions(db, rows) == 2
+    
+    def test_json_rows_skip_invalid_questions(self):
+        """Test that questions with a bad correct_answer are left out of an import"""
+        rows = json_question_rows('math_1', [
+            {'question': {'en': 'What is 2 + 2?'}, 'answers': ['3', '4'], 'correct_answer': 1},
+            {'question': {'en': 'What is 3 + 3?'}, 'answers': ['6', '7'], 'correct_answer': 5},
+        ])
+        assert [row[1] for row in rows] == ['What is 2 + 2?']
+    
+    def test_migrates_legacy_database(self, temp_db):
+        """Test that an existing table gets hashes and loses its duplicates"""
+        conn = sqlite3.connect(temp_db)
+        conn.execute(LEGACY_SCHEMA)
+        rows = [('math_1', 'What is 2 + 2?', json.dumps(['3', '4']), 1),
+                ('math_1', 'What is 3 + 3?', json.dumps(['6', '7']), 0),
+                ('math_1', 'What is 2 + 2?', json.dumps(['4', '3']), 0),
+                ('math_1', 'What is 2 + 2?', json.dumps(['4', '3']), 1)]
+        conn.executemany("INSERT INTO questions (category, question_en, answers, correct_answer_index) "
+                         "VALUES (?, ?, ?, ?)", rows)
+        
+        assert migrate_content_hash(conn) == 1
+        assert migrate_content_hash(conn) == 0
+        conn.commit()
+        assert [row[0] for row in conn.execute("SELECT id FROM questions ORDER BY id")] == [1, 2, 4]
+        assert conn.execute("SELECT COUNT(*) FROM questions WHERE content_hash IS NULL").fetchone()[0] == 0
+        conn.close()
+    
+    def test_migration_skips_malformed_rows(self, temp_db, caplog):
+        """Test that rows that cannot be hashed are kept, unhashed, and logged"""
+        conn = sqlite3.connect(temp_db)
+        conn.execute(LEGACY_SCHEMA)
+        rows = [('What is 2 + 2?', json.dumps(['3', '4']), 1),
+                ('Broken index', json.dumps(['a', 'b']), 5),
+                ('Broken answers', 'not json', 0),
+                ('What is 2 + 2?', json.dumps(['4', '3']), 0)]
+        conn.executemany("INSERT INTO questions (category, question_en, answers, correct_answer_index) "
+                         "VALUES ('math_1', ?, ?, ?)", rows)
+        
+        assert migrate_content_hash(conn) == 1
+        assert migrate_content_hash(conn) == 0
+        assert [row[0] for row in conn.execute(
+            "SELECT id FROM questions WHERE content_hash IS NULL ORDER BY id")] == [2, 3]
+        assert conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0] == 3
+        assert 'Question 2' in caplog.text
+        conn.close()
@@ -0,0 +1,81 @@
+"""
+Tests for database deadlines
+"""
+import sqlite3
+import time
+import pytest
+from database.deadline import DeadlineExceeded, deadline, deadline_hits, expires_at
+
+
+@pytest.mark.unit
+class TestDeadline:
+    """Test deadline propagation into Database"""
+    
+    def test_nested_deadline_never_extends(self):
+        """Test that an inner deadline cannot outlive the outer one"""
+        assert expires_at() is None
+        with deadline(0.5):
+            outer = expires_at()
+            with deadline(60):
+                assert expires_at() == outer
+            with deadline(0.1):
+                assert expires_at() < outer
+        assert expires_at() is None
+    
+    def test_expired_deadline_fails_fast(self, question_db):
+        """Test that work starting after the deadline is refused and counted"""
+        hits = deadline_hits()
+        with deadline(-1):
+            with pytest.raises(DeadlineExceeded):
+                question_db.execute('SELECT * FROM questions')
+        assert deadline_hits() == hits + 1
+    
+    def test_long_query_interrupted(self, question_db):
+        """Test that the progress handler aborts a statement past its deadline"""
+        query = """
+            WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 100000000)
+            SELECT COUNT(*) AS count FROM n
+        """
+        started = time.monotonic()
+        with deadline(0.05):
+            with pytest.raises(DeadlineExceeded, match='interrupted'):
+                question_db.execute_one(query)
+        assert time.monotonic() - started < 1.0
+    
+    def test_lock_wait_bounded(self, question_db):
+        """Test that waiting on a locked database stops at the deadline"""
+        holder = sqlite3.connect(question_db.db_path)
+        holder.execute('BEGIN EXCLUSIVE')
+        try:
+            started = time.monotonic()
+            with deadline(0.1):
+                with pytest.raises(DeadlineExceeded, match='locked'):
+                    question_db.execute('SELECT * FROM questions')
+            assert time.monotonic() - started < 1.0
+        finally:
+            holder.rollback()
+            holder.close()
+    
+    def test_no_deadline_unchanged(self, question_db):
+        """Test that queries without a deadline run normally"""
+        assert question_db.execute_one('SELECT COUNT(*) AS count FROM questions')['count'] == 3
+
+
+@pytest.mark.integration
+class TestRouteDeadline:
+    """Test deadline handling in the question routes"""
+    
+    def test_deadline_returns_503(self, client, monkeypatch):
+        """Test that a route past its deadline answers 503"""
+        from database.deadline import deadline_exceeded
+        from services.question_service import get_question_service
+        client.get('/api/health')
+        
+        def busy():
+            raise deadline_exceeded()
+        monkeypatch.setattr(get_question_service(), 'get_categories', busy)
+        
+        response = client.get('/api/questions/categories')
+        assert response.status_code == 503
+        assert response.get_json()['success'] is False
+        assert 'smartkick_db_deadline_exceeded_total' in client.get('/api/metrics').get_data(as_text=True)
@@ -0,0 +1,163 @@
+"""
+Tests for the event bus and game event streams
+"""
+import json
+import threading
+import pytest
+from services.event_bus import EventBus
+
+
+@pytest.mark.unit
+class TestEventBus:
+    """Test publish/subscribe fan-out"""
+    
+    def test_fan_out(self):
+        """Test that every subscription of a topic gets the event once"""
+        bus = EventBus()
+        first, second = bus.subscribe('game:a'), bus.subscribe('game:a', 'game:b')
+        other = bus.subscribe('game:c')
+        
+        assert bus.publish('game:a', {'n': 1}) == 2
+        assert bus.publish('game:b', {'n': 2}) == 1
+        assert first.get(0) == {'n': 1}
+        assert first.get(0) is None
+        assert [second.get(0), second.get(0)] == [{'n': 1}, {'n': 2}]
+        assert other.get(0) is None
+        assert bus.subscriber_count() == 3
+    
+    def test_slow_subscriber_drops_oldest(self):
+        """Test that a full queue keeps the newest events"""
+        bus = EventBus()
+        subscription = bus.subscribe('t', max_pending=2)
+        for n in range(5):
+            bus.publish('t', n)
+        assert subscription.dropped == 3
+        assert [subscription.get(0), subscription.get(0)] == [3, 4]
+    
+    def test_close(self):
+        """Test that closing unsubscribes and wakes a waiting consumer"""
+        bus = EventBus()
+        subscription = bus.subscribe('t')
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(subscription.get(10)))
+        waiter.start()
+        subscription.close()
+        waiter.join(2)
+        
+        assert results == [None]
+        assert bus.publish('t', 1) == 0
+        assert bus.subscriber_count() == 0
+        subscription.close()
+    
+    def test_listener(self):
+        """Test that listeners see every topic"""
+        bus = EventBus()
+        seen = []
+        bus.add_listener(lambda topic, event: seen.append((topic, event)))
+        bus.publish('a', 1)
+        bus.publish('b', 2)
+        assert seen == [('a', 1), ('b', 2)]
+
+
+@pytest.mark.integration
+class TestGameEvents:
+    """Test /api/game/events and /api/game/message"""
+    
+    @pytest.fixture
+    def game_id(self, client):
+        return client.post('/api/game/start', json={'duration': 'tiny'}).get_json()['game_id']
+    
+    def test_stream_actions_and_questions(self, client, question_db, game_id, read_events):
+        """Test that messages are answered over the stream with the next question"""
+        response = client.get(f'/api/game/events/{game_id}?category=math_1&language=el',
+                              buffered=False)
+        assert response.mimetype == 'text/event-stream'
+        chunks = iter(response.response)
+        
+        (state_name, state), (question_name, question) = read_events(chunks, 2)
+        assert state_name == 'state' and state['game']['player_action_count'] == 0
+        assert question_name == 'question'
+        assert question['question']['category'] == 'math_1'
+        
+        reply = client.post(f'/api/game/message/{game_id}',
+                            data=json.dumps({'type': 'action', 'action': 'pass', 'question_correct': True}),
+                            content_type='text/plain')
+        assert reply.status_code == 204
+        (action_name, action), (next_name, _) = read_events(chunks, 2)
+        assert action_name == 'action'
+        assert action['action'] == 'pass'
+        assert isinstance(action['action_success'], bool)
+        assert action['game']['player_action_count'] == 1
+        assert next_name == 'question'
+        
+        client.post(f'/api/game/message/{game_id}', data='{"type": "score", "team": "blue"}',
+                    content_type='text/plain')
+        [(score_name, score)] = read_events(chunks, 1)
+        assert score_name == 'score'
+        assert score['game']['blue_score'] == 1
+        response.close()
+    
+    def test_rest_actions_are_streamed(self, client, game_id, read_events):
+        """Test that REST mutations reach stream subscribers too"""
+        from services.event_bus import get_event_bus
+        response = client.get(f'/api/game/events/{game_id}', buffered=False)
+        chunks = iter(response.response)
+        read_events(chunks, 1)
+        assert get_event_bus().subscriber_count() == 1
+        
+        client.post('/api/game/action', json={'game_id': game_id, 'action': 'dribble'})
+        [(name, event)] = read_events(chunks, 1)
+        assert name == 'action' and event['action_success'] is False
+        
+        response.close()
+        assert get_event_bus().subscriber_count() == 0
+    
+    def test_stream_ends_with_game(self, client, game_id, read_events):
+        """Test that the stream sends 'end' and finishes when the game is over"""
+        from services.game_service import get_game_service
+        response = client.get(f'/api/game/events/{game_id}', buffered=False)
+        chunks = iter(response.response)
+        read_events(chunks, 1)
+        
+        get_game_service().update_score(game_id, 'red', 100)
+        names = [name for name, _ in read_events(chunks, 2)]
+        assert names == ['score', 'end']
+        with pytest.raises(StopIteration):
+            next(chunks)
+        response.close()
+    
+    def test_stream_ends_when_game_removed(self, client, game_id, read_events):
+        """Test that the stream sends 'end' when the game leaves the store"""
+        from services.game_service import get_game_service
+        response = client.get(f'/api/game/events/{game_id}', buffered=False)
+        chunks = iter(response.response)
+        read_events(chunks, 1)
+        
+        assert get_game_service().delete_game(game_id)
+        [(name, event)] = read_events(chunks, 1)
+        assert (name, event['reason']) == ('end', 'removed')
+        with pytest.raises(StopIteration):
+            next(chunks)
+        response.close()
+    
+    def test_message_errors(self, client, game_id):
+        """Test malformed messages and unknown games"""
+        assert client.post(f'/api/game/message/{game_id}', data='nonsense',
+                           content_type='text/plain').status_code == 400
+        assert client.post(f'/api/game/message/{game_id}', data='{"type": "jump"}',
+                           content_type='text/plain').status_code == 400
+        assert client.post('/api/game/message/missing', data='{"type": "score", "team": "red"}',
+                           content_type='text/plain').status_code == 404
+        assert client.post(f'/api/game/message/{game_id}', data='{"type": "score", "team": "green"}',
+                           content_type='text/plain').status_code == 400
+        assert client.post(f'/api/game/message/{game_id}',
+                           data='{"type": "score", "team": "red", "points": "2"}',
+                           content_type='text/plain').status_code == 400
+        assert client.get('/api/game/events/missing').status_code == 404
+    
+    def test_stream_limit(self, app, client, game_id):
+        """Test that streams over EVENT_STREAMS_MAX get 503"""
+        app.config['EVENT_STREAMS_MAX'] = 0
+        response = client.get(f'/api/game/events/{game_id}')
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '5'
@@ -67,3 +67,108 @@ class TestGameService:
         # Goalkeeper should have reasonable chance (not too easy, not too hard)
         assert 0.3 <= save_probability <= 0.7
 
+
+
+@pytest.mark.unit
+class TestGameServiceConcurrency:
+    """Test that concurrent game updates are not lost"""
+    
+    THREADS = 32
+    ACTIONS_PER_THREAD = 250
+    
+    @pytest.fixture
+    def game_service(self):
+        from services.game_service import GameService
+        return GameService()
+    
+    @pytest.fixture(autouse=True)
+    def fast_switching(self, monkeypatch):
+        """Switch threads as often as possible, including mid-action, to expose races"""
+        import sys
+        import time
+        from services.game_service import GameState
+        adjust_probability = GameState.adjust_probability
+        
+        def yielding_adjust_probability(game_state, action, correct):
+            time.sleep(0)
+            adjust_probability(game_state, action, correct)
+        
+        monkeypatch.setattr(GameState, 'adjust_probability', yielding_adjust_probability)
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        yield
+        sys.setswitchinterval(interval)
+    
+    def _run_threads(self, target):
+        import threading
+        barrier = threading.Barrier(self.THREADS)
+        
+        def worker(index):
+            barrier.wait()
+            for i in range(self.ACTIONS_PER_THREAD):
+                target(index, i)
+        
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    
+    def test_concurrent_actions_and_scores_are_counted_exactly(self, game_service):
+        """Test that parallel perform_action and update_score calls never lose an update"""
+        total = self.THREADS * self.ACTIONS_PER_THREAD
+        game = game_service.create_game()
+        game_service.update_game(game.game_id, max_actions=total + 1,
+                                 max_player_actions=total + 1, max_score=total + 1)
+        actions = ('pass', 'dribble', 'shoot', 'tackle')
+        
+        def play(index, i):
+            result = game_service.perform_action(game.game_id, actions[i % 4], i % 2 == 0)
+            assert result['success']
+            game_service.update_score(game.game_id, 'blue' if index % 2 else 'red')
+        
+        self._run_threads(play)
+        
+        snapshot = game_service.get_game_snapshot(game.game_id)
+        assert snapshot['player_action_count'] == total
+        assert snapshot['total_action_count'] == total
+        assert snapshot['blue_score'] == total // 2
+        assert snapshot['red_score'] == total // 2
+        assert snapshot['is_game_over'] is False
+        # Temporary probability adjustments never leak between actions
+        assert all(value is None for value in game_service.get_game(game.game_id)
+                   .current_probabilities['player'].values())
+    
+    def test_concurrent_actions_stop_exactly_at_game_over(self, game_service):
+        """Test that racing actions cannot exceed the action limit"""
+        limit = self.THREADS * self.ACTIONS_PER_THREAD // 2
+        game = game_service.create_game()
+        game_service.update_game(game.game_id, max_actions=limit, max_player_actions=limit + 1)
+        accepted = []
+        
+        def act(index, i):
+            if game_service.perform_action(game.game_id, 'pass', True)['success']:
+                accepted.append(1)
+        
+        self._run_threads(act)
+        
+        snapshot = game_service.get_game_snapshot(game.game_id)
+        assert len(accepted) == limit
+        assert snapshot['total_action_count'] == limit
+        assert snapshot['is_game_over'] is True
+    
+    def test_snapshot_is_published_after_update(self, game_service):
+        """Test that lock-free snapshots reflect the latest mutation"""
+        game = game_service.create_game()
+        assert game_service.get_game_snapshot(game.game_id)['blue_score'] == 0
+        
+        with game_service.locked_game(game.game_id) as locked:
+            locked.update_score('blue')
+        
+        assert game_service.get_game_snapshot(game.game_id)['blue_score'] == 1
+        assert game_service.get_game_snapshot('missing') is None
+    
+    def test_locked_game_yields_none_for_unknown_id(self, game_service):
+        """Test that locking an unknown game yields None"""
+        with game_service.locked_game('missing') as locked:
+            assert locked is None
@@ -0,0 +1,98 @@
+"""
+Tests for the sharded game store
+"""
+import pytest
+from services.game_store import GameStore
+
+
+@pytest.mark.unit
+class TestGameStore:
+    """Test sharding, eviction and statistics of the game store"""
+    
+    def test_games_are_spread_across_shards(self):
+        """Test that games are partitioned by game ID hash"""
+        store = GameStore(shard_count=8)
+        for i in range(400):
+            store.add(f'game-{i}', object(), {'game_id': f'game-{i}'})
+        
+        stats = store.stats()
+        assert stats['shards'] == 8
+        assert stats['live'] == 400
+        assert all(shard['live'] > 0 for shard in stats['per_shard'])
+    
+    def test_same_game_always_maps_to_same_shard(self):
+        """Test that shard ownership is stable"""
+        store = GameStore(shard_count=8)
+        assert store.shard_for('abc') is store.shard_for('abc')
+    
+    def test_capacity_evicts_least_recently_touched(self):
+        """Test that a full shard evicts its least recently used game"""
+        store = GameStore(shard_count=1, max_games_per_shard=2)
+        store.add('a', 'game-a', {})
+        store.add('b', 'game-b', {})
+        with store.locked('a'):
+            pass
+        store.add('c', 'game-c', {})
+        
+        assert store.get('a') == 'game-a'
+        assert store.get('b') is None
+        assert store.get_snapshot('b') is None
+        assert store.stats()['evicted'] == 1
+    
+    def test_idle_games_are_evicted(self, monkeypatch):
+        """Test that games untouched past the idle timeout are evicted"""
+        import services.game_store as game_store
+        clock = [1000.0]
+        monkeypatch.setattr(game_store.time, 'monotonic', lambda: clock[0])
+        
+        store = GameStore(shard_count=1, idle_timeout=60)
+        store.add('old', 'game-old', {})
+        clock[0] += 61
+        store.add('new', 'game-new', {})
+        
+        assert store.get('old') is None
+        assert store.get('new') == 'game-new'
+    
+    def test_removed_games_are_reported(self):
+        """Test that eviction and remove() both call on_remove"""
+        removed = []
+        store = GameStore(shard_count=1, max_games_per_shard=1, on_remove=removed.append)
+        store.add('a', 'game-a', {})
+        store.add('b', 'game-b', {})
+        assert store.remove('b')
+        assert not store.remove('b')
+        
+        assert removed == ['a', 'b']
+        assert store.get_snapshot('b') is None
+        assert store.stats()['evicted'] == 1
+    
+    def test_lookup_statistics(self):
+        """Test that locked lookups record hits and misses"""
+        store = GameStore(shard_count=4)
+        store.add('a', 'game-a', {})
+        with store.locked('a') as game:
+            assert game == 'game-a'
+        with store.locked('missing') as game:
+            assert game is None
+        
+        stats = store.stats()
+        assert stats['lookups'] == 2
+        assert stats['misses'] == 1
+        assert stats['created'] == 1
+    
+    def test_publish_ignores_evicted_games(self):
+        """Test that a snapshot is not resurrected for an evicted game"""
+        store = GameStore(shard_count=1)
+        store.publish('gone', {'game_id': 'gone'})
+        assert store.get_snapshot('gone') is None
+    
+    def test_get_snapshots_skips_unknown_ids(self):
+        """Test bulk snapshot lookup across shards"""
+        store = GameStore(shard_count=4)
+        for game_id in ('a', 'b', 'c'):
+            store.add(game_id, f'game-{game_id}', {'game_id': game_id})
+        
+        snapshots = store.get_snapshots(['c', 'missing', 'a', 'c'])
+        assert set(snapshots) == {'c', 'a'}
+        assert snapshots['a'] == {'game_id': 'a'}
+        assert store.get_snapshots([]) == {}
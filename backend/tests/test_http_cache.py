@@ -0,0 +1,210 @@
+"""
+Tests for cached payloads and the translations endpoint
+"""
+import gzip
+import json
+import pytest
+from services.http_cache import CachedPayload, VersionedPayload, _etag_matches
+
+
+@pytest.mark.unit
+class TestCachedPayload:
+    """Test payload serialization and header parsing"""
+    
+    def test_small_body_not_compressed(self):
+        """Test that tiny bodies are served as they are"""
+        payload = CachedPayload.from_json({'a': 1})
+        assert payload.body == b'{"a":1}'
+        assert payload.encoded == {}
+        assert len(payload.etag) == 32
+    
+    def test_large_body_compressed(self):
+        """Test that large bodies get a stable gzip variant"""
+        data = {'words': ['Πάσα'] * 500}
+        payload = CachedPayload.from_json(data)
+        assert json.loads(gzip.decompress(payload.encoded['gzip'])) == data
+        assert CachedPayload.from_json(data).encoded == payload.encoded
+    
+    def test_etag_matches(self):
+        """Test If-None-Match parsing"""
+        assert _etag_matches('"abc"', 'abc')
+        assert _etag_matches('W/"abc-gzip"', 'abc')
+        assert _etag_matches('"x", "abc"', 'abc')
+        assert _etag_matches('*', 'abc')
+        assert not _etag_matches('"abd"', 'abc')
+    
+    def test_versioned_payload(self):
+        """Test that the payload is rebuilt only when the version changes"""
+        source = {'value': 1}
+        payload = VersionedPayload(lambda: dict(source))
+        first = payload.get(1)
+        assert payload.get(1) is first
+        assert payload.builds == 1
+        
+        source['value'] = 2
+        assert json.loads(payload.get(2).body) == {'value': 2}
+        assert payload.builds == 2
+    
+    def test_versioned_payload_formats(self):
+        """Test that each format is serialized once from one build"""
+        msgpack = pytest.importorskip('msgpack')
+        payload = VersionedPayload(lambda: {'value': 1})
+        packed = payload.get(1, 'application/msgpack')
+        assert packed.content_type == 'application/msgpack'
+        assert msgpack.unpackb(packed.body) == {'value': 1}
+        assert payload.get(1, 'application/msgpack') is packed
+        assert payload.get(1).content_type == 'application/json'
+        assert payload.builds == 1
+
+
+@pytest.mark.integration
+class TestTranslationsEndpoint:
+    """Test GET /api/translations"""
+    
+    def test_full_document(self, client):
+        """Test that all languages are returned in the frontend's format"""
+        response = client.get('/api/translations')
+        assert response.status_code == 200
+        assert sorted(response.get_json()) == ['de', 'el', 'en']
+        assert response.headers['Cache-Control'] == 'public, max-age=300'
+        assert response.headers['ETag']
+    
+    def test_language_slice(self, client):
+        """Test that ?lang returns a single language"""
+        data = client.get('/api/translations?lang=el').get_json()
+        assert list(data) == ['el']
+        assert data['el']['ui']['pass'] == 'Πάσα'
+        
+        response = client.get('/api/translations?lang=fr')
+        assert response.status_code == 404
+        assert response.get_json()['success'] is False
+    
+    def test_not_modified(self, client):
+        """Test that a matching If-None-Match gets an empty 304"""
+        etag = client.get('/api/translations').headers['ETag']
+        response = client.get('/api/translations', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+        assert response.headers['ETag'] == etag
+        
+        other = client.get('/api/translations?lang=en', headers={'If-None-Match': etag})
+        assert other.status_code == 200
+    
+    def test_gzip(self, client):
+        """Test that clients accepting gzip get the precompressed body"""
+        plain = client.get('/api/translations')
+        response = client.get('/api/translations', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.vary
+        assert gzip.decompress(response.data) == plain.data
+        assert response.headers['ETag'] != plain.headers['ETag']
+        
+        revalidated = client.get('/api/translations', headers={
+            'Accept-Encoding': 'gzip', 'If-None-Match': response.headers['ETag']
+        })
+        assert revalidated.status_code == 304
+    
+    
+    def test_msgpack(self, client):
+        """Test that cached documents are negotiated like other responses"""
+        msgpack = pytest.importorskip('msgpack')
+        headers = {'Accept': 'application/msgpack'}
+        plain = client.get('/api/translations?lang=en')
+        packed = client.get('/api/translations?lang=en', headers=headers)
+        assert packed.mimetype == 'application/msgpack'
+        assert msgpack.unpackb(packed.data) == json.loads(plain.data)
+        assert packed.headers['ETag'] != plain.headers['ETag']
+        assert 'Accept' in packed.vary and 'Accept' in plain.vary
+        
+        config = client.get('/api/config', headers=headers)
+        assert msgpack.unpackb(config.data)['success'] is True
+        assert client.get('/api/config').mimetype == 'application/json'
+
+
+@pytest.mark.integration
+class TestVersionedEndpoints:
+    """Test conditional GET on config and question bank endpoints"""
+    
+    @pytest.fixture
+    def config_service(self, temp_config_dir, monkeypatch):
+        """Config service writing to a temporary file"""
+        from services import config_service
+        service = config_service.ConfigService(str(temp_config_dir / 'game_config.json'))
+        monkeypatch.setattr(config_service, '_config_service', service)
+        return service
+    
+    @pytest.mark.parametrize('path', ['/api/config', '/api/game/settings/duration'])
+    def test_config_endpoints(self, client, config_service, path):
+        """Test that config responses revalidate until the config changes"""
+        response = client.get(path)
+        assert response.status_code == 200
+        assert response.get_json()['success'] is True
+        assert response.headers['Cache-Control'] == 'no-cache'
+        etag = response.headers['ETag']
+        
+        assert client.get(path, headers={'If-None-Match': etag}).status_code == 304
+        
+        # Unrelated edits keep the representation and its ETag
+        config_service.set_variable('player', 'pass', 0.1)
+        assert client.get(path, headers={'If-None-Match': etag}).status_code == 304
+        
+        config = config_service.get_config()
+        config['probabilities']['player'] = {'pass': 0.9}
+        config['game_duration'] = {'default': 'short'}
+        with open(config_service.config_path, 'w', encoding='utf-8') as f:
+            json.dump(config, f)
+        config_service.reload()
+        response = client.get(path, headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+    
+    def test_config_file_edits_are_reloaded(self, client, config_service):
+        """Test that editing the config file is picked up and counted by the metrics"""
+        import os
+        config_service.check_interval = 0
+        etag = client.get('/api/config').headers['ETag']
+        config_service.set_variable('player', 'pass', 0.1)  # Our own writes are not reloads
+        assert client.get('/api/config').headers['ETag'] == etag
+        
+        config = config_service.get_config()
+        config['probabilities']['player'] = {'pass': 0.9}
+        with open(config_service.config_path, 'w', encoding='utf-8') as f:
+            json.dump(config, f)
+        stat = os.stat(config_service.config_path)
+        os.utime(config_service.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        
+        assert client.get('/api/config').headers['ETag'] != etag
+        assert config_service.reload_count == 1
+        assert 'smartkick_config_reloads_total 1' in client.get('/api/metrics').get_data(as_text=True)
+    
+    def test_config_version_changes(self, config_service):
+        """Test that every load and edit gets a new version"""
+        version = config_service.version
+        config_service.set_variable('player', 'pass', 0.1)
+        assert config_service.version > version
+        version = config_service.version
+        config_service.reload()
+        assert config_service.version > version
+    
+    def test_categories(self, client, question_db):
+        """Test that categories revalidate until the question bank changes"""
+        from services.question_service import get_question_service
+        response = client.get('/api/questions/categories')
+        assert response.get_json()['categories'] == ['geography_1', 'math_1']
+        etag = response.headers['ETag']
+        assert client.get('/api/questions/categories',
+                          headers={'If-None-Match': etag}).status_code == 304
+        
+        # Reloading identical questions keeps the same ETag
+        get_question_service().load_bank()
+        assert client.get('/api/questions/categories',
+                          headers={'If-None-Match': etag}).status_code == 304
+        
+        question_db.execute_update(
+            "INSERT INTO questions (category, question_en, answers, correct_answer_index) "
+            "VALUES ('history_1', 'Who?', '[\"A\", \"B\"]', 0)"
+        )
+        get_question_service().load_bank()
+        response = client.get('/api/questions/categories', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert 'history_1' in response.get_json()['categories']
@@ -0,0 +1,109 @@
+"""
+Tests for idempotency keys on game actions and goals
+"""
+import pytest
+from services.replay_cache import KeyReused, ReplayCache
+
+
+@pytest.mark.unit
+class TestReplayCache:
+    """Test the bounded, expiring result cache"""
+    
+    def test_replay_and_mismatch(self):
+        """Test that a key replays only for its own request"""
+        cache = ReplayCache()
+        cache.put('k', ('pass', True), {'success': True})
+        
+        assert cache.get('k', ('pass', True)) == {'success': True}
+        assert cache.get('other', ('pass', True)) is None
+        with pytest.raises(KeyReused):
+            cache.get('k', ('shoot', True))
+    
+    def test_size_limit(self):
+        """Test that the oldest results are evicted first"""
+        cache = ReplayCache(max_entries=2)
+        for key in ('a', 'b', 'c'):
+            cache.put(key, None, key)
+        
+        assert len(cache) == 2
+        assert cache.get('a', None) is None
+        assert cache.get('c', None) == 'c'
+    
+    def test_ttl(self, monkeypatch):
+        """Test that results expire"""
+        import services.replay_cache as replay_cache
+        now = [100.0]
+        monkeypatch.setattr(replay_cache.time, 'monotonic', lambda: now[0])
+        
+        cache = ReplayCache(ttl=10)
+        cache.put('k', None, 'result')
+        now[0] += 9
+        assert cache.get('k', None) == 'result'
+        now[0] += 2
+        assert cache.get('k', None) is None
+        assert len(cache) == 0
+
+
+@pytest.mark.integration
+class TestIdempotentRoutes:
+    """Test retried requests against the game API"""
+    
+    @pytest.fixture
+    def game_id(self, client):
+        return client.post('/api/game/start', json={}).get_json()['game_id']
+    
+    def test_retried_action_is_replayed(self, client, game_id):
+        """Test that a retried action returns the first result and acts once"""
+        headers = {'Idempotency-Key': 'attempt-1'}
+        body = {'game_id': game_id, 'action': 'pass', 'question_correct': True}
+        
+        first = client.post('/api/game/action', json=body, headers=headers)
+        retry = client.post('/api/game/action', json=body, headers=headers)
+        
+        assert first.status_code == retry.status_code == 200
+        assert retry.get_json() == first.get_json()
+        state = client.get(f'/api/game/state/{game_id}').get_json()['game']
+        assert state['player_action_count'] == 1
+        
+        # A new key is a new action
+        client.post('/api/game/action', json=body, headers={'Idempotency-Key': 'attempt-2'})
+        state = client.get(f'/api/game/state/{game_id}').get_json()['game']
+        assert state['player_action_count'] == 2
+    
+    def test_retried_goal_is_replayed(self, client, game_id):
+        """Test that a retried goal is counted once, over REST and messages"""
+        body = {'game_id': game_id, 'team': 'blue'}
+        for _ in range(3):
+            response = client.post('/api/game/score', json=body, headers={'Idempotency-Key': 'goal-1'})
+            assert response.get_json()['game']['blue_score'] == 1
+        
+        message = '{"type": "score", "team": "blue", "idempotency_key": "goal-2"}'
+        for _ in range(2):
+            response = client.post(f'/api/game/message/{game_id}', data=message,
+                                   content_type='text/plain')
+            assert response.status_code == 204
+        state = client.get(f'/api/game/state/{game_id}').get_json()['game']
+        assert state['blue_score'] == 2
+    
+    def test_key_reused_for_other_request(self, client, game_id):
+        """Test that a key cannot be replayed for a different request"""
+        headers = {'Idempotency-Key': 'same'}
+        client.post('/api/game/score', json={'game_id': game_id, 'team': 'blue'}, headers=headers)
+        
+        response = client.post('/api/game/score', json={'game_id': game_id, 'team': 'red'},
+                               headers=headers)
+        assert response.status_code == 422
+        
+        response = client.post('/api/game/action', json={'game_id': game_id, 'action': 'pass'},
+                               headers={'Idempotency-Key': 'x' * 256})
+        assert response.status_code == 400
+    
+    @pytest.mark.parametrize('body', [{'team': 'red', 'points': 'x'}, {'team': 'red', 'points': [1]},
+                                      {'team': 'red', 'points': True}, {'team': ['red']}])
+    def test_invalid_score_is_rejected(self, client, game_id, body):
+        """Test that malformed points and teams get 400 before reaching the game or replay cache"""
+        response = client.post('/api/game/score', json=dict(body, game_id=game_id),
+                               headers={'Idempotency-Key': 'bad-goal'})
+        assert response.status_code == 400
+        state = client.get(f'/api/game/state/{game_id}').get_json()['game']
+        assert state['red_score'] == 0
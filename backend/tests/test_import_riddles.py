@@ -0,0 +1,49 @@
+"""
+Tests for the riddle importer's JavaScript parser
+"""
+import io
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))), 'school_material', 'original'))
+
+from import_riddles import iter_js_riddles
+
+RIDDLES_JS = '''// Riddles
+import { shuffleArray } from '../utils/shuffle';
+/* "unbalanced { in a comment */
+export const riddles = [
+  { question: "What has keys but can't open locks?", options: shuffleArray(["A piano", "A map", " A door ", "A car"]), answer: "A piano", category: "english" },
+  {
+    question: "Ποια είναι η πρωτεύουσα της Ελλάδας;",
+    options: ["Αθήνα", "Πάτρα", "Θεσσαλονίκη", "Ηράκλειο"],
+    answer: "Αθήνα"
+  },
+  { question: "Too few options", options: shuffleArray(["a", "b"]), answer: "a" },
+  { question: "Say \\"{hi}\\"", options: shuffleArray(['x{', "y", "z", "w"]), answer: "y" },
+];
+'''
+
+
+@pytest.mark.unit
+class TestRiddleParser:
+    """Test the streaming riddle tokenizer"""
+    
+    def test_parses_riddles(self):
+        """Test that complete riddles are yielded in file order"""
+        riddles = list(iter_js_riddles(io.StringIO(RIDDLES_JS)))
+        
+        assert [r['answer'] for r in riddles] == ['A piano', 'Αθήνα', 'y']
+        assert riddles[0]['options'] == ['A piano', 'A map', 'A door', 'A car']
+        assert riddles[0]['question'] == "What has keys but can't open locks?"
+        # Braces and escaped quotes inside strings do not end the object
+        assert riddles[2]['question'] == 'Say "{hi}"'
+        assert riddles[2]['options'][0] == 'x{'
+    
+    @pytest.mark.parametrize('chunk_size', [1, 2, 5, 64])
+    def test_chunk_boundaries(self, chunk_size):
+        """Test that tokens split across reads are parsed the same"""
+        expected = list(iter_js_riddles(io.StringIO(RIDDLES_JS)))
+        assert list(iter_js_riddles(io.StringIO(RIDDLES_JS), chunk_size)) == expected
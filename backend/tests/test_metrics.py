@@ -0,0 +1,93 @@
+"""
+Tests for the metrics subsystem
+"""
+import pytest
+from services.metrics import CallbackMetric, Counter, Histogram, Metric, MetricsRegistry
+
+
+@pytest.mark.unit
+class TestMetrics:
+    """Test metric types and Prometheus rendering"""
+    
+    def test_counter_render(self):
+        """Test counter samples with labels"""
+        counter = Counter('test_total', 'Test counter', ('route',))
+        counter.inc('a')
+        counter.inc('a', amount=2)
+        counter.inc('b')
+        
+        assert counter.render().splitlines() == [
+            '# HELP test_total Test counter',
+            '# TYPE test_total counter',
+            'test_total{route="a"} 3',
+            'test_total{route="b"} 1'
+        ]
+    
+    def test_histogram_buckets_are_cumulative(self):
+        """Test histogram bucket counts, sum and count"""
+        histogram = Histogram('latency_seconds', 'Latency', ('route',), buckets=(0.1, 1.0))
+        histogram.observe(0.05, 'a')
+        histogram.observe(0.1, 'a')
+        histogram.observe(0.5, 'a')
+        histogram.observe(3.0, 'a')
+        
+        lines = histogram.samples()
+        assert 'latency_seconds_bucket{route="a",le="0.1"} 2' in lines
+        assert 'latency_seconds_bucket{route="a",le="1"} 3' in lines
+        assert 'latency_seconds_bucket{route="a",le="+Inf"} 4' in lines
+        assert 'latency_seconds_sum{route="a"} 3.65' in lines
+        assert 'latency_seconds_count{route="a"} 4' in lines
+    
+    def test_callback_metric_errors_are_skipped(self):
+        """Test that a failing callback does not break rendering"""
+        registry = MetricsRegistry()
+        registry.register(CallbackMetric('ok', 'Works', 'gauge', lambda: 5))
+        registry.register(CallbackMetric('broken', 'Fails', 'gauge', lambda: 1 / 0))
+        
+        text = registry.render()
+        assert 'ok 5' in text
+        assert '# TYPE broken gauge' in text
+    
+    def test_metric_base_is_abstract(self):
+        """Test that a metric must define its samples"""
+        with pytest.raises(TypeError):
+            Metric('abstract', 'Needs samples()')
+    
+    def test_label_values_are_escaped(self):
+        """Test escaping of quotes in label values"""
+        counter = Counter('escaped_total', 'Escaping', ('value',))
+        counter.inc('say "hi"')
+        assert counter.samples() == ['escaped_total{value="say \\"hi\\""} 1']
+
+
+@pytest.mark.integration
+class TestMetricsEndpoint:
+    """Test the /api/metrics endpoint"""
+    
+    def test_route_latency_is_recorded(self, client):
+        """Test that requests show up in the route histograms"""
+        from services.metrics import request_latency
+        before = request_latency.count('api.health_check', 'GET')
+        client.get('/api/health')
+        client.get('/api/health')
+        
+        assert request_latency.count('api.health_check', 'GET') == before + 2
+        
+        response = client.get('/api/metrics')
+        text = response.get_data(as_text=True)
+        assert response.status_code == 200
+        assert response.content_type.startswith('text/plain; version=0.0.4')
+        assert 'smartkick_http_request_duration_seconds_bucket{endpoint="api.health_check"' in text
+        assert 'smartkick_games{state="live"}' in text
+        assert 'smartkick_config_reloads_total' in text
+    
+    def test_db_queries_are_counted_per_request(self, client):
+        """Test the per-request database query histogram"""
+        from services.metrics import db_queries_per_request
+        client.get('/api/health')  # Warm up outside the measured request
+        before = db_queries_per_request.count('questions.get_categories')
+        client.get('/api/questions/categories')
+        
+        assert db_queries_per_request.count('questions.get_categories') == before + 1
+        assert 'smartkick_question_cache_lookups_total{result="miss"}' in \
+            client.get('/api/metrics').get_data(as_text=True)
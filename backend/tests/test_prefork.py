@@ -0,0 +1,39 @@
+"""
+Tests for the pre-fork server helpers
+"""
+import os
+import pytest
+
+
+@pytest.mark.unit
+class TestPrefork:
+    """Test memory reporting used by the pre-fork master"""
+    
+    @pytest.mark.skipif(not os.path.exists('/proc/self/smaps_rollup'),
+                        reason='Requires Linux /proc/<pid>/smaps_rollup')
+    def test_read_memory_usage_of_current_process(self):
+        """Test that RSS is split into shared and private pages"""
+        from prefork import read_memory_usage
+        usage = read_memory_usage(os.getpid())
+        
+        assert usage['rss'] > 0
+        assert usage['shared'] + usage['private'] == usage['rss']
+    
+    def test_read_memory_usage_of_missing_process(self):
+        """Test that an unknown process yields an empty report"""
+        from prefork import read_memory_usage
+        assert read_memory_usage(-1) == {}
+    
+    def test_format_memory_report(self):
+        """Test the per-worker memory table"""
+        from prefork import format_memory_report
+        report = format_memory_report({
+            101: {'rss': 2000, 'pss': 900, 'shared': 1500, 'private': 500},
+            102: {}
+        })
+        
+        lines = report.splitlines()
+        assert 'shared kB' in lines[0]
+        assert lines[1].split() == ['101', '2000', '900', '1500', '500']
+        assert lines[2].split() == ['102', 'n/a']
+
@@ -0,0 +1,81 @@
+"""
+Tests for query and connection budgets
+"""
+import logging
+import pytest
+from database.query_budget import QueryBudgetExceeded, track_queries
+
+
+@pytest.mark.unit
+class TestQueryTracker:
+    """Test counting and budget enforcement"""
+    
+    def test_counts_queries_and_connections(self, question_db):
+        """Test that statements and connections are counted"""
+        with track_queries('unit') as tracker:
+            question_db.execute('SELECT * FROM questions')
+            question_db.execute_one('SELECT COUNT(*) AS count FROM questions')
+        
+        assert len(tracker.queries) == 2
+        assert tracker.connections == 2
+        assert tracker.summary() == 'unit: 2 queries, 2 connections'
+    
+    def test_nested_trackers_count_towards_parent(self, question_db):
+        """Test that an inner tracker's work is included in the outer one"""
+        with track_queries('outer') as outer:
+            question_db.execute('SELECT 1')
+            with track_queries('inner') as inner:
+                question_db.execute('SELECT 2')
+        
+        assert len(inner.queries) == 1
+        assert len(outer.queries) == 2
+    
+    def test_strict_budget_raises(self, question_db):
+        """Test that strict trackers raise when over budget"""
+        with pytest.raises(QueryBudgetExceeded, match='2 queries \\(budget 1\\)'):
+            with track_queries('strict', max_queries=1, strict=True):
+                question_db.execute('SELECT 1')
+                question_db.execute('SELECT 2')
+    
+    def test_lenient_budget_warns(self, question_db, caplog):
+        """Test that non-strict trackers log a warning instead"""
+        with caplog.at_level(logging.WARNING, logger='database.query_budget'):
+            with track_queries('lenient', max_connections=0):
+                question_db.execute('SELECT 1')
+        
+        assert 'Query budget exceeded in lenient: 1 connections (budget 0)' in caplog.text
+    
+    def test_untracked_statements_are_not_counted(self, question_db):
+        """Test that work outside a tracker is ignored"""
+        question_db.execute('SELECT 1')
+        with track_queries('empty') as tracker:
+            pass
+        assert tracker.queries == []
+
+
+@pytest.mark.integration
+class TestRouteBudgets:
+    """Test budgets declared on routes"""
+    
+    def test_over_budget_route_fails_in_tests(self, app):
+        """Test that a route exceeding its budget raises while testing"""
+        from database.db import get_db
+        from routes.query_budget import query_budget
+        
+        @app.route('/test/over-budget')
+        @query_budget(max_queries=0)
+        def over_budget():
+            get_db().execute('SELECT 1')
+            return 'ok'
+        
+        with pytest.raises(QueryBudgetExceeded):
+            app.test_client().get('/test/over-budget')
+    
+    def test_question_routes_within_budget(self, client):
+        """Test that question routes stay within their budgets from a cold bank"""
+        from services.question_service import reset_question_service
+        client.get('/api/health')
+        reset_question_service()
+        
+        response = client.get('/api/questions/categories')
+        assert response.status_code == 200
@@ -54,3 +54,137 @@ class TestQuestionService:
         assert 0 <= correct_answer < num_options, \
             f"correct_answer {correct_answer} must be between 0 and {num_options - 1}"
 
+
+
+@pytest.mark.unit
+class TestQuestionBank:
+    """Test the in-memory question bank of QuestionService"""
+    
+    @pytest.fixture
+    def service(self, question_db):
+        from services.question_service import QuestionService
+        return QuestionService(db=question_db)
+    
+    def test_random_question_from_bank(self, service):
+        """Test that random questions are served with shuffled answers"""
+        question = service.get_random_question('math_1', 'el')
+        
+        assert question['category'] == 'math_1'
+        assert question['question'].startswith('Πόσο κάνει')
+        assert len(question['answers']) == 4
+        assert question['answers'][question['correct_answer']] in ('4', '6')
+    
+    def test_unknown_category_returns_none(self, service):
+        """Test that an unknown category yields None"""
+        assert service.get_random_question('history_9') is None
+    
+    def test_categories_and_counts(self, service):
+        """Test category listing and counts from the bank"""
+        assert service.get_categories() == ['geography_1', 'math_1']
+        assert service.get_question_count('math_1') == 2
+        assert service.get_question_count() == 3
+    
+    def test_question_by_id(self, service):
+        """Test lookup by ID through the bank index"""
+        question = service.get_question_by_id(3, 'de')
+        
+        assert question['question'] == 'Was ist die Hauptstadt von Griechenland?'
+        assert question['answers'][question['correct_answer']] == 'Athens'
+        assert service.get_question_by_id(999) is None
+    
+    def test_bank_is_loaded_once(self, service):
+        """Test that repeated lookups are served from memory"""
+        for _ in range(5):
+            service.get_random_question('math_1')
+        
+        assert service.stats['bank_loads'] == 1
+        assert service.stats['cache_misses'] == 1
+        assert service.stats['cache_hits'] == 4
+    
+    def test_stale_bank_reloads_only_when_changed(self, service, question_db):
+        """Test that refreshes keep the bank unless the table changed"""
+        service.refresh_interval = 0
+        bank = service.load_bank()
+        
+        service.get_categories()
+        assert service._bank is bank
+        
+        question_db.execute_update(
+            "INSERT INTO questions (category, question_en, answers, correct_answer_index) "
+            "VALUES ('history_1', 'Who?', '[\"A\", \"B\"]', 0)"
+        )
+        # The stale bank is served while it is revalidated in the background
+        assert 'history_1' not in service.get_categories()
+        service.wait_for_revalidation()
+        assert 'history_1' in service._bank
+        assert service._bank is not bank
+    
+    def test_stale_reload_query_budget(self, service, question_db):
+        """Test that reloading a changed bank reads the fingerprint only once"""
+        from database.query_budget import track_queries
+        service.refresh_interval = 0
+        service.load_bank()
+        question_db.execute_update(
+            "INSERT INTO questions (category, question_en, answers, correct_answer_index) "
+            "VALUES ('history_1', 'Who?', '[\"A\", \"B\"]', 0)"
+        )
+        
+        with track_queries('reload', max_queries=2, max_connections=2, strict=True) as tracker:
+            service.revalidate()
+        assert len(tracker.queries) == 2
+    
+    def test_stale_bank_served_while_database_locked(self, service, monkeypatch):
+        """Test that a locked database degrades to the last known good bank"""
+        import sqlite3
+        service.load_bank()
+        service.refresh_interval = 0
+        
+        def locked():
+            raise sqlite3.OperationalError('database is locked')
+        monkeypatch.setattr(service, '_read_fingerprint', locked)
+        
+        assert service.get_categories() == ['geography_1', 'math_1']
+        service.wait_for_revalidation()
+        assert service.degraded is True
+        assert service.stats['degraded'] == 1
+        
+        # Failed revalidations are retried only after the retry interval
+        service.get_categories()
+        service.wait_for_revalidation()
+        assert service.stats['revalidations'] == 1
+    
+    def test_degraded_clears_after_successful_revalidation(self, service):
+        """Test that revalidations past their deadline degrade until one succeeds"""
+        service.load_bank()
+        service.revalidate_deadline = -1
+        assert service.revalidate() is False
+        assert service.degraded is True
+        
+        service.revalidate_deadline = 60
+        assert service.revalidate() is True
+        assert service.degraded is False
+        assert service.stats['degraded'] == 1
+
+
+@pytest.mark.integration
+class TestValidateEndpoint:
+    """Test POST /api/questions/validate"""
+    
+    @pytest.mark.parametrize('question_id', [1, '1'])
+    def test_numeric_ids(self, client, question_db, monkeypatch, question_id):
+        """Test that string and integer IDs find the same question"""
+        import services.question_service as question_service
+        monkeypatch.setattr(question_service.random, 'shuffle', lambda items: None)
+        response = client.post('/api/questions/validate', json={
+            'category': 'math_1', 'question_id': question_id, 'answer_index': 1
+        })
+        assert response.status_code == 200
+        assert response.get_json()['correct'] is True
+    
+    @pytest.mark.parametrize('question_id', ['one', '1.5', [1], True])
+    def test_invalid_ids(self, client, question_db, question_id):
+        """Test that IDs that are not integers get 400"""
+        response = client.post('/api/questions/validate', json={
+            'category': 'math_1', 'question_id': question_id, 'answer_index': 1
+        })
+        assert response.status_code == 400
@@ -0,0 +1,77 @@
+"""
+Tests for per-request profiling
+"""
+import json
+import os
+import pytest
+
+
+@pytest.fixture
+def profiling_client(temp_db, tmp_path):
+    """Test client with header-triggered profiling enabled"""
+    from app import create_app
+    from database.db import reset_db
+    from services.action_log import shutdown_action_log
+    from services.sampling_profiler import stop_sampling_profiler
+    
+    app = create_app({
+        'TESTING': True,
+        'DATABASE_PATH': temp_db,
+        'ACTION_LOG_PATH': str(tmp_path / 'actions.log'),
+        'PROFILE_DIR': str(tmp_path / 'profiles'),
+        'PROFILE_HEADER_ENABLED': True
+    })
+    yield app.test_client()
+    
+    shutdown_action_log()
+    stop_sampling_profiler()
+    reset_db()
+
+
+@pytest.mark.unit
+class TestRequestProfiler:
+    """Test request profiling and profile aggregation"""
+    
+    def test_header_triggers_profile(self, profiling_client, tmp_path):
+        """Test that a profiled request saves a profile with metadata"""
+        response = profiling_client.get('/api/health', headers={'X-Profile-Request': '1'})
+        saved = response.headers['X-Profile-Saved']
+        
+        assert not os.path.isabs(saved)
+        saved = str(tmp_path / 'profiles' / saved)
+        assert os.path.exists(saved)
+        with open(saved[:-len('.prof')] + '.json') as f:
+            meta = json.load(f)
+        assert meta['endpoint'] == 'api.health_check'
+        assert meta['status'] == 200
+        assert meta['duration_ms'] >= 0
+    
+    def test_requests_without_header_are_not_profiled(self, profiling_client):
+        """Test that profiling stays off unless asked for"""
+        response = profiling_client.get('/api/health')
+        assert 'X-Profile-Saved' not in response.headers
+    
+    def test_header_ignored_when_disabled(self, client):
+        """Test that the header does nothing unless enabled in config"""
+        response = client.get('/api/health', headers={'X-Profile-Request': '1'})
+        assert 'X-Profile-Saved' not in response.headers
+    
+    def test_aggregate_hot_functions(self, profiling_client, tmp_path):
+        """Test aggregation of saved profiles per endpoint"""
+        from services.request_profiler import hot_functions, load_profiles
+        for _ in range(2):
+            profiling_client.get('/api/config', headers={'X-Profile-Request': '1'})
+        
+        profiles = load_profiles(str(tmp_path / 'profiles'))
+        assert len(profiles['api.get_config']) == 2
+        
+        rows = hot_functions(profiles['api.get_config'], top=5)
+        assert 0 < len(rows) <= 5
+        assert rows[0]['tottime'] >= rows[-1]['tottime']
+    
+    def test_sampling_rate(self, tmp_path):
+        """Test that the sample rate decides without a header"""
+        from services.request_profiler import RequestProfiler
+        assert RequestProfiler(str(tmp_path), sample_rate=1.0).should_profile(False)
+        assert not RequestProfiler(str(tmp_path), sample_rate=0.0).should_profile(False)
+        assert not RequestProfiler(str(tmp_path)).should_profile(True)
@@ -0,0 +1,98 @@
+"""
+Tests for the sampling profiler
+"""
+import threading
+import pytest
+from services.sampling_profiler import SamplingProfiler
+
+
+def _busy_marker_function(stop):
+    while not stop.is_set():
+        sum(range(100))
+
+
+@pytest.mark.unit
+class TestSamplingProfiler:
+    """Test stack sampling and folded output"""
+    
+    def test_sample_records_running_threads(self):
+        """Test that a busy thread shows up in the folded stacks"""
+        stop = threading.Event()
+        worker = threading.Thread(target=_busy_marker_function, args=(stop,))
+        worker.start()
+        try:
+            profiler = SamplingProfiler(hz=100)
+            for _ in range(5):
+                profiler.sample(exclude=threading.get_ident())
+        finally:
+            stop.set()
+            worker.join()
+        
+        folded = profiler.folded()
+        assert 'tests/test_sampling_profiler.py:_busy_marker_function' in folded
+        assert profiler.stats()['samples'] == 5
+        
+        stack, count = folded.splitlines()[0].rsplit(' ', 1)
+        assert ';' in stack
+        assert int(count) >= 1
+    
+    def test_reset_clears_stacks(self):
+        """Test that reading with reset starts a new aggregation"""
+        profiler = SamplingProfiler()
+        profiler.sample()
+        assert profiler.folded(reset=True)
+        assert profiler.folded() == ''
+    
+    def test_background_thread_start_stop(self):
+        """Test the sampling thread lifecycle"""
+        profiler = SamplingProfiler(hz=200)
+        profiler.start()
+        threading.Event().wait(0.05)
+        profiler.stop()
+        assert profiler.stats()['samples'] > 0
+
+
+@pytest.mark.integration
+class TestFlamegraphEndpoint:
+    """Test /api/debug/flamegraph"""
+    
+    def test_flamegraph_served_as_collapsed_stacks(self, app, client):
+        """Test that the endpoint returns folded stacks after requests"""
+        from services.sampling_profiler import get_sampling_profiler
+        app.config['DEBUG_ENDPOINTS_ENABLED'] = True
+        client.get('/api/health')
+        get_sampling_profiler().sample()
+        
+        response = client.get('/api/debug/flamegraph')
+        assert response.status_code == 200
+        assert response.content_type.startswith('text/plain')
+        assert int(response.headers['X-Profile-Samples']) >= 1
+        
+        assert client.delete('/api/debug/flamegraph').status_code == 200
+    
+    def test_debug_endpoints_need_flag_and_token(self, app, client):
+        """Test that debug endpoints are off by default and honor the token"""
+        assert client.get('/api/debug/flamegraph').status_code == 404
+        assert client.get('/api/debug/slow-queries').status_code == 404
+        
+        app.config.update(DEBUG_ENDPOINTS_ENABLED=True, DEBUG_ENDPOINTS_TOKEN='secret')
+        assert client.get('/api/debug/slow-queries').status_code == 401
+        assert client.get('/api/debug/slow-queries',
+                          headers={'Authorization': 'Bearer wrong'}).status_code == 401
+        assert client.get('/api/debug/slow-queries',
+                          headers={'Authorization': 'Bearer secret'}).status_code == 200
+    
+    def test_flamegraph_disabled(self, temp_db, tmp_path):
+        """Test that a zero rate disables the endpoint"""
+        from app import create_app
+        from database.db import reset_db
+        from services.action_log import shutdown_action_log
+        
+        app = create_app({'TESTING': True, 'DATABASE_PATH': temp_db,
+                          'ACTION_LOG_PATH': str(tmp_path / 'a.log'),
+                          'SAMPLING_PROFILER_HZ': 0, 'DEBUG_ENDPOINTS_ENABLED': True})
+        try:
+            assert app.test_client().get('/api/debug/flamegraph').status_code == 404
+        finally:
+            shutdown_action_log()
+            reset_db()
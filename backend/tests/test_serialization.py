@@ -0,0 +1,96 @@
+"""
+Tests for response serialization
+"""
+import datetime
+import json
+import pytest
+from services import serialization
+from services.serialization import dumps_json
+
+
+@pytest.mark.unit
+class TestDumpsJson:
+    """Test JSON encoding with and without orjson"""
+    
+    @pytest.mark.parametrize('fast', [True, False])
+    def test_encoders_agree(self, monkeypatch, fast):
+        """Test that both encoders produce the same compact UTF-8 document"""
+        if not fast:
+            monkeypatch.setattr(serialization, 'orjson', None)
+        data = {'b': [1, 2.5, None], 'a': 'Πάσα', 'day': datetime.date(2024, 1, 2)}
+        body = dumps_json(data)
+        assert 'Πάσα'.encode('utf-8') in body
+        assert json.loads(body) == {'b': [1, 2.5, None], 'a': 'Πάσα', 'day': 'Tue, 02 Jan 2024 00:00:00 GMT'}
+        assert dumps_json(data, sort_keys=True).startswith(b'{"a":')
+    
+    def test_pre_serialized_question(self, question_db):
+        """Test that assembled questions match the shuffled question format"""
+        from services.question_service import QuestionService
+        service = QuestionService(db=question_db)
+        
+        for _ in range(10):
+            question = json.loads(service.get_random_question_json('math_1', 'el'))
+            assert sorted(question) == ['answers', 'category', 'correct_answer', 'id', 'question']
+            assert question['category'] == 'math_1'
+            assert question['question'].startswith('Πόσο κάνει')
+            correct = question['answers'][question['correct_answer']]
+            assert correct == {1: '4', 2: '6'}[question['id']]
+        
+        assert service.get_random_question_json('history_1') is None
+
+
+@pytest.mark.integration
+class TestNegotiation:
+    """Test the JSON provider and MessagePack negotiation"""
+    
+    def test_random_question_route(self, client, question_db):
+        """Test that the pre-serialized question is a normal JSON response"""
+        response = client.get('/api/questions/random/geography_1?language=de')
+        assert response.status_code == 200
+        assert response.mimetype == 'application/json'
+        data = response.get_json()
+        assert data['success'] is True
+        assert data['question']['answers'][data['question']['correct_answer']] == 'Athens'
+    
+    def test_json_by_default(self, client):
+        """Test that clients without a msgpack Accept header get JSON"""
+        response = client.post('/api/game/start', json={}, headers={'Accept': '*/*'})
+        assert response.mimetype == 'application/json'
+        assert response.get_json()['success'] is True
+    
+    def test_msgpack(self, client, question_db):
+        """Test that Accept: application/msgpack gets MessagePack"""
+        msgpack = pytest.importorskip('msgpack')
+        headers = {'Accept': 'application/msgpack'}
+        
+        response = client.post('/api/game/start', json={}, headers=headers)
+        assert response.mimetype == 'application/msgpack'
+        assert 'Accept' in response.headers['Vary']
+        assert msgpack.unpackb(response.data)['success'] is True
+        
+        response = client.get('/api/questions/random/math_1', headers=headers)
+        assert msgpack.unpackb(response.data)['question']['category'] == 'math_1'
+    
+    @pytest.mark.parametrize('fast', [True, False])
+    def test_provider_flags(self, app, monkeypatch, fast):
+        """Test that sort_keys and ensure_ascii on app.json are honored"""
+        if not fast:
+            monkeypatch.setattr(serialization, 'orjson', None)
+        data = {'b': 'Πάσα 🙂', 'a': 1}
+        with app.test_request_context():
+            assert app.json.response(data).get_data() == '{"b":"Πάσα 🙂","a":1}'.encode('utf-8')
+            
+            app.json.sort_keys = True
+            app.json.ensure_ascii = True
+            expected = json.dumps(data, sort_keys=True, separators=(',', ':')).encode('ascii')
+            assert app.json.response(data).get_data() == expected
+            assert app.json.dumps(data).startswith('{"a":')
+            assert '\\u03a0' in app.json.dumps(data)
+    
+    def test_random_question_follows_provider(self, app, client, question_db):
+        """Test that a sorting provider gets the question without fragments"""
+        app.json.sort_keys = True
+        response = client.get('/api/questions/random/math_1?language=el')
+        body = response.get_data(as_text=True)
+        assert body.startswith('{"question":{"answers":')
+        assert 'Πόσο κάνει' in body
@@ -0,0 +1,102 @@
+"""
+Tests for the database slow query log
+"""
+import pytest
+from database.slow_query_log import SlowQueryLog, normalize_sql
+
+
+@pytest.mark.unit
+class TestSlowQueryLog:
+    """Test slow statement aggregation and plan capture"""
+    
+    def test_normalize_sql(self):
+        """Test that literals, IN lists and whitespace are normalized"""
+        assert normalize_sql("SELECT *  FROM questions\n WHERE category = 'math_1' LIMIT 1") == \
+            'SELECT * FROM questions WHERE category = ? LIMIT ?'
+        assert normalize_sql('SELECT * FROM questions WHERE id IN (?, ?, ?)') == \
+            normalize_sql('SELECT * FROM questions WHERE id IN (1, 2)')
+    
+    def test_fast_statements_ignored(self):
+        """Test that statements under the threshold are not recorded"""
+        log = SlowQueryLog(threshold_ms=50)
+        log.record('SELECT 1', (), 0.01)
+        assert log.report() == []
+    
+    def test_aggregates_by_normalized_sql(self):
+        """Test that variants of one statement share an entry"""
+        log = SlowQueryLog(threshold_ms=0)
+        log.record("SELECT * FROM questions WHERE id = 1", (), 0.2)
+        log.record("SELECT * FROM questions WHERE id = 2", (), 0.4)
+        
+        entries = log.report()
+        assert len(entries) == 1
+        assert entries[0]['count'] == 2
+        assert entries[0]['total_ms'] == pytest.approx(600)
+        assert entries[0]['max_ms'] == pytest.approx(400)
+        assert entries[0]['avg_ms'] == pytest.approx(300)
+    
+    def test_database_captures_plan_once(self, question_db):
+        """Test that the Database wrapper records plans for slow statements"""
+        question_db.slow_queries.threshold_ms = 0
+        for category in ('math_1', 'geography_1'):
+            question_db.execute('SELECT * FROM questions WHERE category = ?', (category,))
+        
+        entry = question_db.slow_queries.report()[0]
+        assert entry['statement'] == 'SELECT * FROM questions WHERE category = ?'
+        assert entry['count'] == 2
+        assert any('questions' in line for line in entry['plan'])
+        assert 'plan:' in question_db.slow_queries.format_report()
+    
+    def test_batch_plan_uses_first_row(self, question_db):
+        """Test that execute_many explains its statement with real parameters"""
+        question_db.slow_queries.threshold_ms = 0
+        question_db.execute_many('UPDATE questions SET category = ? WHERE id = ?',
+                                 [('math_2', 1), ('math_2', 2)])
+        
+        plan = question_db.slow_queries.report()[0]['plan']
+        assert not plan[0].startswith('(plan unavailable')
+    
+    def test_plan_failure_is_reported(self, question_db):
+        """Test that a statement that cannot be explained does not raise"""
+        log = SlowQueryLog(threshold_ms=0)
+        with question_db.get_connection() as conn:
+            log.record('SELECT * FROM missing_table', (), 1.0, conn)
+        assert log.report()[0]['plan'][0].startswith('(plan unavailable')
+
+
+@pytest.mark.integration
+class TestSlowQueryEndpoint:
+    """Test the slow query report and metrics"""
+    
+    def test_report_and_metrics(self, app, client):
+        """Test that slow statements appear in the report and on /metrics"""
+        from database.db import get_db
+        app.config['DEBUG_ENDPOINTS_ENABLED'] = True
+        client.get('/api/health')  # Warm up against the temporary database
+        db = get_db()
+        db.slow_queries.threshold_ms = 0
+        db.execute('SELECT COUNT(*) AS count FROM questions WHERE category = ?', ('math_1',))
+        
+        data = client.get('/api/debug/slow-queries').get_json()
+        statements = [entry['statement'] for entry in data['statements']]
+        assert data['success'] is True
+        assert 'SELECT COUNT(*) AS count FROM questions WHERE category = ?' in statements
+        
+        metrics = client.get('/api/metrics').get_data(as_text=True)
+        assert 'smartkick_db_slow_queries_total{statement="SELECT COUNT(*) AS count' in metrics
+    
+    def test_text_report_and_reset(self, app, client):
+        """Test the text report and clearing the log"""
+        from database.db import get_db
+        app.config['DEBUG_ENDPOINTS_ENABLED'] = True
+        client.get('/api/health')
+        get_db().slow_queries.threshold_ms = 0
+        get_db().execute('SELECT 1')
+        
+        assert client.get('/api/debug/slow-queries?reset=1').status_code == 200
+        assert get_db().slow_queries.report() != []
+        
+        response = client.delete('/api/debug/slow-queries?format=text')
+        assert response.content_type.startswith('text/plain')
+        assert 'Statements slower than' in response.get_data(as_text=True)
+        assert get_db().slow_queries.report() == []
@@ -0,0 +1,18 @@
+"""
+Tests for translation service
+"""
+import pytest
+
+
+@pytest.mark.unit
+class TestTranslationService:
+    """Test translation loading"""
+    
+    def test_load_translations(self, temp_config_dir):
+        """Test loading all languages and a single language"""
+        from services.translation_service import TranslationService
+        service = TranslationService(str(temp_config_dir / 'translations.json'))
+        
+        assert sorted(service.get_languages()) == ['de', 'el', 'en']
+        assert service.get_language('el')['ui']['pass'] == 'Πάσα'
+        assert service.get_language('fr') is None
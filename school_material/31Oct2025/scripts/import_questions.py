@@ -12,6 +12,8 @@ backend_dir = os.path.join(project_root, 'backend')
 sys.path.insert(0, backend_dir)
 
 from database.db import get_db, init_database
+from database.query_budget import track_queries
+from database.questions import insert_questions, json_question_rows
 
 
 def import_questions_from_json(json_file: str):
@@ -35,56 +37,22 @@ def import_questions_from_json(json_file: str):
     
     db = get_db()
     
-    # Insert questions
+    # Insert each category in one transaction; the unique content hash index
+    # skips questions that are already in the database
     total_inserted = 0
     skipped = 0
     
     for category, questions in questions_data.items():
         print(f"\nProcessing category: {category}")
-        category_count = 0
-        
-        for question_data in questions:
-            question_obj = question_data.get('question', {})
-            answers = question_data.get('answers', [])
-            correct_answer_index = question_data.get('correct_answer', 0)
-            
-            # Extract question text in each language
-            question_en = question_obj.get('en', '')
-            question_el = question_obj.get('el', '')
-            question_de = question_obj.get('de', '')
-            
-            # Check if question already exists (same category, same English text)
-            existing = db.execute_one(
-                "SELECT id FROM questions WHERE category = ? AND question_en = ?",
-                (category, question_en)
-            )
-            
-            if existing:
-                print(f"  ⚠️  Skipping duplicate: {question_en[:50]}...")
-                skipped += 1
-                continue
-            
-            # Convert answers to JSON string
-            answers_json = json.dumps(answers, ensure_ascii=False)
-            
-            # Insert into database
-            query = """
-                INSERT INTO questions 
-                (category, question_en, question_el, question_de, answers, correct_answer_index)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """
-            
-            db.execute_update(
-                query,
-                (category, question_en, question_el, question_de, answers_json, correct_answer_index)
-            )
-            
-            category_count += 1
-            total_inserted += 1
+        rows = json_question_rows(category, questions)
+        category_count = insert_questions(db, rows)
+        category_skipped = len(rows) - category_count
         
         print(f"  ✅ Inserted {category_count} questions")
-        if skipped > 0:
-            print(f"  ⚠️  Skipped {skipped} duplicate questions")
+        if category_skipped > 0:
+            print(f"  ⚠️  Skipped {category_skipped} duplicate questions")
+        total_inserted += category_count
+        skipped += category_skipped
     
     print(f"\n✅ Import complete!")
     print(f"   Total questions inserted: {total_inserted}")
@@ -93,12 +61,15 @@ def import_questions_from_json(json_file: str):
     
     # Verify import
     print("\n📊 Verification by category:")
+    counts = {
+        row['category']: row['count']
+        for row in db.execute("SELECT category, COUNT(*) as count FROM questions GROUP BY category")
+    }
     for category in questions_data.keys():
-        count = db.execute_one(
-            "SELECT COUNT(*) as count FROM questions WHERE category = ?",
-            (category,)
-        )
-        print(f"   {category}: {count['count']} questions")
+        print(f"   {category}: {counts.get(category, 0)} questions")
+    
+    if db.slow_queries.report():
+        print(f"\n{db.slow_queries.format_report()}")
 
 
 if __name__ == '__main__':
@@ -108,7 +79,9 @@ if __name__ == '__main__':
     questions_file = os.path.join(material_dir, 'questions_for_review.json')
     
     try:
-        import_questions_from_json(questions_file)
+        with track_queries('import_questions') as tracker:
+            import_questions_from_json(questions_file)
+        print(f"\n{tracker.summary()}")
     except Exception as e:
         print(f"\n❌ Error: {e}")
         import traceback
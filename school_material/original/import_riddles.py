@@ -5,7 +5,6 @@ Import riddles from the edu-game-v2 repository into the database.
 import sys
 import os
 import re
-import json
 
 # Add backend directory to path for database imports
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -13,6 +12,7 @@ backend_dir = os.path.join(project_root, 'backend')
 sys.path.insert(0, backend_dir)
 
 from database.db import get_db, init_database
+from database.questions import insert_questions, question_row
 
 # Geography translations (capital cities and countries)
 GEOGRAPHY_TRANSLATIONS = {
@@ -193,87 +193,144 @@ GEOGRAPHY_ANSWER_TRANSLATIONS = {
 }
 
 
-def parse_js_riddles(file_path):
-    """Parse JavaScript riddles file and extract riddles."""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+# JavaScript tokens, each with the whitespace before it: comments, string
+# literals, identifiers, or any other single character (punctuation)
+_TOKEN = re.compile(r"""
+    \s*
+    (?:
+        (?P<comment>//[^\n]*|/\*.*?\*/)
+      | (?P<string>"[^"\\]*(?:\\.[^"\\]*)*"|'[^'\\]*(?:\\.[^'\\]*)*'|`[^`\\]*(?:\\.[^`\\]*)*`)
+      | (?P<name>[A-Za-z_$][\w$]*)
+      | (?P<char>.)
+      | $
+    )
+""", re.S | re.X)
+
+_ESCAPE = re.compile(r'\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|.)', re.S)
+_SIMPLE_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v',
+                   '0': '\0', '\n': ''}
+
+RIDDLE_FIELDS = ('question', 'options', 'answer')
+
+
+def _unescape(match):
+    escape = match.group(1)
+    if escape[0] in 'ux' and len(escape) > 1:
+        return chr(int(escape[1:].strip('{}'), 16))
+    return _SIMPLE_ESCAPES.get(escape, escape)
+
+
+def _string_value(token):
+    """Value of a JavaScript string literal token."""
+    body = token[1:-1]
+    return _ESCAPE.sub(_unescape, body) if '\\' in body else body
+
+
+def iter_js_tokens(stream, chunk_size=1 << 16):
+    """
+    Yield (kind, text) tokens of JavaScript source read from a text stream.
     
-    riddles = []
+    The stream is read in chunks; only an incomplete token at the end of a
+    chunk is carried over, so memory is bounded by the chunk size and the
+    longest token. Whitespace and comments are skipped.
+    """
+    buffer = ''
+    final = False
+    while not final:
+        chunk = stream.read(chunk_size)
+        final = not chunk
+        buffer += chunk
+        pos = 0
+        end = len(buffer)
+        for match in _TOKEN.finditer(buffer):
+            kind = match.lastgroup
+            if not final:
+                # A token touching the end of the buffer may continue in the
+                # next chunk, and a lone quote or '/*' starts a string or
+                # comment that does not end in this one
+                if match.end() == end:
+                    break
+                if kind == 'char' and (match.group(kind) in '"\'`'
+                                       or buffer.startswith('/*', match.start(kind))):
+                    break
+            pos = match.end()
+            if kind is not None and kind != 'comment':
+                yield kind, match.group(kind)
+        buffer = buffer[pos:]
+
+
+def iter_js_riddles(stream, chunk_size=1 << 16):
+    """
+    Yield riddle records from JavaScript source, in a single pass.
     
-    # Pattern to match riddle objects
-    # Look for patterns like: { question: "...", options: shuffleArray([...]), answer: "...", category: "..." }
-    # We'll match each field separately
+    A riddle is an object literal with a string 'question', a string
+    'answer' and at least four string 'options', given either as an array or
+    as shuffleArray([...]). Records are yielded as each object closes, so a
+    file of any size is parsed in linear time and bounded memory.
     
-    # Split content by riddle objects (they start with {)
-    # Find all question: "..." patterns first
-    question_pattern = r'question:\s*"([^"]+)"'
-    answer_pattern = r'answer:\s*"([^"]+)"'
+    Args:
+        stream: Text stream of the riddles file
+        chunk_size: Characters read at a time
     
-    # Find all question matches with their positions
-    question_matches = list(re.finditer(question_pattern, content))
+    Yields:
+        {'question': str, 'options': List[str], 'answer': str}
+    """
+    objects = []  # (fields, enclosing depth) of each open object literal, innermost last
+    name = None  # Last property name or string seen
+    field = None  # Riddle field whose value is being read
+    options = None  # Strings collected for 'options'
+    depth = 0  # Open ( and [ inside the current value
     
-    for q_match in question_matches:
-        start_pos = q_match.start()
-        # Find the opening brace before this question
-        brace_pos = content.rfind('{', 0, start_pos)
-        if brace_pos == -1:
-            continue
-        
-        # Find the closing brace after this question
-        # We need to find the matching brace
-        brace_count = 0
-        end_pos = start_pos
-        for i in range(brace_pos, len(content)):
-            if content[i] == '{':
-                brace_count += 1
-            elif content[i] == '}':
-                brace_count -= 1
-                if brace_count == 0:
-                    end_pos = i + 1
-                    break
-        
-        riddle_block = content[brace_pos:end_pos]
-        
-        # Extract question, answer, and options
-        question_match = re.search(question_pattern, riddle_block)
-        answer_match = re.search(answer_pattern, riddle_block)
-        options_match = re.search(r'options:\s*shuffleArray\(\[([^\]]+)\]\)', riddle_block)
-        
-        if question_match and answer_match and options_match:
-            question = question_match.group(1)
-            answer = answer_match.group(1)
-            options_str = options_match.group(1)
-            
-            # Parse options
-            options = []
-            # Split by comma, but be careful with nested quotes
-            current_opt = ""
-            in_quotes = False
-            for char in options_str:
-                if char == '"' and (not current_opt or current_opt[-1] != '\\'):
-                    in_quotes = not in_quotes
-                    if not in_quotes:
-                        options.append(current_opt)
-                        current_opt = ""
-                elif in_quotes:
-                    current_opt += char
-            
-            # Clean up options
-            options = [opt.strip() for opt in options if opt.strip()]
-            
-            if len(options) >= 4:
-                riddles.append({
-                    'question': question,
-                    'options': options,
-                    'answer': answer
-                })
-    
-    return riddles
+    for kind, text in iter_js_tokens(stream, chunk_size):
+        if kind == 'string':
+            value = _string_value(text)
+            if options is not None:
+                options.append(value.strip())
+            elif field is not None and objects and depth == 0:
+                objects[-1][0][field] = value
+                field = None
+            name = value
+        elif kind == 'name':
+            name = text
+        elif text == ':':
+            field = name if name in RIDDLE_FIELDS and objects else None
+        elif text == '{':
+            objects.append(({}, depth))
+            field = options = None
+            depth = 0
+        elif text == '}':
+            field = options = None
+            if objects:
+                record, depth = objects.pop()
+                riddle_options = [opt for opt in record.get('options', ()) if opt]
+                if record.get('question') and record.get('answer') and len(riddle_options) >= 4:
+                    yield {
+                        'question': record['question'],
+                        'options': riddle_options,
+                        'answer': record['answer']
+                    }
+        elif text in '([':
+            depth += 1
+            if field == 'options' and text == '[' and options is None:
+                options = []
+        elif text in ')]':
+            depth = max(0, depth - 1)
+            if options is not None and text == ']':
+                objects[-1][0]['options'] = options
+                options = field = None
+        elif text == ',' and depth == 0:
+            field = None
+
+
+def parse_js_riddles(file_path):
+    """Parse JavaScript riddles file and extract riddles."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return list(iter_js_riddles(f))
 
 
 def insert_riddles(db, category, riddles, question_en=None, question_el=None, question_de=None):
-    """Insert riddles into database."""
-    inserted = 0
+    """Insert riddles into database in one transaction, skipping duplicates."""
+    rows = []
     
     for riddle in riddles:
         question_text = riddle['question']
@@ -288,26 +345,16 @@ def insert_riddles(db, category, riddles, question_en=None, question_el=None, qu
             continue
         
         # Use provided translations or defaults
-        q_en = question_en if question_en else question_text
-        q_el = question_el if question_el else question_text
-        q_de = question_de if question_de else question_text
-        
-        # Convert options to JSON
-        options_json = json.dumps(options)
-        
-        query = """
-            INSERT INTO questions 
-            (category, question_en, question_el, question_de, answers, correct_answer_index)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """
-        
-        try:
-            db.execute_update(query, (category, q_en, q_el, q_de, options_json, correct_index))
-            inserted += 1
-        except Exception as e:
-            print(f"Error inserting riddle: {e}")
-            print(f"  Question: {question_text[:50]}...")
+        question = {
+            'en': question_en if question_en else question_text,
+            'el': question_el if question_el else question_text,
+            'de': question_de if question_de else question_text
+        }
+        rows.append(question_row(category, question, options, correct_index))
     
+    inserted = insert_questions(db, rows)
+    if inserted < len(rows):
+        print(f"   Skipped {len(rows) - inserted} duplicate riddles")
     return inserted
 
 
@@ -361,6 +408,7 @@ def main():
     geography_file = os.path.join(repo_path, 'geographyRiddles.js')
     if os.path.exists(geography_file):
         riddles = parse_js_riddles(geography_file)
+        geography_rows = []
         
         for riddle in riddles:
             question_el = riddle['question']
@@ -399,24 +447,14 @@ def main():
                 print(f"Warning: Could not find correct answer index: {e}")
                 continue
             
-            # Insert for each language - all questions have all 3 languages
-            options_json_en = json.dumps(translated_options_en)
-            options_json_el = json.dumps(options)
-            options_json_de = json.dumps(translated_options_de)
-            
-            query = """
-                INSERT INTO questions 
-                (category, question_en, question_el, question_de, answers, correct_answer_index)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """
-            
-            # Insert with all languages set
-            try:
-                db.execute_update(query, ('geography_1', question_en, question_el, question_de, 
-                                         options_json_en, correct_index_en))
-                total_inserted += 1
-            except Exception as e:
-                print(f"Error inserting geography riddle: {e}")
+            # All questions have all 3 languages
+            question = {'en': question_en, 'el': question_el, 'de': question_de}
+            geography_rows.append(question_row('geography_1', question, translated_options_en,
+                                               correct_index_en))
+        
+        inserted = insert_questions(db, geography_rows)
+        print(f"   Inserted {inserted} geography riddles")
+        total_inserted += inserted
     
     print(f"\n✅ Import complete! Total riddles inserted: {total_inserted}")
     
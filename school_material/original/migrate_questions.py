@@ -12,6 +12,7 @@ backend_dir = os.path.join(project_root, 'backend')
 sys.path.insert(0, backend_dir)
 
 from database.db import get_db, init_database
+from database.questions import insert_questions, json_question_rows
 
 
 def migrate_questions_from_json(json_file: str = None):
@@ -44,42 +45,17 @@ def migrate_questions_from_json(json_file: str = None):
     print("Clearing existing questions...")
     db.execute_update("DELETE FROM questions")
     
-    # Insert questions
+    # Insert each category in one transaction; duplicates are skipped by content hash
     total_inserted = 0
     for category, questions in questions_data.items():
         print(f"\nProcessing category: {category}")
-        category_count = 0
-        
-        for question_data in questions:
-            question_id = question_data.get('id')
-            question_obj = question_data.get('question', {})
-            answers = question_data.get('answers', [])
-            correct_answer_index = question_data.get('correct_answer', 0)
-            
-            # Extract question text in each language
-            question_en = question_obj.get('en', '')
-            question_el = question_obj.get('el', '')
-            question_de = question_obj.get('de', '')
-            
-            # Convert answers to JSON string
-            answers_json = json.dumps(answers)
-            
-            # Insert into database
-            query = """
-                INSERT INTO questions 
-                (category, question_en, question_el, question_de, answers, correct_answer_index)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """
-            
-            db.execute_update(
-                query,
-                (category, question_en, question_el, question_de, answers_json, correct_answer_index)
-            )
-            
-            category_count += 1
-            total_inserted += 1
+        rows = json_question_rows(category, questions)
+        category_count = insert_questions(db, rows)
+        total_inserted += category_count
         
         print(f"  Inserted {category_count} questions")
+        if category_count < len(rows):
+            print(f"  Skipped {len(rows) - category_count} duplicate questions")
     
     print(f"\n✅ Migration complete! Total questions inserted: {total_inserted}")
     